@@ -0,0 +1,214 @@
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, NamedTuple, Optional, TypeVar
+
+import stream
+from calc import evaluate_rpn, evaluate_tokens
+from calculator import calculate
+from limits import Limits
+from shunting_yard import shunting_yard
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Размер части по умолчанию: достаточно большой, чтобы накладные расходы на
+# передачу части в процесс были малы по сравнению с ее вычислением
+DEFAULT_CHUNK_SIZE = 1000
+
+# Размер части для пула потоков: передача части потоку почти ничего не
+# стоит, а небольшие части равномернее распределяются между потоками
+DEFAULT_THREAD_CHUNK_SIZE = 100
+
+
+class BatchResult(NamedTuple):
+    """
+    Результат вычисления одного выражения пакета.
+
+    Attributes:
+        value: Результат вычисления или None при ошибке
+        error: Текст ошибки или None при успехе
+    """
+
+    value: Optional[Any]
+    error: Optional[str]
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    """
+    Разбивает поток элементов на списки длины size (последний может быть короче).
+
+    Args:
+        items: Элементы
+        size: Размер части
+
+    Returns:
+        Итератор частей
+    """
+    if size < 1:
+        raise ValueError("Размер части должен быть положительным")
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def map_chunks(
+    function: Callable[[list[T]], list[R]],
+    items: Iterable[T],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    executor_class: Callable[[int], Executor] = ProcessPoolExecutor,
+) -> Iterator[R]:
+    """
+    Применяет function к частям потока в пуле исполнителей.
+
+    Результаты выдаются в порядке входа по мере готовности частей. В работе
+    одновременно находится не больше двух частей на исполнителя, поэтому
+    объем памяти не зависит от длины входа.
+
+    Args:
+        function: Функция, обрабатывающая часть и возвращающая список результатов
+                  той же длины; для пула процессов должна сериализоваться pickle
+        items: Элементы
+        workers: Количество исполнителей (по умолчанию — число процессоров)
+        chunk_size: Количество элементов в одной части
+        executor_class: Класс пула исполнителей
+
+    Returns:
+        Итератор результатов в порядке входа
+    """
+    workers = workers or os.cpu_count() or 1
+    with executor_class(workers) as executor:
+        pending = deque()
+        for chunk in chunked(items, chunk_size):
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _evaluate_chunk(
+    evaluate: Callable[[str], Any], expressions: list[str]
+) -> list[BatchResult]:
+    """Вычисляет часть пакета, сохраняя ошибки каждого выражения."""
+    results = []
+    for expression in expressions:
+        try:
+            results.append(BatchResult(evaluate(expression), None))
+        except stream.EXPRESSION_ERRORS as e:
+            results.append(BatchResult(None, str(e)))
+    return results
+
+
+def _evaluate_limited(limits: Limits, rpn: bool, expression: str) -> float:
+    """Вычисляет выражение с ограничениями ресурсов."""
+    if rpn:
+        return evaluate_rpn(expression, limits=limits)
+    return evaluate_tokens(shunting_yard(expression, limits=limits), limits=limits)
+
+
+def evaluate_batch(
+    expressions: Iterable[str],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    rpn: bool = False,
+    limits: Optional[Limits] = None,
+    executor_class: Callable[[int], Executor] = ProcessPoolExecutor,
+) -> Iterator[BatchResult]:
+    """
+    Вычисляет пакет независимых выражений в пуле процессов.
+
+    Функции и константы, зарегистрированные в реестре, доступны в процессах
+    пула только если они регистрируются при импорте модулей (или процессы
+    создаются через fork). Для пула потоков см. evaluate_batch_threads.
+
+    Args:
+        expressions: Выражения
+        workers: Количество процессов (по умолчанию — число процессоров)
+        chunk_size: Количество выражений, передаваемых процессу за раз
+        rpn: True, если выражения записаны в ПОЛИЗ, иначе — в инфиксной записи
+        limits: Ограничения ресурсов на каждое выражение; выражения,
+                превышающие их, попадают в результат с ошибкой
+        executor_class: Класс пула исполнителей
+
+    Returns:
+        Итератор результатов в порядке входа
+    """
+    if limits is not None:
+        evaluate: Callable[[str], Any] = partial(_evaluate_limited, limits, rpn)
+    else:
+        evaluate = evaluate_rpn if rpn else calculate
+    function = partial(_evaluate_chunk, evaluate)
+    return map_chunks(function, expressions, workers, chunk_size, executor_class)
+
+
+def evaluate_batch_threads(
+    expressions: Iterable[str],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_THREAD_CHUNK_SIZE,
+    rpn: bool = False,
+    limits: Optional[Limits] = None,
+) -> Iterator[BatchResult]:
+    """
+    Вычисляет пакет независимых выражений в пуле потоков.
+
+    Выражения и результаты не сериализуются pickle, а потоки видят все
+    функции и константы реестра, в том числе зарегистрированные во время
+    работы. shunting_yard и evaluate_rpn не используют изменяемого
+    состояния модулей, поэтому вычисляются в потоках параллельно. Ускорение
+    с числом потоков дает только сборка CPython без GIL; в обычной сборке
+    потоки выполняются по очереди.
+
+    Args:
+        expressions: Выражения
+        workers: Количество потоков (по умолчанию — число процессоров)
+        chunk_size: Количество выражений, передаваемых потоку за раз
+        rpn: True, если выражения записаны в ПОЛИЗ, иначе — в инфиксной записи
+        limits: Ограничения ресурсов на каждое выражение; время max_time
+                считается для каждого потока отдельно
+
+    Returns:
+        Итератор результатов в порядке входа
+    """
+    return evaluate_batch(
+        expressions, workers, chunk_size, rpn, limits, executor_class=ThreadPoolExecutor
+    )
+
+
+def _stream_chunk(
+    handler: stream.Handler, field: Optional[str], lines: list[tuple[int, str]]
+) -> list[str]:
+    """Обрабатывает часть строк потокового режима; field=None означает режим --lines."""
+    if field is None:
+        start = lines[0][0]
+        return list(stream.stream_lines((line for _, line in lines), handler, start))
+    return list(stream.stream_jsonl((line for _, line in lines), handler, field))
+
+
+def stream_parallel(
+    lines: Iterable[str],
+    handler: stream.Handler,
+    field: Optional[str],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Потоковый режим (--lines или --jsonl) с обработкой частей в пуле процессов.
+
+    Args:
+        lines: Входные строки
+        handler: Функция, преобразующая выражение в результат; должна
+                 сериализоваться pickle
+        field: Имя поля результата для режима JSONL или None для режима --lines
+        workers: Количество процессов
+        chunk_size: Количество строк, передаваемых процессу за раз
+
+    Returns:
+        Итератор выходных строк в порядке входа
+    """
+    function = partial(_stream_chunk, handler, field)
+    return map_chunks(function, enumerate(lines, 1), workers, chunk_size)
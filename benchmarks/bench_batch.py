@@ -0,0 +1,56 @@
+"""
+Масштабирование evaluate_batch по количеству процессов.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_batch [количество выражений]
+"""
+
+import os
+import random
+import sys
+import time
+
+from batch import evaluate_batch
+from calculator import calculate
+
+CHUNK_SIZE = 2000
+
+
+def expressions(count: int) -> list[str]:
+    """Генерирует count случайных выражений средней длины."""
+    rng = random.Random(0)
+    result = []
+    for _ in range(count):
+        terms = [str(rng.randint(1, 99)) for _ in range(rng.randint(5, 20))]
+        operators = [rng.choice("+-*/") for _ in terms[1:]]
+        expression = terms[0]
+        for operator, term in zip(operators, terms[1:]):
+            expression = f"({expression} {operator} {term})"
+        result.append(expression)
+    return result
+
+
+def main() -> None:
+    """Печатает время и ускорение для 1..N процессов."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    batch = expressions(count)
+
+    start = time.perf_counter()
+    for expression in batch:
+        calculate(expression)
+    sequential = time.perf_counter() - start
+    print(f"без пула        {sequential:6.2f} с")
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        for _ in evaluate_batch(batch, workers=workers, chunk_size=CHUNK_SIZE):
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"процессов {workers:3}   {elapsed:6.2f} с  x{sequential / elapsed:.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
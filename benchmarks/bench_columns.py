@@ -0,0 +1,68 @@
+"""
+Вычисление над файлами столбцов: время и пиковая память.
+
+Создает во временном каталоге два столбца float64 и вычисляет над ними
+выражение через evaluate_columns с разным размером части. Для сравнения
+столбцы целиком загружаются в память и вычисляются evaluate_vectorized.
+Пиковая память измеряется tracemalloc (учитывает выделения NumPy, но не
+страницы отображенных файлов).
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_columns [количество строк]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from columns import COLUMN_DTYPE, evaluate_columns
+from shunting_yard import shunting_yard
+from vectorized import evaluate_vectorized
+
+EXPRESSION = "x * (1 + rate) ^ 2 - sin(x / pi) * 3"
+
+
+def main() -> None:
+    """Печатает время и пиковую память для разных размеров части."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 4_000_000
+    rpn = shunting_yard(EXPRESSION, ["x", "rate"])
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        columns = {}
+        for name in ("x", "rate"):
+            columns[name] = os.path.join(directory, name)
+            rng.random(rows).astype(COLUMN_DTYPE).tofile(columns[name])
+        output = os.path.join(directory, "result")
+        size = rows * COLUMN_DTYPE.itemsize / 2**20
+        print(f"строк: {rows}, столбцы по {size:.0f} МиБ")
+
+        for chunk_rows in (1 << 12, 1 << 16, 1 << 20):
+            tracemalloc.start()
+            start = time.perf_counter()
+            evaluate_columns(rpn, columns, output, chunk_rows)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"  часть {chunk_rows:>8} строк: {elapsed:.2f} с, "
+                f"пик {peak / 2**20:.1f} МиБ"
+            )
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        arrays = {name: np.fromfile(path, dtype=COLUMN_DTYPE) for name, path in columns.items()}
+        evaluate_vectorized(rpn, arrays).values.tofile(output)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  целиком в памяти:        {elapsed:.2f} с, пик {peak / 2**20:.1f} МиБ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Сравнение скорости вычисления через compile() и через evaluate_rpn().
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_compile
+"""
+
+import timeit
+
+from calc import evaluate_rpn
+from compiler import compile
+from shunting_yard import shunting_yard
+
+EXPRESSION = "x * (1 + rate) ^ 2 - sin(x / pi) * 3 + (x - 1) / (rate + 2)"
+NUMBER = 20000
+
+
+def main() -> None:
+    """Печатает время одного вычисления для каждого способа."""
+    variables = {"x": 100.0, "rate": 0.05}
+    names = tuple(variables)
+    rpn = " ".join(shunting_yard(EXPRESSION, names))
+    compiled = compile(EXPRESSION)
+
+    cases = {
+        "shunting_yard + evaluate_rpn": lambda: evaluate_rpn(
+            " ".join(shunting_yard(EXPRESSION, names)), variables
+        ),
+        "evaluate_rpn (готовый ПОЛИЗ)": lambda: evaluate_rpn(rpn, variables),
+        "compile (байт-код)": lambda: compiled(**variables),
+    }
+
+    baseline = None
+    for name, case in cases.items():
+        seconds = min(timeit.repeat(case, number=NUMBER, repeat=5)) / NUMBER
+        if baseline is None:
+            baseline = seconds
+        print(f"{name:32} {seconds * 1e6:8.2f} мкс  x{baseline / seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
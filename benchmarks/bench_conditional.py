@@ -0,0 +1,84 @@
+"""
+Ленивая условная функция if против арифметической эмуляции ветвления.
+
+Без if выбор между двумя значениями записывается арифметикой:
+c * a + (1 - c) * b, где c — результат сравнения (1 или 0). Такая формула
+всегда вычисляет обе ветви. В ПОЛИЗ с переходами (c ?n a :m b) вычисляется
+только выбранная ветвь. Ветви — тяжелые подвыражения из sin и ^; время
+сравнивается для evaluate_rpn, calculate и compile.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_conditional [вычислений] [размер ветви]
+"""
+
+import random
+import sys
+import time
+from collections.abc import Callable
+
+from calc import evaluate_rpn
+from calculator import calculate
+from compiler import compile
+from shunting_yard import shunting_yard
+
+
+def branch(rng: random.Random, size: int) -> str:
+    """Тяжелое подвыражение от x из size слагаемых с sin и ^."""
+    return " + ".join(
+        f"sin(x * {rng.randint(1, 9)}) ^ 2 / {rng.randint(1, 9)}" for _ in range(size)
+    )
+
+
+def formulas(size: int) -> tuple[str, str]:
+    """Формула с if и ее арифметическая эмуляция с одинаковым результатом."""
+    rng = random.Random(0)
+    then, otherwise = branch(rng, size), branch(rng, size)
+    lazy = f"if(x < 0.5, {then}, {otherwise})"
+    eager = f"(x < 0.5) * ({then}) + (1 - (x < 0.5)) * ({otherwise})"
+    return lazy, eager
+
+
+def elapsed(evaluate: Callable[[float], float], points: list[float]) -> float:
+    """Время вычисления evaluate во всех точках."""
+    start = time.perf_counter()
+    for x in points:
+        evaluate(x)
+    return time.perf_counter() - start
+
+
+def evaluators(expression: str) -> dict[str, Callable[[float], float]]:
+    """Способы вычисления выражения от x: название -> функция(x)."""
+    rpn = " ".join(shunting_yard(expression, ["x"]))
+    compiled = compile(expression)
+    return {
+        "evaluate_rpn": lambda x: evaluate_rpn(rpn, {"x": x}),
+        "calculate": lambda x: calculate(expression.replace("x", repr(x))),
+        "compile": lambda x: compiled(x=x),
+    }
+
+
+def main() -> None:
+    """Печатает время формулы с if и ее арифметической эмуляции."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = random.Random(1)
+    points = [rng.random() for _ in range(count)]
+    lazy, eager = formulas(size)
+    print(f"вычислений: {count}, слагаемых в ветви: {size}")
+
+    lazy_evaluators = evaluators(lazy)
+    eager_evaluators = evaluators(eager)
+    for name, evaluate in lazy_evaluators.items():
+        for x in points[:10]:
+            assert abs(evaluate(x) - eager_evaluators[name](x)) < 1e-9
+        lazy_time = elapsed(evaluate, points)
+        eager_time = elapsed(eager_evaluators[name], points)
+        print(
+            f"  {name:<13} if {lazy_time:.3f} с, обе ветви {eager_time:.3f} с "
+            f"(x{eager_time / lazy_time:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Сравнение IncrementalParser с полным shunting_yard при правках по одному символу.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_incremental [размер выражения в символах]
+"""
+
+import random
+import sys
+import time
+
+from benchmarks.generator import Profile, generate_expression
+from incremental import IncrementalParser
+from shunting_yard import shunting_yard
+
+EDITS = 200
+
+
+def build(size: int) -> str:
+    """Строит выражение из скобочных групп общей длиной около size символов."""
+    rng = random.Random(0)
+    groups = []
+    length = 0
+    while length < size:
+        group = f"({generate_expression(rng, Profile(size=8, depth=3))})"
+        groups.append(group)
+        length += len(group) + 3
+    return " + ".join(groups)
+
+
+def main() -> None:
+    """Печатает время одной правки для полного и инкрементального разбора."""
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    text = build(size)
+    rng = random.Random(1)
+    # Правки заменяют одну цифру другой внутри выражения
+    positions = [i for i, char in enumerate(text) if char.isdigit()]
+    versions = []
+    for _ in range(EDITS):
+        position = rng.choice(positions)
+        text = text[:position] + rng.choice("123456789") + text[position + 1:]
+        versions.append(text)
+
+    start = time.perf_counter()
+    for version in versions:
+        shunting_yard(version)
+    full = (time.perf_counter() - start) / EDITS
+
+    parser = IncrementalParser()
+    parser.parse(versions[0])
+    start = time.perf_counter()
+    for version in versions:
+        parser.parse(version)
+    incremental = (time.perf_counter() - start) / EDITS
+
+    print(f"выражение: {len(text)} символов, правок: {EDITS}")
+    print(f"shunting_yard:     {full * 1000:8.3f} мс на правку")
+    print(f"IncrementalParser: {incremental * 1000:8.3f} мс на правку")
+    print(f"ускорение: {full / incremental:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
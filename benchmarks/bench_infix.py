@@ -0,0 +1,45 @@
+"""
+Сравнение evaluate_infix() с двухшаговым путем shunting_yard + evaluate_rpn.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_infix
+"""
+
+import timeit
+
+from calc import evaluate_rpn
+from calculator import evaluate_infix
+from shunting_yard import shunting_yard
+
+EXPRESSIONS = {
+    "короткое": "3 + 4 * 2",
+    "степени": "3 + 4 * 2 / (1 - 5) ^ 2 ^ 3",
+    "функции": "sin(2 + 3) / 3 * pi - sin(pi / 2) * 2",
+    "скобки": "15/(7-(1+1))*3-(2+(1+1))*15/(7-(200+1))*3-(2+(1+1))*(15/(7-(1+1))*3-(2+(1+1))+15/(7-(1+1))*3-(2+(1+1)))",
+}
+NUMBER = 5000
+
+
+def main() -> None:
+    """Печатает время одного вычисления для каждого выражения и способа."""
+    for name, expression in EXPRESSIONS.items():
+        two_step = min(
+            timeit.repeat(
+                lambda: evaluate_rpn(" ".join(shunting_yard(expression))),
+                number=NUMBER,
+                repeat=5,
+            )
+        )
+        one_pass = min(
+            timeit.repeat(lambda: evaluate_infix(expression), number=NUMBER, repeat=5)
+        )
+        print(
+            f"{name:10} shunting_yard + evaluate_rpn {two_step / NUMBER * 1e6:7.2f} мкс"
+            f"  evaluate_infix {one_pass / NUMBER * 1e6:7.2f} мкс"
+            f"  x{two_step / one_pass:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Вычисление пакета формул с общими подвыражениями: evaluate_tokens и SubresultMemo.
+
+Формулы пакета — разные внешние операции над несколькими общими
+нормирующими подвыражениями. Первый набор содержит только дешевую
+арифметику и sin, во втором нормирующие подвыражения вызывают
+зарегистрированную функцию, написанную на Python.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_memo [количество формул]
+"""
+
+import math
+import random
+import sys
+import time
+
+from calc import evaluate_tokens
+from memo import SubresultMemo
+from registry import register_function, unregister
+from shunting_yard import shunting_yard
+
+CHEAP_TERMS = [
+    "(sin(1) ^ 2 + sin(2) ^ 2 + sin(3) ^ 2 + sin(4) ^ 2) / 4",
+    "(sin(5) * sin(6) + sin(7) * sin(8)) / (sin(9) + 2)",
+    "((1 + 2) * (3 + 4) - (5 + 6) * (7 + 8)) / (9 ^ 2)",
+]
+
+COSTLY_TERMS = [
+    "(norm(1) + norm(2) + norm(3)) / 3",
+    "norm(4) * norm(5) / (norm(6) + 2)",
+    "norm(7 + 8) - norm(9)",
+]
+
+
+def norm(x: float) -> float:
+    """Нормирующая функция, вычисляемая на Python (около десятка микросекунд)."""
+    return math.fsum(math.sin(x * k) ** 2 for k in range(1, 40)) / 39
+
+
+def formulas(terms: list[str], count: int) -> list[list[str]]:
+    """Генерирует count формул в ПОЛИЗ с общими подвыражениями."""
+    rng = random.Random(0)
+    result = []
+    for _ in range(count):
+        term = rng.choice(terms)
+        outer = rng.choice(["({t}) * {n}", "{n} + ({t})", "({t}) / ({n} + ({t}))"])
+        result.append(shunting_yard(outer.format(t=term, n=rng.randint(1, 50))))
+    return result
+
+
+def measure(title: str, batch: list[list[str]]) -> None:
+    start = time.perf_counter()
+    for rpn in batch:
+        evaluate_tokens(rpn)
+    plain = time.perf_counter() - start
+
+    memo = SubresultMemo()
+    start = time.perf_counter()
+    for rpn in batch:
+        memo.evaluate(rpn)
+    memoized = time.perf_counter() - start
+
+    info = memo.cache_info()
+    print(title)
+    print(f"  evaluate_tokens: {plain:.3f} с")
+    print(f"  SubresultMemo:   {memoized:.3f} с  (x{plain / memoized:.2f})")
+    print(f"  попаданий: {info.hits}, промахов: {info.misses}, доля: {info.hit_rate:.1%}")
+
+
+def main() -> None:
+    """Печатает время пакета без памяти подвыражений и с ней."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    measure("арифметика и sin:", formulas(CHEAP_TERMS, count))
+    register_function("norm", norm)
+    try:
+        measure("функция на Python:", formulas(COSTLY_TERMS, count))
+    finally:
+        unregister("norm")
+
+
+if __name__ == "__main__":
+    main()
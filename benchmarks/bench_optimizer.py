@@ -0,0 +1,42 @@
+"""
+Сравнение evaluate_rpn с вычислением оптимизированного графа.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_optimizer
+"""
+
+import timeit
+
+from calc import evaluate_rpn
+from optimizer import optimize
+from shunting_yard import shunting_yard
+
+EXPRESSION = (
+    "x/(7-(y+1))*3-(2+(y+1))*x/(7-(200+y))*3-(2+(y+1))"
+    "*(x/(7-(y+1))*3-(2+(y+1))+x/(7-(y+1))*3-(2+(1+1)))"
+)
+NUMBER = 20000
+
+
+def main() -> None:
+    """Печатает время одного вычисления и число удаленных операций."""
+    variables = {"x": 15.0, "y": 1.0}
+    rpn_tokens = shunting_yard(EXPRESSION, variables)
+    rpn = " ".join(rpn_tokens)
+    optimized = optimize(rpn_tokens, variables)
+
+    plain = min(timeit.repeat(lambda: evaluate_rpn(rpn, variables), number=NUMBER, repeat=5))
+    graph = min(
+        timeit.repeat(lambda: optimized.evaluate(variables), number=NUMBER, repeat=5)
+    )
+    print(
+        f"операций: {optimized.operations_before} -> {optimized.operations_after} "
+        f"(удалено {optimized.removed}, свернуто {optimized.folded})"
+    )
+    print(f"evaluate_rpn         {plain / NUMBER * 1e6:7.2f} мкс")
+    print(f"граф после optimize  {graph / NUMBER * 1e6:7.2f} мкс  x{plain / graph:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Последовательное и параллельное преобразование одного длинного выражения.
+
+Выражение — сумма и разность слагаемых со скобками, функциями, ^ и
+переменной x. Измеряется время shunting_yard и parallel_shunting_yard, а
+также последовательного вычисления evaluate_tokens(shunting_yard(...)) и
+parallel_evaluate с разным количеством процессов. Ускорение ограничено
+количеством процессоров машины: на одном процессоре параллельный режим
+медленнее из-за передачи частей и ПОЛИЗ между процессами.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_parallel [размер выражения в МиБ]
+"""
+
+import os
+import random
+import sys
+import time
+
+from calc import evaluate_tokens
+from parallel import parallel_evaluate, parallel_shunting_yard
+from shunting_yard import shunting_yard
+
+VARIABLES = {"x": 0.5}
+
+
+def expression(size: int) -> str:
+    """Генерирует сумму слагаемых длиной не меньше size символов."""
+    rng = random.Random(0)
+    terms = [
+        f"{rng.randint(1, 99)} * (x - {rng.uniform(0, 9):.2f}) / {rng.randint(1, 9)} ^ 2"
+        f" - sin({rng.randint(1, 9)} * x) * (1 + 2 * (x + {rng.randint(1, 9)}))"
+        for _ in range(1000)
+    ]
+    block = " + ".join(terms)
+    return " - ".join([block] * (size // len(block) + 1))
+
+
+def elapsed(function) -> float:
+    """Время одного вызова function."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Печатает время последовательного и параллельного режимов."""
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 8
+    text = expression(int(megabytes * 2**20))
+    cpus = os.cpu_count() or 1
+    print(f"выражение: {len(text) / 2**20:.1f} МиБ, процессоров: {cpus}")
+
+    expected = shunting_yard(text, VARIABLES)
+    sequential = elapsed(lambda: shunting_yard(text, VARIABLES))
+    print(f"shunting_yard:            {sequential:.2f} с")
+    for workers in sorted({1, 2, cpus}):
+        assert parallel_shunting_yard(text, VARIABLES, workers) == expected
+        seconds = elapsed(lambda: parallel_shunting_yard(text, VARIABLES, workers))
+        print(f"  {workers} процесс(ов):          {seconds:.2f} с (x{sequential / seconds:.2f})")
+
+    value = evaluate_tokens(expected, VARIABLES)
+    sequential = elapsed(lambda: evaluate_tokens(shunting_yard(text, VARIABLES), VARIABLES))
+    print(f"разбор и вычисление:      {sequential:.2f} с")
+    for workers in sorted({1, 2, cpus}):
+        assert parallel_evaluate(text, VARIABLES, workers) == value
+        seconds = elapsed(lambda: parallel_evaluate(text, VARIABLES, workers))
+        print(f"  {workers} процесс(ов):          {seconds:.2f} с (x{sequential / seconds:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Способы преобразования в ПОЛИЗ: shunting_yard, strict и pratt.
+
+Для каждого набора выражений из benchmarks.suite измеряется время
+преобразования всех выражений каждым способом через parsing.parse;
+результат — пропускная способность в токенах ПОЛИЗ в секунду и отношение
+к shunting_yard. Перед замером проверяется, что все способы дают
+одинаковую ПОЛИЗ.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_parse [--repeat 5]
+"""
+
+import argparse
+
+from benchmarks.generator import generate
+from benchmarks.suite import WORKLOADS, best_time
+from parsing import ENGINES, parse
+
+
+def main() -> None:
+    """Печатает пропускную способность способов разбора на каждом наборе."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--repeat", type=int, default=5, help="количество замеров")
+    args = parser.parse_args()
+
+    print(f"{'набор':<14}" + "".join(f"{engine:>22}" for engine in ENGINES))
+    for name, (profile, count) in WORKLOADS.items():
+        expressions = generate(profile, count)
+        expected = [parse(expression) for expression in expressions]
+        for engine in ENGINES:
+            assert [parse(e, engine) for e in expressions] == expected, engine
+        tokens = sum(len(rpn) for rpn in expected)
+
+        rates = {}
+        for engine in ENGINES:
+            elapsed = best_time(
+                lambda: [parse(expression, engine) for expression in expressions],
+                args.repeat,
+            )
+            rates[engine] = tokens / elapsed
+        base = rates["shunting_yard"]
+        print(
+            f"{name:<14}"
+            + "".join(
+                f"{rate / 1e6:>13.2f} Мток/с x{rate / base:.2f}"
+                for rate in rates.values()
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Сравнение разбора формул при запуске с загрузкой пакета программ через mmap.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_program
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from calc import evaluate_rpn
+from program import Bundle, compile_program, write_bundle
+from shunting_yard import shunting_yard
+
+FORMULAS = 10000
+
+
+def random_expression(rng: random.Random, size: int) -> str:
+    """Генерирует случайное корректное выражение из size чисел."""
+    expression = str(rng.randint(1, 99))
+    for _ in range(size - 1):
+        operator = rng.choice("+-*/")
+        expression = f"({expression}) {operator} {rng.randint(1, 99)}"
+    return expression
+
+
+def main() -> None:
+    """Печатает время подготовки и вычисления всех формул."""
+    rng = random.Random(0)
+    expressions = [random_expression(rng, rng.randint(2, 30)) for _ in range(FORMULAS)]
+
+    start = time.perf_counter()
+    rpns = [" ".join(shunting_yard(expression)) for expression in expressions]
+    parse = time.perf_counter() - start
+    start = time.perf_counter()
+    for rpn in rpns:
+        evaluate_rpn(rpn)
+    evaluate = time.perf_counter() - start
+    print(f"разбор при запуске  {parse * 1e3:8.1f} мс  вычисление evaluate_rpn {evaluate * 1e3:8.1f} мс")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "formulas.rpnb")
+        write_bundle(path, (compile_program(rpn) for rpn in rpns))
+        start = time.perf_counter()
+        bundle = Bundle(path)
+        load = time.perf_counter() - start
+        start = time.perf_counter()
+        for index in range(len(bundle)):
+            bundle.evaluate(index)
+        evaluate = time.perf_counter() - start
+        bundle.close()
+    print(f"открытие пакета     {load * 1e3:8.1f} мс  вычисление Bundle       {evaluate * 1e3:8.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Стоимость обработки одного токена в зависимости от числа зарегистрированных функций.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_registry
+"""
+
+import string
+import timeit
+
+from calc import evaluate_rpn
+from registry import register_function, unregister
+from shunting_yard import shunting_yard
+
+EXPRESSION = "3 + 4 * 2 / (1 - 5) ^ 2 ^ 3 - sin(pi / 2) * 2"
+NUMBER = 20000
+
+
+def function_name(index: int) -> str:
+    """Возвращает уникальное буквенное имя функции."""
+    letters = string.ascii_lowercase
+    name = "fn"
+    while True:
+        name += letters[index % len(letters)]
+        index //= len(letters)
+        if index == 0:
+            return name
+
+
+def main() -> None:
+    """Печатает время на токен при разном размере реестра."""
+    rpn = " ".join(shunting_yard(EXPRESSION))
+    tokens = len(rpn.split())
+    registered: list[str] = []
+
+    for size in (0, 10, 100, 1000, 10000):
+        while len(registered) < size:
+            name = function_name(len(registered))
+            register_function(name, abs)
+            registered.append(name)
+        seconds = min(timeit.repeat(lambda: evaluate_rpn(rpn), number=NUMBER, repeat=5))
+        print(f"функций в реестре {size:6}  {seconds / NUMBER / tokens * 1e9:7.1f} нс/токен")
+
+    for name in registered:
+        unregister(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Пиковая память при вычислении длинного выражения списками и генераторами.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_streaming
+"""
+
+import time
+import tracemalloc
+
+from calc import evaluate_rpn
+from calculator import calculate_chunked
+from shunting_yard import shunting_yard
+
+TERMS = 100000
+CHUNK_SIZE = 1 << 16
+
+
+def chunks() -> object:
+    """Генерирует выражение 1+2+...+1 частями, не собирая его целиком."""
+    buffer = []
+    size = 0
+    for i in range(TERMS):
+        term = f"{i % 97}+"
+        buffer.append(term)
+        size += len(term)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    yield "".join(buffer) + "1"
+
+
+def measure(name: str, function) -> None:
+    """Печатает время и пиковую память вызова function."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:36} {elapsed:6.2f} с  пик {peak / 1024 / 1024:8.2f} МиБ")
+
+
+def main() -> None:
+    """Сравнивает списочный и потоковый конвейеры."""
+    measure(
+        "shunting_yard + evaluate_rpn",
+        lambda: evaluate_rpn(" ".join(shunting_yard("".join(chunks())))),
+    )
+    measure("calculate_chunked", lambda: calculate_chunked(chunks()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Вычисление пакета выражений, отличающихся только числами.
+
+Пакет состоит из нескольких шаблонов (выражений генератора, в которых
+числа заменены случайными). Сравнивается построчное вычисление
+evaluate_rpn и calculate с evaluate_templates, которая группирует выражения
+по шаблону и вычисляет каждую группу одним векторным проходом. Количество
+шаблонов задает средний размер группы.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_templates [выражений] [шаблонов] [размер шаблона]
+"""
+
+import random
+import re
+import sys
+import time
+from collections.abc import Callable
+
+from batch import BatchResult
+from benchmarks.generator import Profile, generate
+from calc import evaluate_rpn
+from calculator import calculate
+from shunting_yard import shunting_yard
+from stream import EXPRESSION_ERRORS
+from templates import evaluate_templates
+
+
+def batch(count: int, templates: int, size: int) -> list[str]:
+    """Генерирует выражения из templates шаблонов размера size со случайными числами."""
+    rng = random.Random(0)
+    shapes = [
+        re.sub(r"\d+", "{}", expression)
+        for expression in generate(Profile(size=size, function_density=0.2), templates)
+    ]
+    expressions = []
+    for _ in range(count):
+        shape = rng.choice(shapes)
+        numbers = [rng.randint(1, 99) for _ in range(shape.count("{}"))]
+        expressions.append(shape.format(*numbers))
+    return expressions
+
+
+def evaluate_each(
+    evaluate: Callable[[str], float], expressions: list[str]
+) -> list[BatchResult]:
+    """Вычисляет выражения по одному, сохраняя ошибки, как evaluate_templates."""
+    results = []
+    for expression in expressions:
+        try:
+            results.append(BatchResult(evaluate(expression), None))
+        except EXPRESSION_ERRORS as e:
+            results.append(BatchResult(None, str(e)))
+    return results
+
+
+def elapsed(function: Callable[[], object]) -> float:
+    """Время одного вызова function."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Печатает время построчного и сгруппированного вычисления."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    templates = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+    infix = batch(count, templates, size)
+    rpns = [" ".join(shunting_yard(expression)) for expression in infix]
+    print(f"выражений: {count}, шаблонов: {templates}, размер шаблона: {size}")
+
+    for name, expressions, evaluate, rpn in [
+        ("ПОЛИЗ, evaluate_rpn", rpns, evaluate_rpn, True),
+        ("инфикс, calculate", infix, calculate, False),
+    ]:
+        rows = elapsed(lambda: evaluate_each(evaluate, expressions))
+        grouped = elapsed(lambda: evaluate_templates(expressions, rpn))
+        print(
+            f"  {name:<20} {rows:.2f} с, evaluate_templates {grouped:.2f} с "
+            f"(x{rows / grouped:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Масштабирование evaluate_batch_threads по количеству потоков.
+
+Измеряется время вычисления пакета без пула, в пуле потоков
+(evaluate_batch_threads) и в пуле процессов (evaluate_batch) с одинаковым
+количеством исполнителей. В сборке CPython без GIL (3.13t и новее) потоки
+вычисляют выражения параллельно и не сериализуют их pickle; в обычной
+сборке потоки выполняются по очереди, и ускорения нет.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_threads [количество выражений]
+"""
+
+import os
+import sys
+import sysconfig
+import time
+
+from batch import evaluate_batch, evaluate_batch_threads
+from benchmarks.bench_batch import CHUNK_SIZE, expressions
+from calculator import calculate
+
+
+def gil_enabled() -> bool:
+    """True, если интерпретатор выполняет потоки под GIL."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled() if is_gil_enabled is not None else True
+
+
+def elapsed(run) -> float:
+    """Время вычисления пакета функцией run, выдающей результаты."""
+    start = time.perf_counter()
+    for _ in run():
+        pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Печатает время и ускорение потоков и процессов для 1..N исполнителей."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    batch = expressions(count)
+    cpus = os.cpu_count() or 1
+    free_threading = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    print(
+        f"сборка без GIL: {'да' if free_threading else 'нет'}, "
+        f"GIL включен: {'да' if gil_enabled() else 'нет'}, процессоров: {cpus}"
+    )
+
+    sequential = elapsed(lambda: map(calculate, batch))
+    print(f"без пула                {sequential:6.2f} с")
+
+    expected = list(evaluate_batch_threads(batch, workers=1))
+    for workers in sorted({1, 2, 4, cpus}):
+        assert list(evaluate_batch_threads(batch, workers)) == expected
+        threads = elapsed(lambda: evaluate_batch_threads(batch, workers))
+        processes = elapsed(lambda: evaluate_batch(batch, workers, CHUNK_SIZE))
+        print(
+            f"исполнителей {workers:3}   потоки {threads:6.2f} с x{sequential / threads:.2f}"
+            f"   процессы {processes:6.2f} с x{sequential / processes:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Строковые и типизированные токены: время и память.
+
+Сравниваются два конвейера на выражении с десятичными и экспоненциальными
+числами и переменной x:
+
+- строковый: tokenize -> shunting_yard -> evaluate_tokens;
+- типизированный: tokenize_typed -> shunting_yard_typed -> evaluate_typed.
+
+Измеряется время однократного разбора и вычисления, время повторного
+вычисления уже разобранного выражения с разными значениями x, память,
+занимаемая ПОЛИЗ, и пиковая память разбора (tracemalloc).
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_tokens [количество слагаемых]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from calc import evaluate_tokens, evaluate_typed
+from shunting_yard import shunting_yard, shunting_yard_typed, tokenize_typed
+
+
+def expression(terms: int) -> str:
+    """Генерирует сумму произведений чисел разного вида и переменной x."""
+    rng = random.Random(0)
+    numbers = [
+        lambda: str(rng.randint(1, 999)),
+        lambda: f"{rng.uniform(0, 100):.3f}",
+        lambda: f"{rng.uniform(1, 9):.2f}e-{rng.randint(1, 5)}",
+    ]
+    parts = []
+    for _ in range(terms):
+        number = rng.choice(numbers)()
+        parts.append(rng.choice([f"{number} * x", f"({number} - x) / 3", number]))
+    return " + ".join(parts)
+
+
+def best(function: Callable[[], object], repeat: int = 5) -> float:
+    """Лучшее время из repeat запусков."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def memory(function: Callable[[], object]) -> tuple[int, int]:
+    """Память результата и пиковая память вызова, в байтах."""
+    tracemalloc.start()
+    result = function()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def main() -> None:
+    """Печатает время и память строкового и типизированного конвейеров."""
+    terms = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    text = expression(terms)
+    values = [{"x": value / 10} for value in range(50)]
+
+    def parse_strings() -> list[str]:
+        return shunting_yard(text, ["x"])
+
+    def parse_typed() -> list:
+        return shunting_yard_typed(tokenize_typed(text), ["x"])
+
+    strings = parse_strings()
+    typed = parse_typed()
+    assert evaluate_tokens(strings, values[1]) == evaluate_typed(typed, values[1])
+
+    once_strings = best(lambda: evaluate_tokens(parse_strings(), values[1]))
+    once_typed = best(lambda: evaluate_typed(parse_typed(), values[1]))
+    again_strings = best(lambda: [evaluate_tokens(strings, v) for v in values])
+    again_typed = best(lambda: [evaluate_typed(typed, v) for v in values])
+    size_strings, peak_strings = memory(parse_strings)
+    size_typed, peak_typed = memory(parse_typed)
+
+    print(f"выражение: {len(text)} символов, {len(strings)} токенов ПОЛИЗ")
+    print("разбор и вычисление:")
+    print(f"  строки:         {once_strings * 1000:.2f} мс")
+    print(f"  Token:          {once_typed * 1000:.2f} мс  (x{once_strings / once_typed:.2f})")
+    print(f"повторное вычисление ({len(values)} значений x):")
+    print(f"  строки:         {again_strings * 1000:.2f} мс")
+    print(f"  Token:          {again_typed * 1000:.2f} мс  (x{again_strings / again_typed:.2f})")
+    print("память ПОЛИЗ / пиковая память разбора:")
+    print(f"  строки:         {size_strings / 1024:.0f} / {peak_strings / 1024:.0f} КиБ")
+    print(f"  Token:          {size_typed / 1024:.0f} / {peak_typed / 1024:.0f} КиБ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Проверка пакета формул: validate_many и преобразование с вычислением.
+
+В каждой десятой формуле пакета удалена закрывающая скобка или добавлен
+оператор в конце. Без строгой проверки такая ошибка обнаруживается только
+при вычислении ПОЛИЗ, а ошибки вычисления корректных формул (деление на
+ноль) неотличимы от ошибок разбора.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_validation [количество формул]
+"""
+
+import sys
+import time
+
+from benchmarks.generator import Profile, generate
+from calc import evaluate_tokens
+from shunting_yard import shunting_yard
+from stream import EXPRESSION_ERRORS
+from validation import strict_shunting_yard, validate_many
+
+
+def convert_and_evaluate(expressions: list[str]) -> int:
+    """Количество ошибок, найденных преобразованием и вычислением."""
+    errors = 0
+    for expression in expressions:
+        try:
+            evaluate_tokens(shunting_yard(expression))
+        except EXPRESSION_ERRORS:
+            errors += 1
+    return errors
+
+
+def strict_convert(expressions: list[str]) -> int:
+    """Количество ошибок, найденных strict_shunting_yard."""
+    errors = 0
+    for expression in expressions:
+        try:
+            strict_shunting_yard(expression)
+        except ValueError:
+            errors += 1
+    return errors
+
+
+def main() -> None:
+    """Печатает время проверки пакета и количество найденных ошибок."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    expressions = generate(Profile(size=12, depth=3, function_density=0.2), count)
+    for index in range(0, count, 10):
+        expression = expressions[index]
+        if ")" in expression:
+            expressions[index] = expression.replace(")", "", 1)
+        else:
+            expressions[index] = expression + " *"
+
+    for title, check in [
+        ("shunting_yard + evaluate_tokens", convert_and_evaluate),
+        ("strict_shunting_yard", strict_convert),
+        ("validate_many", lambda batch: sum(e is not None for e in validate_many(batch))),
+    ]:
+        start = time.perf_counter()
+        errors = check(expressions)
+        elapsed = time.perf_counter() - start
+        print(f"{title:<32} {elapsed:.3f} с, ошибок найдено: {errors} из {count // 10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Пересчет набора зависимых формул: все формулы и только измененные.
+
+Формулы образуют столбцы: каждая формула зависит от предыдущей формулы
+своего столбца, от входного значения столбца и от общего входного значения
+rate. Изменение входного значения столбца затрагивает только его формулы,
+изменение rate — все. Workspace пересчитывает только затронутые формулы, а
+полный пересчет вычисляет все формулы в топологическом порядке.
+
+Первое изменение после задания формул дополнительно строит топологический
+порядок всех формул.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.bench_workspace [количество формул]
+"""
+
+import string
+import sys
+import time
+
+from calc import evaluate_tokens
+from compiler import find_variables
+from shunting_yard import shunting_yard
+from workspace import Workspace
+
+WIDTH = 100
+
+
+def name(prefix: str, index: int) -> str:
+    """Имя из букв: prefix и номер в 26-ричной записи."""
+    letters = string.ascii_lowercase
+    result = ""
+    while True:
+        index, digit = divmod(index, 26)
+        result = letters[digit] + result
+        if index == 0:
+            return prefix + result
+
+
+def main() -> None:
+    """Печатает время и количество пересчитанных формул."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    workspace = Workspace()
+    workspace.update({name("in", index): index / WIDTH for index in range(WIDTH)})
+    start = time.perf_counter()
+    workspace.set_input("rate", 0.5)
+    formulas = []
+    for index in range(count):
+        column = index % WIDTH
+        source = name("in", column)
+        if index < WIDTH:
+            expression = f"{source} * rate"
+        else:
+            previous = name("f", index - WIDTH)
+            expression = f"({previous} + {source}) / 2 + rate * sin({previous})"
+        workspace.define(name("f", index), expression)
+        formulas.append((name("f", index), expression))
+    print(f"формул: {count}, задание: {time.perf_counter() - start:.3f} с")
+
+    # Полный пересчет: все формулы по порядку задания (он топологический)
+    values = {name("in", index): index / WIDTH for index in range(WIDTH)}
+    values["rate"] = 0.5
+    rpns = [
+        (formula, shunting_yard(expression, find_variables(expression)))
+        for formula, expression in formulas
+    ]
+    start = time.perf_counter()
+    for formula, rpn in rpns:
+        values[formula] = evaluate_tokens(rpn, values)
+    full = time.perf_counter() - start
+    print(f"{'полный пересчет:':<22}{full * 1000:8.2f} мс, формул: {count}")
+
+    for title, inputs in [
+        ("первое изменение", {name("in", 1): 2.0}),
+        ("один столбец", {name("in", 0): 2.0}),
+        ("десять столбцов", {name("in", index): 3.0 for index in range(10)}),
+        ("rate (все)", {"rate": 0.25}),
+    ]:
+        start = time.perf_counter()
+        recomputed = workspace.update(inputs)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{title + ':':<22}{elapsed * 1000:8.2f} мс, формул: {recomputed} "
+            f"(x{full / elapsed:.1f})"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Генератор случайных выражений для бенчмарков.
+
+Выражения воспроизводимы: одинаковые профиль и seed дают одинаковые выражения.
+"""
+
+import random
+from typing import NamedTuple
+
+
+class Profile(NamedTuple):
+    """
+    Параметры генерируемых выражений.
+
+    Attributes:
+        size: Количество операндов верхнего уровня
+        depth: Глубина вложенности скобок (одна вложенная цепочка на выражение)
+        literal_length: Максимальное количество цифр в числе
+        pow_chain: Длина цепочек возведения в степень (a ^ b ^ c ...)
+        pow_density: Доля операндов, заменяемых цепочкой степеней
+        function_density: Доля операндов, обернутых в sin или замененных на pi
+    """
+
+    size: int = 10
+    depth: int = 0
+    literal_length: int = 3
+    pow_chain: int = 3
+    pow_density: float = 0.0
+    function_density: float = 0.0
+
+
+def generate(profile: Profile, count: int, seed: int = 0) -> list[str]:
+    """
+    Генерирует выражения по профилю.
+
+    Args:
+        profile: Параметры выражений
+        count: Количество выражений
+        seed: Начальное значение генератора случайных чисел
+
+    Returns:
+        Выражения в инфиксной записи
+    """
+    rng = random.Random(seed)
+    return [generate_expression(rng, profile) for _ in range(count)]
+
+
+def generate_expression(rng: random.Random, profile: Profile) -> str:
+    """
+    Генерирует одно выражение по профилю.
+
+    Args:
+        rng: Генератор случайных чисел
+        profile: Параметры выражения
+
+    Returns:
+        Выражение в инфиксной записи
+    """
+    operands = [_operand(rng, profile) for _ in range(max(1, profile.size))]
+    if profile.depth > 0:
+        operands[rng.randrange(len(operands))] = _group(rng, profile, profile.depth)
+    return _chain(rng, operands)
+
+
+def _chain(rng: random.Random, operands: list[str]) -> str:
+    parts = [operands[0]]
+    for operand in operands[1:]:
+        parts.append(rng.choice("+-*/"))
+        parts.append(operand)
+    return " ".join(parts)
+
+
+def _group(rng: random.Random, profile: Profile, depth: int) -> str:
+    """Скобочная группа заданной глубины: ровно одна цепочка вложенных скобок."""
+    inner = _group(rng, profile, depth - 1) if depth > 1 else _operand(rng, profile)
+    operands = [inner, _operand(rng, profile)]
+    rng.shuffle(operands)
+    return f"({_chain(rng, operands)})"
+
+
+def _operand(rng: random.Random, profile: Profile) -> str:
+    if rng.random() < profile.pow_density:
+        # Показатели в основном единицы, чтобы длинные цепочки не переполнялись
+        exponents = [rng.choice("1112") for _ in range(profile.pow_chain - 1)]
+        return " ^ ".join([rng.choice("23")] + exponents)
+    if rng.random() < profile.function_density:
+        if rng.random() < 0.5:
+            return "pi"
+        return f"sin({_literal(rng, profile)})"
+    return _literal(rng, profile)
+
+
+def _literal(rng: random.Random, profile: Profile) -> str:
+    length = rng.randint(1, max(1, profile.literal_length))
+    return str(rng.randint(1, 9)) + "".join(
+        rng.choice("0123456789") for _ in range(length - 1)
+    )
@@ -0,0 +1,96 @@
+"""
+Нагрузочный тест сервера вычисления выражений.
+
+Запуск из корня репозитория (сервер запускается в том же процессе):
+
+    python3 -m benchmarks.load_test [--clients N] [--requests N] [--pipeline N]
+
+С --unix PATH или --port N тест подключается к уже запущенному серверу.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from client import Client
+from server import CalculatorServer
+
+
+def expressions(count: int, seed: int) -> list[str]:
+    """Генерирует count случайных выражений средней длины."""
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        terms = [str(rng.randint(1, 99)) for _ in range(rng.randint(3, 12))]
+        expression = terms[0]
+        for term in terms[1:]:
+            expression = f"({expression} {rng.choice('+-*/')} {term})"
+        result.append(expression)
+    return result
+
+
+async def run_client(
+    connect, batch: list[str], pipeline: int, latencies: list[float]
+) -> None:
+    """Отправляет выражения пачками по pipeline штук и записывает задержки."""
+    async with await connect() as client:
+        for start in range(0, len(batch), pipeline):
+            began = time.perf_counter()
+            await client.evaluate_many(batch[start:start + pipeline])
+            latencies.append(time.perf_counter() - began)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Возвращает перцентиль отсортированного списка."""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def load(args: argparse.Namespace) -> None:
+    server = None
+    path = args.unix
+    if path is None and args.port is None:
+        path = os.path.join(tempfile.mkdtemp(), "calc.sock")
+        server = CalculatorServer()
+        await server.start_unix(path)
+
+    if path is not None:
+        connect = lambda: Client.connect_unix(path)  # noqa: E731
+    else:
+        connect = lambda: Client.connect_tcp(args.host, args.port)  # noqa: E731
+
+    latencies: list[float] = []
+    batches = [expressions(args.requests, seed) for seed in range(args.clients)]
+    began = time.perf_counter()
+    await asyncio.gather(
+        *(run_client(connect, batch, args.pipeline, latencies) for batch in batches)
+    )
+    elapsed = time.perf_counter() - began
+
+    if server is not None:
+        await server.close()
+
+    latencies.sort()
+    total = args.clients * args.requests
+    print(f"клиентов: {args.clients}, запросов: {total}, конвейер: {args.pipeline}")
+    print(f"запросов в секунду: {total / elapsed:.0f}")
+    print(f"задержка пачки p50: {percentile(latencies, 0.50) * 1000:.2f} мс")
+    print(f"задержка пачки p99: {percentile(latencies, 0.99) * 1000:.2f} мс")
+
+
+def main() -> None:
+    """Запускает нагрузочный тест и печатает пропускную способность и задержки."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000, help="запросов на клиента")
+    parser.add_argument("--pipeline", type=int, default=1, help="запросов в пачке")
+    parser.add_argument("--unix", help="путь к Unix-сокету запущенного сервера")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="порт запущенного сервера")
+    asyncio.run(load(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Набор бенчмарков для tokenize, shunting_yard и evaluate_rpn.
+
+Каждая фаза измеряется отдельно на нескольких наборах выражений; результат
+— пропускная способность в токенах в секунду. Результаты сравниваются с
+сохраненным эталоном, и при падении пропускной способности больше чем на
+заданный процент команда завершается с кодом 1.
+
+Запуск из корня репозитория:
+
+    python3 -m benchmarks.suite [--baseline benchmarks/baseline.json]
+                                [--threshold 20] [--output results.json]
+                                [--update-baseline]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from collections.abc import Callable
+from typing import Optional
+
+from benchmarks.generator import Profile, generate
+from calc import evaluate_rpn
+from shunting_yard import iter_shunting_yard, tokenize
+from stream import EXPRESSION_ERRORS
+
+# Наборы выражений: название, профиль и количество выражений
+WORKLOADS: dict[str, tuple[Profile, int]] = {
+    "short": (Profile(size=5), 4000),
+    "long": (Profile(size=400), 50),
+    "deep": (Profile(size=2, depth=200), 100),
+    "long_literals": (Profile(size=20, literal_length=60), 1000),
+    "pow_chains": (Profile(size=10, pow_chain=8, pow_density=0.5), 1000),
+    "functions": (Profile(size=10, function_density=0.6), 1000),
+}
+
+PHASES = ("tokenize", "shunting_yard", "evaluate_rpn")
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    """
+    Возвращает минимальное время одного выполнения function.
+
+    Количество выполнений в замере подбирается так, чтобы замер длился не
+    меньше 0,2 с: на коротких замерах шум сильнее самого измерения.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def evaluate_all(rpns: list[str]) -> int:
+    """Вычисляет выражения в ПОЛИЗ и возвращает количество ошибок."""
+    errors = 0
+    for rpn in rpns:
+        try:
+            evaluate_rpn(rpn)
+        except EXPRESSION_ERRORS:
+            errors += 1
+    return errors
+
+
+def measure(expressions: list[str], repeat: int) -> dict[str, float]:
+    """
+    Измеряет пропускную способность каждой фазы на наборе выражений.
+
+    Каждая фаза получает на вход готовый результат предыдущей, поэтому
+    время одной фазы не включает остальные.
+
+    Returns:
+        Токенов в секунду для каждой фазы
+    """
+    token_lists = [tokenize(expression) for expression in expressions]
+    rpn_lists = [list(iter_shunting_yard(tokens)) for tokens in token_lists]
+    rpns = [" ".join(rpn) for rpn in rpn_lists]
+    input_tokens = sum(len(tokens) for tokens in token_lists)
+    rpn_tokens = sum(len(rpn) for rpn in rpn_lists)
+
+    times = {
+        "tokenize": best_time(lambda: [tokenize(e) for e in expressions], repeat),
+        "shunting_yard": best_time(
+            lambda: [list(iter_shunting_yard(t)) for t in token_lists], repeat
+        ),
+        "evaluate_rpn": best_time(lambda: evaluate_all(rpns), repeat),
+    }
+    sizes = {
+        "tokenize": input_tokens,
+        "shunting_yard": input_tokens,
+        "evaluate_rpn": rpn_tokens,
+    }
+    return {phase: sizes[phase] / times[phase] for phase in PHASES}
+
+
+def run(repeat: int) -> dict:
+    """Выполняет все наборы и возвращает результаты в виде словаря для JSON."""
+    results: dict[str, dict[str, float]] = {}
+    for name, (profile, count) in WORKLOADS.items():
+        results[name] = measure(generate(profile, count, seed=0), repeat)
+    return {"python": platform.python_version(), "results": results}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Сравнивает результаты с эталоном.
+
+    Args:
+        current: Результаты текущего запуска
+        baseline: Эталонные результаты
+        threshold: Допустимое падение пропускной способности в процентах
+
+    Returns:
+        Описания регрессий; пустой список, если регрессий нет
+    """
+    regressions = []
+    for name, phases in baseline["results"].items():
+        for phase, expected in phases.items():
+            actual = current["results"].get(name, {}).get(phase)
+            if actual is None:
+                continue
+            drop = (expected - actual) / expected * 100
+            if drop > threshold:
+                regressions.append(
+                    f"{name}/{phase}: {actual:,.0f} токенов/с, "
+                    f"эталон {expected:,.0f} (-{drop:.1f}%)"
+                )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Запускает бенчмарки и сравнивает результаты с эталоном."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--baseline", help="файл эталонных результатов")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=20.0,
+        help="допустимое падение пропускной способности в процентах",
+    )
+    parser.add_argument("--output", help="файл для результатов в формате JSON")
+    parser.add_argument("--repeat", type=int, default=3, help="количество замеров")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="записать результаты в файл эталона",
+    )
+    args = parser.parse_args(argv)
+
+    current = run(args.repeat)
+    for name, phases in current["results"].items():
+        row = "  ".join(f"{phase} {phases[phase]:>12,.0f}" for phase in PHASES)
+        print(f"{name:<14} {row}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(current, file, indent=2)
+        return 0
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.threshold)
+        for regression in regressions:
+            print(f"Регрессия {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
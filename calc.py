@@ -1,5 +1,28 @@
-import math
+import argparse
+import functools
 import sys
+from collections.abc import Iterable, Mapping
+from itertools import islice
+from typing import Optional
+
+import limits as _limits
+import stats as _stats
+import stream
+# Проверки видов токенов определены в registry и доступны отсюда,
+# как и раньше
+from registry import (
+    CONSTANT,
+    FUNCTION,
+    JUMP_IF_ZERO,
+    OPERATOR,
+    SYMBOLS,
+    is_constant,
+    is_function,
+    is_jump,
+    is_number,
+    is_operator,
+)
+from tokens import NUMBER, VARIABLE, Token
 
 
 def parse_tokens(expression: str) -> list[str]:
@@ -17,54 +40,141 @@ def parse_tokens(expression: str) -> list[str]:
     return expression.strip().split()
 
 
-def is_operator(token: str) -> bool:
+def evaluate_rpn(
+    expression: str,
+    variables: Optional[Mapping[str, float]] = None,
+    stats: Optional[_stats.Stats] = None,
+    limits: Optional[_limits.Limits] = None,
+) -> float:
     """
-    Проверяет, является ли токен оператором.
+    Вычисляет результат арифметического выражения в обратной польской нотации (ПОЛИЗ).
+
+    Поддерживает числа (12, 1.5, 1.5e-3), операции +, -, *, /, ^, сравнения
+    (1.0 — истина, 0.0 — ложь), функции (sin), константы (pi), переменные и
+    переходы условной функции if.
 
     Args:
-        token: Токен для проверки
+        expression: Арифметическое выражение в обратной польской нотации
+        variables: Значения переменных, используемых в выражении
+        stats: Статистика, в которую записываются время вычисления, виды
+               токенов и глубина стека значений
+        limits: Ограничения длины, количества токенов, глубины стека,
+                показателя степени и времени
 
     Returns:
-        True, если токен является оператором
-    """
-    return token in ("+", "-", "*", "/", "^")
-
+        Результат вычисления
 
-def is_function(token: str) -> bool:
+    Raises:
+        ValueError: При недостаточном количестве операндов, делении на ноль,
+                   неизвестном токене или некорректном результате
+        LimitExceeded: При превышении ограничения
+    """
+    if stats is None and limits is None:
+        return evaluate_tokens(parse_tokens(expression), variables)
+    if limits is not None:
+        limits.check_length(expression)
+    tokens = parse_tokens(expression)
+    if stats is None:
+        return evaluate_tokens(tokens, variables, limits=limits)
+    stats.rpn_tokens.update(map(_stats.token_kind, tokens))
+    with stats.phase(_stats.EVALUATE):
+        return evaluate_tokens(tokens, variables, stats, limits)
+
+
+def evaluate_tokens(
+    tokens: Iterable[str],
+    variables: Optional[Mapping[str, float]] = None,
+    stats: Optional[_stats.Stats] = None,
+    limits: Optional[_limits.Limits] = None,
+) -> float:
     """
-    Проверяет, является ли токен функцией.
+    Вычисляет выражение, заданное потоком токенов обратной польской нотации.
+
+    Токены обрабатываются по одному по мере поступления, поэтому на вход
+    можно подать генератор (например, iter_shunting_yard) без построения
+    списка всех токенов. Переход пропускает токены невыбранной ветви if, не
+    вычисляя их.
 
     Args:
-        token: Токен для проверки
+        tokens: Токены выражения в обратной польской нотации
+        variables: Значения переменных, используемых в выражении
+        stats: Статистика, в которую записывается глубина стека значений
+        limits: Ограничения количества токенов, глубины стека, показателя
+                степени и времени
 
     Returns:
-        True, если токен является функцией (sin)
-    """
-    return token == "sin"
-
+        Результат вычисления
 
-def is_constant(token: str) -> bool:
+    Raises:
+        ValueError: При недостаточном количестве операндов, делении на ноль,
+                   неизвестном токене или некорректном результате
+        LimitExceeded: При превышении ограничения
     """
-    Проверяет, является ли токен константой.
+    stack: list[float] = [] if stats is None else stats.value_stack()
+    symbols = SYMBOLS
+    if limits is not None:
+        tokens = limits.rpn_tokens(tokens)
+        symbols = limits.symbols()
+    # Переходы пропускают токены того же итератора
+    tokens = iter(tokens)
 
-    Args:
-        token: Токен для проверки
+    for token in tokens:
+        symbol = symbols.get(token)
+        if symbol is None:
+            if is_number(token):
+                stack.append(float(token))
+            elif variables is not None and token in variables:
+                stack.append(float(variables[token]))
+            elif is_jump(token):
+                if token[0] == JUMP_IF_ZERO:
+                    if not stack:
+                        raise ValueError("Недостаточно операндов для условия")
+                    if stack.pop():
+                        continue
+                # Пропускаем невыбранную ветвь
+                count = int(token[1:])
+                next(islice(tokens, count, count), None)
+            else:
+                raise ValueError(f"Неизвестный токен: {token}")
+        elif symbol.kind == OPERATOR:
+            if len(stack) < 2:
+                raise ValueError("Недостаточно операндов для операции")
+            b = stack.pop()
+            stack[-1] = symbol.implementation(stack[-1], b)
+        elif symbol.kind == FUNCTION:
+            arity = symbol.arity
+            if len(stack) < arity:
+                raise ValueError("Недостаточно операндов для функции")
+            if arity == 1:
+                stack[-1] = symbol.implementation(stack[-1])
+            else:
+                operands = stack[-arity:]
+                del stack[-arity:]
+                stack.append(symbol.implementation(*operands))
+        else:
+            stack.append(symbol.value)
 
-    Returns:
-        True, если токен является константой (pi)
-    """
-    return token == "pi"
+    if len(stack) != 1:
+        raise ValueError("Некорректное выражение: в стеке остается не один элемент")
+
+    return stack[0]
 
 
-def evaluate_rpn(expression: str) -> float:
+def evaluate_typed(
+    tokens: Iterable[Token], variables: Optional[Mapping[str, float]] = None
+) -> float:
     """
-    Вычисляет результат арифметического выражения в обратной польской нотации (ПОЛИЗ).
+    Вычисляет выражение, заданное типизированными токенами ПОЛИЗ.
 
-    Поддерживает целые числа, операции +, -, *, /, ^, функции (sin),
-    константы (pi).
+    Значения чисел и констант и реализации операций берутся из токенов,
+    поэтому числа не разбираются повторно и реестр не просматривается.
+    Подходит для многократного вычисления одного выражения с разными
+    значениями переменных.
 
     Args:
-        expression: Арифметическое выражение в обратной польской нотации
+        tokens: Токены Token в обратной польской нотации (результат
+                shunting_yard_typed)
+        variables: Значения переменных, используемых в выражении
 
     Returns:
         Результат вычисления
@@ -73,49 +183,31 @@ def evaluate_rpn(expression: str) -> float:
         ValueError: При недостаточном количестве операндов, делении на ноль,
                    неизвестном токене или некорректном результате
     """
-    tokens = parse_tokens(expression)
     stack: list[float] = []
 
     for token in tokens:
-        if token.isdigit() or (token.startswith("-") and token[1:].isdigit()):
-            stack.append(float(token))
-        elif is_constant(token):
-            stack.append(math.pi)
-        elif is_operator(token):
+        kind = token.kind
+        if kind == NUMBER or kind == CONSTANT:
+            stack.append(token.value)
+        elif kind == OPERATOR:
             if len(stack) < 2:
                 raise ValueError("Недостаточно операндов для операции")
             b = stack.pop()
-            a = stack.pop()
-
-            if token == "+":
-                result = a + b
-            elif token == "-":
-                result = a - b
-            elif token == "*":
-                result = a * b
-            elif token == "/":
-                if b == 0:
-                    raise ValueError("Деление на ноль")
-                result = a / b
-            elif token == "^":
-                result = a ** b
-            else:
-                raise ValueError(f"Неизвестный оператор: {token}")
-
-            stack.append(result)
-        elif is_function(token):
-            if len(stack) < 1:
+            stack[-1] = token.symbol.implementation(stack[-1], b)
+        elif kind == FUNCTION:
+            arity = token.symbol.arity
+            if len(stack) < arity:
                 raise ValueError("Недостаточно операндов для функции")
-            operand = stack.pop()
-
-            if token == "sin":
-                result = math.sin(operand)
+            if arity == 1:
+                stack[-1] = token.symbol.implementation(stack[-1])
             else:
-                raise ValueError(f"Неизвестная функция: {token}")
-
-            stack.append(result)
+                operands = stack[-arity:]
+                del stack[-arity:]
+                stack.append(token.symbol.implementation(*operands))
+        elif kind == VARIABLE and variables is not None and token.text in variables:
+            stack.append(float(variables[token.text]))
         else:
-            raise ValueError(f"Неизвестный токен: {token}")
+            raise ValueError(f"Неизвестный токен: {token.text}")
 
     if len(stack) != 1:
         raise ValueError("Некорректное выражение: в стеке остается не один элемент")
@@ -123,17 +215,32 @@ def evaluate_rpn(expression: str) -> float:
     return stack[0]
 
 
-def main() -> None:
+def main(argv: Optional[list[str]] = None) -> None:
     """CLI интерфейс для вычисления выражений в обратной польской нотации."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    stream.add_arguments(parser)
+    _stats.add_argument(parser)
+    args = parser.parse_args(argv)
+    if args.stats and args.workers > 1:
+        parser.error("--stats несовместим с --workers больше 1")
+    stats = _stats.Stats() if args.stats else None
+
     try:
+        handler = functools.partial(evaluate_rpn, stats=stats)
+        if stream.run(args, handler, "result"):
+            return
+
         expression = sys.stdin.read().strip()
         if not expression:
             return
-        result = evaluate_rpn(expression)
+        result = evaluate_rpn(expression, stats=stats)
         print(result)
     except ValueError as e:
         print(f"Ошибка: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if stats is not None:
+            print(stats.report(), file=sys.stderr)
 
 
 if __name__ == "__main__":
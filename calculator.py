@@ -0,0 +1,232 @@
+import argparse
+import sys
+from collections.abc import Iterable, Mapping
+from typing import Optional
+
+import stream
+from calc import evaluate_tokens
+from registry import CONDITIONAL, FUNCTION, OPERATOR, SYMBOLS, is_number
+from shunting_yard import iter_shunting_yard, iter_tokens, iter_tokens_chunked, shunting_yard
+
+# Размер блока при чтении одного большого выражения из stdin
+CHUNK_SIZE = 1 << 16
+
+
+def calculate(expression: str) -> float:
+    """
+    Вычисляет арифметическое выражение в инфиксной записи.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+
+    Returns:
+        Результат вычисления
+
+    Raises:
+        ValueError: При ошибке разбора или вычисления выражения
+    """
+    return evaluate_infix(expression)
+
+
+def evaluate_infix(
+    expression: str, variables: Optional[Mapping[str, float]] = None
+) -> float:
+    """
+    Вычисляет выражение в инфиксной записи за один проход, без построения ПОЛИЗ.
+
+    Использует два стека: значений и операторов. Оператор применяется к
+    значениям в тот момент, когда алгоритм сортировочной станции выдал бы его
+    в выходную строку, поэтому приоритеты, правоассоциативность ^ и порядок
+    вычислений совпадают с shunting_yard + evaluate_rpn. Совпадают и ошибки:
+    ошибка разбора в любом месте выражения важнее ошибки вычисления.
+    Выражение с условной функцией if вычисляется через ПОЛИЗ с переходами,
+    чтобы невыбранная ветвь не вычислялась.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+        variables: Значения переменных, используемых в выражении
+
+    Returns:
+        Результат вычисления
+
+    Raises:
+        ValueError: При ошибке разбора или вычисления выражения
+    """
+    tokens = iter_tokens(expression)
+    values: list[float] = []
+    operators: list[str] = []
+    symbols = SYMBOLS
+
+    try:
+        for token in tokens:
+            if is_number(token):
+                values.append(float(token))
+                continue
+            symbol = symbols.get(token)
+            if symbol is None:
+                if variables is not None and token in variables:
+                    values.append(float(variables[token]))
+                elif token == "(":
+                    operators.append(token)
+                elif token == ")":
+                    while operators and operators[-1] != "(":
+                        _reduce(values, operators.pop())
+                    if operators:
+                        operators.pop()
+                    if operators:
+                        top = symbols.get(operators[-1])
+                        if top is not None and top.kind == FUNCTION:
+                            _reduce(values, operators.pop())
+                elif token == ",":
+                    while operators and operators[-1] != "(":
+                        _reduce(values, operators.pop())
+                elif token == CONDITIONAL:
+                    raise _ConditionalFound
+                elif token.isalpha():
+                    raise _UnknownIdentifierError(token)
+            elif symbol.kind == OPERATOR:
+                precedence = symbol.precedence
+                right = symbol.right_associative
+                while operators:
+                    top = symbols.get(operators[-1])
+                    if (
+                        top is None
+                        or top.kind == FUNCTION
+                        or precedence > top.precedence
+                        or (right and precedence == top.precedence)
+                    ):
+                        break
+                    operators.pop()
+                    if len(values) < 2:
+                        raise ValueError("Недостаточно операндов для операции")
+                    b = values.pop()
+                    values[-1] = top.implementation(values[-1], b)
+                operators.append(token)
+            elif symbol.kind == FUNCTION:
+                operators.append(token)
+            else:
+                values.append(symbol.value)
+
+        while operators:
+            _reduce(values, operators.pop())
+    except _UnknownIdentifierError as e:
+        raise ValueError(f"Неизвестная функция или константа: {e}") from None
+    except _ConditionalFound:
+        return _evaluate_conditional(expression, variables)
+    except stream.EXPRESSION_ERRORS:
+        # Ошибка разбора дальше по тексту важнее ошибки вычисления
+        for token in tokens:
+            if token == CONDITIONAL and not (variables is not None and token in variables):
+                # Ошибки разбора if определяет shunting_yard
+                return _evaluate_conditional(expression, variables)
+            if (
+                token.isalpha()
+                and token not in symbols
+                and not (variables is not None and token in variables)
+            ):
+                raise ValueError(
+                    f"Неизвестная функция или константа: {token}"
+                ) from None
+        raise
+
+    if len(values) != 1:
+        raise ValueError("Некорректное выражение: в стеке остается не один элемент")
+
+    return values[0]
+
+
+class _UnknownIdentifierError(Exception):
+    """Неизвестный идентификатор; отделяет ошибку разбора от ошибок вычисления."""
+
+
+class _ConditionalFound(Exception):
+    """В выражении встретилась условная функция if."""
+
+
+def _evaluate_conditional(
+    expression: str, variables: Optional[Mapping[str, float]]
+) -> float:
+    """Вычисляет выражение с if через ПОЛИЗ: переходы пропускают невыбранную ветвь."""
+    names = variables if variables is not None else ()
+    return evaluate_tokens(shunting_yard(expression, names), variables)
+
+
+def _reduce(values: list[float], token: str) -> None:
+    """
+    Применяет оператор или функцию к вершине стека значений.
+
+    Args:
+        values: Стек значений
+        token: Оператор или функция
+
+    Raises:
+        ValueError: При недостаточном количестве операндов, делении на ноль
+                   или неизвестном токене
+    """
+    symbol = SYMBOLS.get(token)
+    if symbol is None:
+        raise ValueError(f"Неизвестный токен: {token}")
+    arity = symbol.arity
+    if len(values) < arity:
+        if symbol.kind == OPERATOR:
+            raise ValueError("Недостаточно операндов для операции")
+        raise ValueError("Недостаточно операндов для функции")
+    if arity == 1:
+        values[-1] = symbol.implementation(values[-1])
+        return
+    operands = values[len(values) - arity:]
+    del values[len(values) - arity:]
+    values.append(symbol.implementation(*operands))
+
+
+def calculate_chunked(chunks: Iterable[str]) -> float:
+    """
+    Вычисляет выражение, поступающее частями, не храня его целиком.
+
+    Токенизатор, преобразование в ПОЛИЗ и вычисление связаны цепочкой
+    генераторов, поэтому объем памяти определяется глубиной стеков, а не
+    длиной выражения. Ошибка вычисления может быть обнаружена раньше ошибки
+    разбора, расположенной дальше по тексту.
+
+    Args:
+        chunks: Части выражения в инфиксной записи в порядке следования
+
+    Returns:
+        Результат вычисления
+
+    Raises:
+        ValueError: При ошибке разбора или вычисления выражения
+    """
+    return evaluate_tokens(iter_shunting_yard(iter_tokens_chunked(chunks)))
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """CLI интерфейс для вычисления выражений в инфиксной записи в одном процессе."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    stream.add_arguments(parser)
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="читать одно большое выражение по частям, не загружая его целиком",
+    )
+    args = parser.parse_args(argv)
+    if stream.run(args, calculate, "result"):
+        return
+
+    try:
+        if args.chunked:
+            chunks = iter(lambda: sys.stdin.read(CHUNK_SIZE), "")
+            print(calculate_chunked(chunks))
+            return
+        expression = sys.stdin.read().strip()
+        if not expression:
+            return
+        result = calculate(expression)
+        print(result)
+    except ValueError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
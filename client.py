@@ -0,0 +1,185 @@
+import argparse
+import asyncio
+import json
+import sys
+from collections.abc import Iterable
+from typing import Optional
+
+from server import MAX_REQUEST_SIZE
+
+
+class Client:
+    """
+    Клиент сервера вычисления выражений.
+
+    Запросы отправляются по одному соединению; evaluate_many отправляет
+    запросы конвейером, не дожидаясь ответов на предыдущие.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect_unix(cls, path: str) -> "Client":
+        """
+        Подключается к серверу через Unix-сокет.
+
+        Args:
+            path: Путь к сокету
+
+        Returns:
+            Клиент
+        """
+        reader, writer = await asyncio.open_unix_connection(path, limit=MAX_REQUEST_SIZE)
+        return cls(reader, writer)
+
+    @classmethod
+    async def connect_tcp(cls, host: str, port: int) -> "Client":
+        """
+        Подключается к серверу по TCP.
+
+        Args:
+            host: Адрес сервера
+            port: Порт сервера
+
+        Returns:
+            Клиент
+        """
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_REQUEST_SIZE)
+        return cls(reader, writer)
+
+    async def request(self, record: dict) -> dict:
+        """
+        Отправляет запрос и ждет ответа.
+
+        Args:
+            record: Объект запроса с полем "expression"
+
+        Returns:
+            Объект ответа с полем "result" или "error"
+        """
+        return (await self.request_many([record]))[0]
+
+    async def request_many(self, records: Iterable[dict]) -> list[dict]:
+        """
+        Отправляет запросы конвейером и возвращает ответы в порядке запросов.
+
+        Ответы читаются одновременно с отправкой, поэтому длинный конвейер
+        не блокируется на переполненном буфере сервера.
+
+        Args:
+            records: Объекты запросов
+
+        Returns:
+            Объекты ответов
+        """
+        lines = [json.dumps(record, ensure_ascii=False) + "\n" for record in records]
+
+        async def send() -> None:
+            for line in lines:
+                self._writer.write(line.encode())
+                await self._writer.drain()
+
+        sender = asyncio.ensure_future(send())
+        try:
+            responses = []
+            for _ in lines:
+                line = await self._reader.readline()
+                if not line:
+                    raise ConnectionError("Сервер закрыл соединение")
+                responses.append(json.loads(line))
+            await sender
+        finally:
+            sender.cancel()
+        return responses
+
+    async def evaluate(self, expression: str, rpn: bool = False) -> float:
+        """
+        Вычисляет выражение на сервере.
+
+        Args:
+            expression: Выражение в инфиксной записи или в ПОЛИЗ
+            rpn: Выражение записано в ПОЛИЗ
+
+        Returns:
+            Результат вычисления
+
+        Raises:
+            ValueError: При ошибке вычисления на сервере
+        """
+        return _result(await self.request(_record(expression, rpn)))
+
+    async def evaluate_many(
+        self, expressions: Iterable[str], rpn: bool = False
+    ) -> list[dict]:
+        """
+        Вычисляет выражения на сервере конвейером.
+
+        Args:
+            expressions: Выражения в инфиксной записи или в ПОЛИЗ
+            rpn: Выражения записаны в ПОЛИЗ
+
+        Returns:
+            Объекты ответов с полем "result" или "error"
+        """
+        return await self.request_many(_record(e, rpn) for e in expressions)
+
+    async def close(self) -> None:
+        """Закрывает соединение."""
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def __aenter__(self) -> "Client":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+
+def _record(expression: str, rpn: bool) -> dict:
+    return {"expression": expression, "rpn": True} if rpn else {"expression": expression}
+
+
+def _result(response: dict) -> float:
+    if "error" in response:
+        raise ValueError(response["error"])
+    return response["result"]
+
+
+async def _main(args: argparse.Namespace) -> None:
+    if args.unix:
+        client = await Client.connect_unix(args.unix)
+    else:
+        client = await Client.connect_tcp(args.host, args.port)
+    async with client:
+        expressions = [line.strip() for line in sys.stdin]
+        responses = await client.evaluate_many([e for e in expressions if e], args.rpn)
+    answers = iter(responses)
+    for number, expression in enumerate(expressions, 1):
+        if not expression:
+            print()
+            continue
+        response = next(answers)
+        if "error" in response:
+            print(f"Ошибка в строке {number}: {response['error']}", file=sys.stderr)
+            print()
+        else:
+            print(response["result"])
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Вычисляет выражения из stdin на сервере, по одному выражению в строке."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--unix", help="путь к Unix-сокету")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес TCP")
+    parser.add_argument("--port", type=int, default=8765, help="порт TCP")
+    parser.add_argument("--rpn", action="store_true", help="выражения записаны в ПОЛИЗ")
+    asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
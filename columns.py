@@ -0,0 +1,153 @@
+import argparse
+import os
+import sys
+from collections.abc import Mapping, Sequence
+from typing import NamedTuple, Optional, Union
+
+import numpy as np
+
+from calc import parse_tokens
+from shunting_yard import shunting_yard
+from vectorized import evaluate_vectorized
+
+# Формат столбцов: числа float64 с порядком байтов от младшего к старшему,
+# без заголовка
+COLUMN_DTYPE = np.dtype("<f8")
+
+# Количество строк, вычисляемых за один шаг
+DEFAULT_CHUNK_ROWS = 1 << 16
+
+Path = Union[str, "os.PathLike[str]"]
+
+
+class ColumnResult(NamedTuple):
+    """
+    Итог вычисления выражения над файлами столбцов.
+
+    Attributes:
+        rows: Количество записанных строк
+        zero_division: Количество строк с делением на ноль (в них записан nan)
+    """
+
+    rows: int
+    zero_division: int
+
+
+def evaluate_columns(
+    rpn: Union[str, Sequence[str]],
+    columns: Mapping[str, Path],
+    output: Path,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> ColumnResult:
+    """
+    Вычисляет выражение в ПОЛИЗ над файлами столбцов, не загружая их в память.
+
+    Файлы столбцов отображаются в память через numpy.memmap и
+    обрабатываются частями по chunk_rows строк: каждая часть вычисляется
+    evaluate_vectorized и дописывается в выходной файл того же формата.
+    Поэтому объем выделяемой памяти определяется размером части, а не
+    количеством строк; прочитанные страницы отображенных файлов относятся к
+    файловому кэшу и вытесняются системой. Деление на ноль не прерывает
+    вычисление: в строку записывается nan, а строка учитывается в
+    zero_division.
+
+    Args:
+        rpn: Токены выражения в обратной польской нотации (результат
+             shunting_yard) или строка с токенами через пробел
+        columns: Имя переменной -> путь к файлу ее столбца (float64,
+                 little-endian, без заголовка)
+        output: Путь к выходному файлу; существующий файл перезаписывается
+        chunk_rows: Количество строк в одной части
+
+    Returns:
+        Количество строк и количество строк с делением на ноль
+
+    Raises:
+        ValueError: При некорректном размере или разной длине столбцов,
+                   отсутствии столбцов или ошибке в выражении
+    """
+    if chunk_rows < 1:
+        raise ValueError("Размер части должен быть положительным")
+    if not columns:
+        raise ValueError("Не задан ни один столбец")
+    tokens = parse_tokens(rpn) if isinstance(rpn, str) else list(rpn)
+    rows = _column_rows(columns)
+    arrays = {name: _open_column(path, rows) for name, path in columns.items()}
+    zero_division = 0
+
+    with open(output, "wb") as file:
+        # Пустые столбцы тоже вычисляются один раз, чтобы проверить выражение
+        for start in range(0, max(rows, 1), chunk_rows):
+            stop = min(start + chunk_rows, rows)
+            result = evaluate_vectorized(
+                tokens, {name: array[start:stop] for name, array in arrays.items()}
+            )
+            result.values.astype(COLUMN_DTYPE, copy=False).tofile(file)
+            zero_division += int(np.count_nonzero(result.zero_division))
+
+    return ColumnResult(rows, zero_division)
+
+
+def _column_rows(columns: Mapping[str, Path]) -> int:
+    """Проверяет размеры файлов столбцов и возвращает количество строк."""
+    rows = set()
+    for name, path in columns.items():
+        size = os.path.getsize(path)
+        if size % COLUMN_DTYPE.itemsize:
+            raise ValueError(
+                f"Размер файла столбца {name} не кратен {COLUMN_DTYPE.itemsize} байтам"
+            )
+        rows.add(size // COLUMN_DTYPE.itemsize)
+    if len(rows) > 1:
+        raise ValueError("Столбцы переменных имеют разную длину")
+    return rows.pop()
+
+
+def _open_column(path: Path, rows: int) -> np.ndarray:
+    """Отображает файл столбца в память; пустой файл отобразить нельзя."""
+    if rows == 0:
+        return np.empty(0, dtype=COLUMN_DTYPE)
+    return np.memmap(path, dtype=COLUMN_DTYPE, mode="r")
+
+
+def _column_argument(text: str) -> tuple[str, str]:
+    """Разбирает аргумент --column вида имя=путь."""
+    name, separator, path = text.partition("=")
+    if not separator or not name or not path:
+        raise argparse.ArgumentTypeError(f"ожидается имя=путь: {text}")
+    return name, path
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Вычисление выражения над файлами столбцов float64, не помещающимися в память."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("expression", help="выражение в инфиксной записи")
+    parser.add_argument(
+        "--column",
+        action="append",
+        type=_column_argument,
+        default=[],
+        metavar="ИМЯ=ПУТЬ",
+        help="файл столбца переменной; можно указать несколько раз",
+    )
+    parser.add_argument("--output", required=True, help="выходной файл столбца")
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=DEFAULT_CHUNK_ROWS,
+        help="количество строк, вычисляемых за один шаг",
+    )
+    args = parser.parse_args(argv)
+    columns = dict(args.column)
+
+    try:
+        rpn = shunting_yard(args.expression, columns)
+        result = evaluate_columns(rpn, columns, args.output, args.chunk_rows)
+    except (ValueError, OSError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"строк: {result.rows}, деление на ноль: {result.zero_division}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import ast
+import builtins
+from collections.abc import Callable, Iterable
+
+from calc import evaluate_tokens
+from registry import (
+    CONDITIONAL,
+    CONSTANT,
+    JUMP,
+    JUMP_IF_ZERO,
+    OPERATOR,
+    SYMBOLS,
+    is_jump,
+    is_number,
+)
+from shunting_yard import shunting_yard, tokenize
+
+# Операторы, для которых генерируется встроенная операция Python вместо
+# вызова функции из реестра
+_BINARY_OPERATORS: dict[str, ast.operator] = {
+    "+": ast.Add(),
+    "-": ast.Sub(),
+    "*": ast.Mult(),
+    "^": ast.Pow(),
+}
+
+
+class CompiledExpression:
+    """
+    Выражение, скомпилированное в байт-код Python.
+
+    Разбор выражения и построение кода выполняются один раз, при каждом
+    вызове выполняется только готовый байт-код. Реализации функций берутся
+    из реестра в момент компиляции.
+
+    Attributes:
+        expression: Исходное выражение в инфиксной записи
+        rpn: Выражение в обратной польской нотации
+        variables: Имена переменных в порядке первого появления в выражении
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.variables = find_variables(expression)
+        self.rpn = shunting_yard(expression, self.variables)
+        self._function = _build_function(self.rpn, self.variables)
+
+    def __call__(self, **variables: float) -> float:
+        """
+        Вычисляет выражение с заданными значениями переменных.
+
+        Args:
+            **variables: Значения переменных выражения
+
+        Returns:
+            Результат вычисления
+
+        Raises:
+            ValueError: При отсутствии значения переменной, неизвестной
+                       переменной или делении на ноль
+        """
+        if len(variables) != len(self.variables):
+            for name in variables:
+                if name not in self.variables:
+                    raise ValueError(f"Неизвестная переменная: {name}")
+        try:
+            args = [float(variables[name]) for name in self.variables]
+        except KeyError as e:
+            raise ValueError(f"Не задано значение переменной: {e.args[0]}") from None
+        return self._function(*args)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.expression!r})"
+
+
+def find_variables(expression: str) -> tuple[str, ...]:
+    """
+    Находит имена переменных в выражении.
+
+    Переменной считается любой идентификатор, не являющийся функцией
+    или константой; if перед открывающей скобкой — условная функция.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+
+    Returns:
+        Имена переменных в порядке первого появления
+    """
+    names: dict[str, None] = {}
+    tokens = tokenize(expression)
+    for index, token in enumerate(tokens):
+        if token.isalpha() and token not in SYMBOLS:
+            if token == CONDITIONAL and tokens[index + 1:index + 2] == ["("]:
+                continue
+            names[token] = None
+    return tuple(names)
+
+
+def _build_function(rpn: list[str], variables: tuple[str, ...]) -> Callable[..., float]:
+    """
+    Строит функцию Python из выражения в обратной польской нотации.
+
+    Переменные становятся позиционными аргументами _v0, _v1, ..., поэтому
+    их имена не могут конфликтовать с ключевыми словами Python. Если дерево
+    выражения слишком глубоко для компилятора Python (например, длинная
+    цепочка сложений), функция вычисляет ПОЛИЗ через evaluate_tokens.
+
+    Args:
+        rpn: Токены выражения в обратной польской нотации
+        variables: Имена переменных выражения
+
+    Returns:
+        Функция, принимающая значения переменных позиционно
+
+    Raises:
+        ValueError: При недостаточном количестве операндов или некорректном
+                   выражении
+    """
+    slots = {name: f"_v{index}" for index, name in enumerate(variables)}
+    # Реализации операторов и функций из реестра, доступные коду по именам _f0, _f1, ...
+    namespace: dict[str, object] = {"__builtins__": {}}
+    helpers: dict[str, str] = {}
+    body = _build_tree(rpn, slots, namespace, helpers)
+
+    arguments = ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(slot) for slot in slots.values()],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+    )
+    tree = ast.Expression(ast.Lambda(arguments, body))
+    try:
+        ast.fix_missing_locations(tree)
+        code = builtins.compile(tree, "<expression>", "eval")
+    except RecursionError:
+        return lambda *args: evaluate_tokens(rpn, dict(zip(variables, args)))
+    return eval(code, namespace)
+
+
+def _build_tree(
+    rpn: Iterable[str],
+    slots: dict[str, str],
+    namespace: dict[str, object],
+    helpers: dict[str, str],
+) -> ast.expr:
+    """
+    Строит дерево выражения Python из токенов ПОЛИЗ.
+
+    Переходы условной функции if становятся условным выражением Python
+    (значение if условие else иначе), поэтому невыбранная ветвь не
+    вычисляется. Ветви строятся в том же проходе: на переходе ?n стек
+    операндов откладывается вместе с условием, а на последнем токене ветви
+    восстанавливается, поэтому глубина вложенности if не ограничена
+    глубиной рекурсии Python.
+
+    Args:
+        rpn: Токены выражения в обратной польской нотации
+        slots: Имена аргументов функции для переменных
+        namespace: Пространство имен кода, в которое добавляются реализации
+        helpers: Имена реализаций в namespace по токенам
+
+    Returns:
+        Дерево выражения
+
+    Raises:
+        ValueError: При недостаточном количестве операндов, некорректном
+                   переходе или некорректном выражении
+    """
+    stack: list[ast.expr] = []
+    # Открытые if: [переход ?n, условие, отложенный стек, номер последнего
+    # токена текущей ветви, ветвь значения или None, пока строится она]
+    conditionals: list[list] = []
+    tokens = iter(rpn)
+    position = -1
+
+    for token in tokens:
+        position += 1
+        symbol = SYMBOLS.get(token)
+        if symbol is None:
+            if is_number(token):
+                stack.append(ast.Constant(float(token)))
+            elif token in slots:
+                stack.append(ast.Name(slots[token], ast.Load()))
+            elif is_jump(token) and token.startswith(JUMP_IF_ZERO):
+                if not stack:
+                    raise ValueError("Недостаточно операндов для условия")
+                # Ветвь значения заканчивается переходом за ветвь иначе
+                conditionals.append(
+                    [token, stack.pop(), stack, position + max(int(token[1:]) - 1, 0), None]
+                )
+                stack = []
+            else:
+                raise ValueError(f"Неизвестный токен: {token}")
+        elif symbol.kind == CONSTANT:
+            stack.append(ast.Constant(symbol.value))
+        else:
+            if len(stack) < symbol.arity:
+                if symbol.kind == OPERATOR:
+                    raise ValueError("Недостаточно операндов для операции")
+                raise ValueError("Недостаточно операндов для функции")
+            operands = stack[len(stack) - symbol.arity:]
+            del stack[len(stack) - symbol.arity:]
+            if token in _BINARY_OPERATORS:
+                stack.append(ast.BinOp(operands[0], _BINARY_OPERATORS[token], operands[1]))
+            else:
+                if token not in helpers:
+                    helpers[token] = f"_f{len(helpers)}"
+                    namespace[helpers[token]] = symbol.implementation
+                stack.append(ast.Call(ast.Name(helpers[token], ast.Load()), operands, []))
+
+        # Завершение ветвей, последний токен которых прочитан
+        while conditionals and conditionals[-1][3] <= position:
+            conditional = conditionals[-1]
+            branch = _single(stack)
+            if conditional[4] is None:
+                conditional[4] = branch
+                jump = next(tokens, "")
+                position += 1
+                if not (is_jump(jump) and jump.startswith(JUMP)):
+                    raise ValueError(f"Некорректный переход: {conditional[0]}")
+                conditional[3] = position + int(jump[1:])
+                stack = []
+            else:
+                conditionals.pop()
+                stack = conditional[2]
+                stack.append(ast.IfExp(conditional[1], conditional[4], branch))
+
+    if conditionals:
+        raise ValueError(f"Некорректный переход: {conditionals[-1][0]}")
+    return _single(stack)
+
+
+def _single(stack: list[ast.expr]) -> ast.expr:
+    """Единственный элемент стека — дерево выражения или ветви."""
+    if len(stack) != 1:
+        raise ValueError("Некорректное выражение: в стеке остается не один элемент")
+    return stack[0]
+
+
+def compile(expression: str) -> CompiledExpression:
+    """
+    Компилирует арифметическое выражение в инфиксной записи в байт-код Python.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи, может
+                    содержать переменные (например, x, rate)
+
+    Returns:
+        Скомпилированное выражение, вызываемое как expr(x=1.0, rate=0.5)
+
+    Raises:
+        ValueError: При ошибке разбора выражения
+    """
+    return CompiledExpression(expression)
@@ -0,0 +1,303 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Collection, Iterable, Sequence
+from typing import Optional
+
+from registry import CONDITIONAL, is_function
+from shunting_yard import iter_shunting_yard, iter_tokens
+
+# Как был получен результат последнего вызова parse
+FULL = "full"
+TOP_LEVEL = "top_level"
+GROUP = "group"
+UNCHANGED = "unchanged"
+
+# Сколько соседних токенов с каждой стороны правки разбирается заново:
+# число в экспоненциальной записи (1e-3) могло быть четырьмя токенами
+_CONTEXT_TOKENS = 3
+
+# Скобочная группа: индексы токенов "(" и ")" и границы ее ПОЛИЗ в результате
+_Group = tuple[int, int, int, int]
+
+
+class IncrementalParser:
+    """
+    Преобразует в ПОЛИЗ выражение, которое меняется небольшими правками.
+
+    Между вызовами parse хранятся токены с позициями, индекс скобочных групп
+    и ПОЛИЗ. ПОЛИЗ скобочной группы — непрерывный участок результата, равный
+    ПОЛИЗ ее содержимого, поэтому при правке внутри группы заново
+    разбираются только затронутые токены и заново преобразуется только
+    самая внутренняя группа, содержащая правку. Результат всегда совпадает
+    с shunting_yard().
+
+    Если правка добавляет или удаляет скобки, если скобки не сбалансированы
+    или если после функции нет открывающей скобки, выражение разбирается
+    целиком. Выражение с условной функцией if всегда разбирается целиком:
+    переходы ссылаются на длины ветвей.
+
+    Attributes:
+        variables: Имена переменных, допустимых в выражении
+        last_update: Как был получен последний результат: "full" — полный
+                     разбор, "top_level" — повторное преобразование всех
+                     токенов без повторного разбора строки, "group" —
+                     преобразование одной группы, "unchanged" — токены не
+                     изменились
+    """
+
+    def __init__(self, variables: Collection[str] = ()) -> None:
+        self.variables = variables
+        self.last_update: Optional[str] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._text: Optional[str] = None
+        self._tokens: list[str] = []
+        self._starts: list[int] = []
+        self._rpn: list[str] = []
+        # Группы в порядке открывающих скобок; None, если структура выражения
+        # не позволяет преобразовывать группы по отдельности
+        self._groups: Optional[list[_Group]] = None
+
+    def parse(self, expression: str) -> list[str]:
+        """
+        Преобразует выражение в ПОЛИЗ, используя результат предыдущего вызова.
+
+        Args:
+            expression: Новый текст выражения в инфиксной записи
+
+        Returns:
+            Список токенов в обратной польской нотации
+
+        Raises:
+            ValueError: При неизвестном символе, функции или константе
+        """
+        try:
+            self._update(expression)
+        except BaseException:
+            self._reset()
+            self.last_update = None
+            raise
+        return list(self._rpn)
+
+    def _update(self, text: str) -> None:
+        old = self._text
+        if old is None or self._groups is None or not self._tokens:
+            self._full(text)
+            return
+        if text == old:
+            self.last_update = UNCHANGED
+            return
+
+        # Измененный участок: общие начало и конец старого и нового текста
+        prefix = _common_prefix(old, text)
+        suffix = _common_suffix(old, text, min(len(old), len(text)) - prefix)
+        old_end = len(old) - suffix
+        delta = len(text) - len(old)
+
+        # Токены, пересекающие участок, и _CONTEXT_TOKENS соседних с каждой
+        # стороны: соседи могут слиться с новыми символами
+        tokens, starts = self._tokens, self._starts
+        i = max(0, bisect_left(starts, prefix) - 1 - _CONTEXT_TOKENS)
+        j = min(len(tokens), bisect_right(starts, old_end) + _CONTEXT_TOKENS)
+        region_start = min(prefix, starts[i])
+        region_end = max(old_end, starts[j - 1] + len(tokens[j - 1]))
+        try:
+            new_tokens = list(iter_tokens(text[region_start:region_end + delta]))
+        except ValueError:
+            # Полный разбор ленивый: ошибка в идентификаторе перед неизвестным
+            # символом должна иметь приоритет, как в shunting_yard()
+            self._full(text)
+            return
+
+        # Отбрасываем совпадающие токены по краям, остается измененное ядро
+        old_tokens = tokens[i:j]
+        head = 0
+        limit = min(len(old_tokens), len(new_tokens))
+        while head < limit and old_tokens[head] == new_tokens[head]:
+            head += 1
+        tail = 0
+        limit -= head
+        while tail < limit and old_tokens[-1 - tail] == new_tokens[-1 - tail]:
+            tail += 1
+        a, b = i + head, j - tail
+        core = new_tokens[head:len(new_tokens) - tail]
+        removed = old_tokens[head:len(old_tokens) - tail]
+        if (
+            "(" in core
+            or ")" in core
+            or "(" in removed
+            or ")" in removed
+            or CONDITIONAL in core
+        ):
+            self._full(text)
+            return
+
+        tokens[i:j] = new_tokens
+        starts[i:j] = _offsets(text, new_tokens, region_start)
+        shift_from = i + len(new_tokens)
+        starts[shift_from:] = [start + delta for start in starts[shift_from:]]
+        self._text = text
+        shift = len(new_tokens) - (j - i)
+
+        if not core and a == b:
+            self.last_update = UNCHANGED
+            return
+        # После каждой функции в ядре и перед ним должна идти "("
+        for index in range(max(a - 1, 0), a + len(core)):
+            if is_function(tokens[index]) and (
+                index + 1 >= len(tokens) or tokens[index + 1] != "("
+            ):
+                self._full(text)
+                return
+
+        groups = self._groups
+        k = bisect_left(groups, (a,)) - 1
+        while k >= 0 and groups[k][1] < b:
+            k -= 1
+        if k < 0:
+            self._convert_all()
+            self.last_update = TOP_LEVEL
+            return
+
+        opening, closing, rpn_start, rpn_end = groups[k]
+        _, inner_rpn, inner_groups = _convert(
+            tokens[opening + 1:closing + shift], self.variables
+        )
+        if inner_groups is None:
+            self._full(text)
+            return
+        self._rpn[rpn_start:rpn_end] = inner_rpn
+        rpn_shift = len(inner_rpn) - (rpn_end - rpn_start)
+
+        updated: list[_Group] = []
+        for group in groups:
+            if group[0] > closing:
+                # Группа после измененной
+                updated.append(
+                    (group[0] + shift, group[1] + shift, group[2] + rpn_shift, group[3] + rpn_shift)
+                )
+            elif group[0] == opening:
+                updated.append((opening, closing + shift, rpn_start, rpn_end + rpn_shift))
+                updated.extend(
+                    (o + opening + 1, c + opening + 1, s + rpn_start, e + rpn_start)
+                    for o, c, s, e in inner_groups
+                )
+            elif group[0] > opening:
+                # Группа внутри измененной заменена новыми
+                continue
+            elif group[1] > closing:
+                # Объемлющая группа
+                updated.append((group[0], group[1] + shift, group[2], group[3] + rpn_shift))
+            else:
+                updated.append(group)
+        self._groups = updated
+        self.last_update = GROUP
+
+    def _full(self, text: str) -> None:
+        """Разбирает и преобразует выражение целиком."""
+        self._reset()
+        tokens, self._rpn, self._groups = _convert(iter_tokens(text), self.variables)
+        self._text = text
+        self._tokens = tokens
+        self._starts = _offsets(text, tokens, 0)
+        self.last_update = FULL
+
+    def _convert_all(self) -> None:
+        _, self._rpn, self._groups = _convert(self._tokens, self.variables)
+
+
+def _convert(
+    tokens: Iterable[str], variables: Collection[str]
+) -> tuple[list[str], list[str], Optional[list[_Group]]]:
+    """
+    Преобразует токены в ПОЛИЗ и находит участок ПОЛИЗ каждой скобочной группы.
+
+    Преобразование выполняет iter_shunting_yard. Генератор запрашивает
+    следующий токен, только выдав все токены ПОЛИЗ от предыдущего, поэтому
+    длина результата в момент запроса токена — это граница участка.
+
+    Returns:
+        Список токенов, ПОЛИЗ и группы в порядке открывающих скобок; вместо
+        групп None, если скобки не сбалансированы, после функции нет "("
+        или в выражении есть условная функция if
+    """
+    consumed: list[str] = []
+    rpn: list[str] = []
+    # counts[i] — длина ПОЛИЗ перед обработкой токена i
+    counts: list[int] = []
+
+    def feed():
+        for token in tokens:
+            counts.append(len(rpn))
+            consumed.append(token)
+            yield token
+        counts.append(len(rpn))
+
+    append = rpn.append
+    for token in iter_shunting_yard(feed(), variables):
+        append(token)
+
+    tokens = consumed
+    groups: list[_Group] = []
+    openings: list[int] = []
+    for index, token in enumerate(tokens):
+        if token == CONDITIONAL and token not in variables:
+            return tokens, rpn, None
+        if token == "(":
+            openings.append(index)
+        elif token == ")":
+            if not openings:
+                return tokens, rpn, None
+            opening = openings.pop()
+            end = counts[index + 1]
+            if opening > 0 and is_function(tokens[opening - 1]):
+                # Функция выталкивается сразу после ")" и не входит в группу
+                end -= 1
+            groups.append((opening, index, counts[opening], end))
+        elif is_function(token) and (index + 1 == len(tokens) or tokens[index + 1] != "("):
+            return tokens, rpn, None
+    if openings:
+        return tokens, rpn, None
+    groups.sort()
+    return tokens, rpn, groups
+
+
+def _offsets(text: str, tokens: Sequence[str], start: int) -> list[int]:
+    """
+    Находит позиции токенов в тексте.
+
+    Между токенами могут быть только пробельные символы, поэтому первое
+    вхождение токена после конца предыдущего — его позиция.
+    """
+    offsets = []
+    position = start
+    find = text.find
+    for token in tokens:
+        position = find(token, position)
+        offsets.append(position)
+        position += len(token)
+    return offsets
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """Длина общего начала строк (двоичный поиск со сравнением срезов)."""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    """Длина общего конца строк, не больше limit."""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle:] == b[len(b) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
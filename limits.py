@@ -0,0 +1,190 @@
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import NamedTuple, Optional
+
+from registry import CONSTANT, OPERATOR, SYMBOLS, Symbol, is_jump
+
+# Через сколько токенов проверяется затраченное время
+_TIME_CHECK_INTERVAL = 256
+
+
+class LimitExceeded(ValueError):
+    """Выражение превышает ограничение ресурсов."""
+
+
+class InputTooLong(LimitExceeded):
+    """Выражение длиннее допустимого."""
+
+
+class TooManyTokens(LimitExceeded):
+    """Выражение содержит слишком много токенов."""
+
+
+class NestingTooDeep(LimitExceeded):
+    """Слишком глубокая вложенность скобок."""
+
+
+class StackTooDeep(LimitExceeded):
+    """Слишком глубокий стек значений при вычислении."""
+
+
+class ExponentTooLarge(LimitExceeded):
+    """Слишком большой по модулю показатель степени."""
+
+
+class TimeLimitExceeded(LimitExceeded):
+    """Превышено процессорное время на выражение."""
+
+
+class Limits(NamedTuple):
+    """
+    Ограничения ресурсов на одно выражение.
+
+    Передается в tokenize, shunting_yard и evaluate_rpn параметром limits.
+    Значение None означает отсутствие ограничения. Проверки выполняются по
+    мере чтения токенов, поэтому выражение отклоняется, как только
+    ограничение превышено, не дочитывая его до конца. Все исключения —
+    подклассы LimitExceeded и ValueError, поэтому пакетная обработка
+    пропускает такие выражения как обычные ошибки.
+
+    Attributes:
+        max_length: Максимальная длина выражения в символах
+        max_tokens: Максимальное количество токенов
+        max_nesting: Максимальная глубина вложенности скобок
+        max_stack: Максимальная глубина стека значений при вычислении
+        max_exponent: Максимальный модуль показателя степени
+        max_time: Процессорное время потока в секундах на один вызов
+    """
+
+    max_length: Optional[int] = None
+    max_tokens: Optional[int] = None
+    max_nesting: Optional[int] = None
+    max_stack: Optional[int] = None
+    max_exponent: Optional[float] = None
+    max_time: Optional[float] = None
+
+    def check_length(self, expression: str) -> None:
+        """
+        Проверяет длину выражения.
+
+        Args:
+            expression: Выражение
+
+        Raises:
+            InputTooLong: Если выражение длиннее max_length
+        """
+        if self.max_length is not None and len(expression) > self.max_length:
+            raise InputTooLong(f"Выражение длиннее {self.max_length} символов")
+
+    def infix_tokens(self, tokens: Iterable[str]) -> Iterator[str]:
+        """
+        Проверяет поток токенов инфиксной записи: количество, вложенность
+        скобок и время.
+
+        Args:
+            tokens: Токены выражения в инфиксной записи
+
+        Returns:
+            Те же токены
+
+        Raises:
+            TooManyTokens, NestingTooDeep, TimeLimitExceeded: При превышении
+            ограничения
+        """
+        max_tokens = self.max_tokens
+        max_nesting = self.max_nesting
+        clock = self._clock()
+        nesting = 0
+        for count, token in enumerate(tokens, 1):
+            if max_tokens is not None and count > max_tokens:
+                raise TooManyTokens(f"Выражение содержит больше {max_tokens} токенов")
+            if token == "(":
+                nesting += 1
+                if max_nesting is not None and nesting > max_nesting:
+                    raise NestingTooDeep(f"Вложенность скобок больше {max_nesting}")
+            elif token == ")":
+                nesting -= 1
+            if clock is not None and count % _TIME_CHECK_INTERVAL == 0:
+                clock()
+            yield token
+
+    def rpn_tokens(self, tokens: Iterable[str]) -> Iterator[str]:
+        """
+        Проверяет поток токенов ПОЛИЗ: количество, глубину стека значений и
+        время.
+
+        Глубина стека вычисляется по арности операций из реестра до
+        вычисления каждого токена, поэтому слишком глубокое выражение
+        отклоняется без выделения стека.
+
+        Args:
+            tokens: Токены выражения в обратной польской нотации
+
+        Returns:
+            Те же токены
+
+        Raises:
+            TooManyTokens, StackTooDeep, TimeLimitExceeded: При превышении
+            ограничения
+        """
+        max_tokens = self.max_tokens
+        max_stack = self.max_stack
+        clock = self._clock()
+        symbols = SYMBOLS
+        depth = 0
+        for count, token in enumerate(tokens, 1):
+            if max_tokens is not None and count > max_tokens:
+                raise TooManyTokens(f"Выражение содержит больше {max_tokens} токенов")
+            symbol = symbols.get(token)
+            if symbol is None and is_jump(token):
+                # Ветви if учитываются так, как будто вычисляются обе: ?n
+                # снимает условие, :n — значение первой ветви
+                depth = max(depth - 1, 0)
+            elif symbol is None or symbol.kind == CONSTANT:
+                depth += 1
+                if max_stack is not None and depth > max_stack:
+                    raise StackTooDeep(f"Глубина стека больше {max_stack}")
+            else:
+                depth = max(depth - symbol.arity, 0) + 1
+            if clock is not None and count % _TIME_CHECK_INTERVAL == 0:
+                clock()
+            yield token
+
+    def symbols(self) -> Mapping[str, Symbol]:
+        """
+        Возвращает таблицу символов с проверкой показателя степени.
+
+        Returns:
+            Реестр SYMBOLS, в котором оператор ^ проверяет max_exponent
+        """
+        power = SYMBOLS.get("^")
+        if self.max_exponent is None or power is None or power.kind != OPERATOR:
+            return SYMBOLS
+        limit = self.max_exponent
+        implementation = power.implementation
+
+        def checked_power(a: float, b: float) -> float:
+            if abs(b) > limit:
+                raise ExponentTooLarge(f"Показатель степени по модулю больше {limit}")
+            return implementation(a, b)
+
+        return {**SYMBOLS, "^": power._replace(implementation=checked_power)}
+
+    def _clock(self) -> Optional[Callable[[], None]]:
+        """
+        Возвращает функцию, проверяющую процессорное время с момента вызова _clock.
+
+        Учитывается время текущего потока, а не всего процесса, поэтому
+        выражения, вычисляемые параллельно в пуле потоков, не расходуют
+        время друг друга.
+        """
+        if self.max_time is None:
+            return None
+        budget = self.max_time
+        deadline = time.thread_time() + budget
+
+        def check() -> None:
+            if time.thread_time() > deadline:
+                raise TimeLimitExceeded(f"Превышено время вычисления {budget} с")
+
+        return check
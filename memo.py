@@ -0,0 +1,241 @@
+import threading
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from itertools import islice
+from typing import NamedTuple, Optional, Union
+
+from batch import BatchResult
+from calc import evaluate_tokens, parse_tokens
+from registry import CONSTANT, OPERATOR, SYMBOLS, is_jump, is_number
+from shunting_yard import shunting_yard
+from stream import EXPRESSION_ERRORS
+
+
+class MemoInfo(NamedTuple):
+    """
+    Статистика памяти подвыражений.
+
+    Attributes:
+        hits: Количество подвыражений, значение которых взято из памяти
+        misses: Количество вычисленных подвыражений
+        evictions: Количество вытесненных записей
+        maxsize: Максимальное количество записей
+        currsize: Текущее количество записей
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля подвыражений, значение которых взято из памяти."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SubresultMemo:
+    """
+    Память значений подвыражений, общая для пакета выражений.
+
+    Каждому поддереву выражения сопоставляется структурный ключ: операция и
+    ключи ее аргументов. Ключ вычисленного поддерева заменяется коротким
+    номером, поэтому ключ любого узла — небольшой кортеж, а одинаковые
+    поддеревья разных выражений получают один и тот же номер. Значение
+    поддерева вычисляется один раз, пока запись не вытеснена. Память
+    ограничена количеством записей. Вытесняются самые старые записи, кроме
+    использованных после предыдущего вытеснения: такая запись переносится
+    в конец очереди (алгоритм второго шанса, приближение LRU), поэтому
+    часто используемое подвыражение не вытесняется.
+
+    Числа входят в ключ текстом токена, переменные и константы — именем и
+    значением, поэтому выражения с разными значениями переменных не
+    смешиваются. Ошибки вычисления не запоминаются. После изменения
+    реестра функций память нужно очистить методом cache_clear. Выражение
+    с if вычисляется через evaluate_tokens без памяти, чтобы невыбранная
+    ветвь не вычислялась.
+
+    Память можно использовать из нескольких потоков: записи добавляются и
+    вытесняются под блокировкой, поэтому номера узлов не повторяются, а
+    поиск записей, отметка использования и вычисление выполняются без нее.
+    """
+
+    def __init__(self, maxsize: int = 65536) -> None:
+        """
+        Args:
+            maxsize: Максимальное количество запомненных подвыражений
+        """
+        if maxsize < 0:
+            raise ValueError("Размер кэша не может быть отрицательным")
+        self.maxsize = maxsize
+        # Ключ узла -> (номер узла, значение), в порядке добавления или
+        # последнего спасения от вытеснения
+        self._entries: dict[tuple, tuple[int, float]] = {}
+        # Ключи записей, использованных после предыдущего вытеснения
+        self._used: set[tuple] = set()
+        self._next_id = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def evaluate(
+        self,
+        rpn: Union[str, Sequence[str]],
+        variables: Optional[Mapping[str, float]] = None,
+    ) -> float:
+        """
+        Вычисляет выражение в ПОЛИЗ, используя запомненные подвыражения.
+
+        Args:
+            rpn: Токены выражения в обратной польской нотации (результат
+                 shunting_yard) или строка с токенами через пробел
+            variables: Значения переменных, используемых в выражении
+
+        Returns:
+            Результат вычисления
+
+        Raises:
+            ValueError: При недостаточном количестве операндов, делении на
+                       ноль, неизвестном токене или некорректном выражении
+        """
+        tokens = parse_tokens(rpn) if isinstance(rpn, str) else rpn
+        lookup = self._entries.get
+        mark_used = self._used.add
+        symbols = SYMBOLS
+        # Ключи узлов на стеке и их значения; значение числа вычисляется
+        # из текста токена, только когда оно понадобилось
+        keys: list = []
+        values: list = []
+        hits = misses = 0
+
+        try:
+            for token in tokens:
+                symbol = symbols.get(token)
+                if symbol is None:
+                    if is_number(token):
+                        keys.append(token)
+                        values.append(None)
+                    elif variables is not None and token in variables:
+                        value = float(variables[token])
+                        keys.append((token, value))
+                        values.append(value)
+                    elif is_jump(token):
+                        # Ветви if не запоминаются: выражение целиком
+                        # вычисляется заново с пропуском невыбранной ветви
+                        return evaluate_tokens(tokens, variables)
+                    else:
+                        raise ValueError(f"Неизвестный токен: {token}")
+                    continue
+                if symbol.kind == CONSTANT:
+                    keys.append((token, symbol.value))
+                    values.append(symbol.value)
+                    continue
+
+                arity = symbol.arity
+                if len(keys) < arity:
+                    if symbol.kind == OPERATOR:
+                        raise ValueError("Недостаточно операндов для операции")
+                    raise ValueError("Недостаточно операндов для функции")
+                start = len(keys) - arity
+                if arity == 2:
+                    key = (token, keys[-2], keys[-1])
+                else:
+                    key = (token, *keys[start:])
+                entry = lookup(key)
+                if entry is not None:
+                    hits += 1
+                    node, value = entry
+                    mark_used(key)
+                else:
+                    misses += 1
+                    arguments = [
+                        float(keys[index]) if values[index] is None else values[index]
+                        for index in range(start, len(keys))
+                    ]
+                    value = symbol.implementation(*arguments)
+                    node = self._remember(key, value)
+                del keys[start:], values[start:]
+                keys.append(node)
+                values.append(value)
+        finally:
+            with self._lock:
+                self._hits += hits
+                self._misses += misses
+
+        if len(keys) != 1:
+            raise ValueError("Некорректное выражение: в стеке остается не один элемент")
+        value = values[0]
+        return float(keys[0]) if value is None else value
+
+    def _remember(self, key: tuple, value: float) -> int:
+        """Запоминает значение узла и возвращает его номер."""
+        with self._lock:
+            node = self._next_id
+            self._next_id += 1
+            if self.maxsize == 0:
+                return node
+            entries = self._entries
+            entries[key] = (node, value)
+            if len(entries) > self.maxsize:
+                # Вытесняем сразу четверть записей, чтобы вытеснение не
+                # выполнялось при каждом промахе. Запись, использованная после
+                # предыдущего вытеснения, не удаляется, а переносится в конец
+                # (второй шанс)
+                count = max(1, self.maxsize // 4)
+                used = self._used
+                evicted = 0
+                for old in list(entries):
+                    if evicted == count:
+                        break
+                    if old in used:
+                        entries[old] = entries.pop(old)
+                    else:
+                        del entries[old]
+                        evicted += 1
+                # Если использованы почти все записи, вытесняются самые
+                # старые из перенесенных
+                for old in list(islice(entries, count - evicted)):
+                    del entries[old]
+                used.clear()
+                self._evictions += count
+        return node
+
+    def evaluate_many(
+        self, expressions: Iterable[str], rpn: bool = False
+    ) -> Iterator[BatchResult]:
+        """
+        Вычисляет пакет выражений с общей памятью подвыражений.
+
+        Args:
+            expressions: Выражения
+            rpn: True, если выражения записаны в ПОЛИЗ, иначе — в инфиксной
+                 записи
+
+        Returns:
+            Итератор результатов в порядке входа; ошибка выражения попадает
+            в результат и не прерывает пакет
+        """
+        for expression in expressions:
+            try:
+                tokens = parse_tokens(expression) if rpn else shunting_yard(expression)
+                yield BatchResult(self.evaluate(tokens), None)
+            except EXPRESSION_ERRORS as e:
+                yield BatchResult(None, str(e))
+
+    def cache_info(self) -> MemoInfo:
+        """Возвращает статистику памяти подвыражений."""
+        with self._lock:
+            return MemoInfo(
+                self._hits, self._misses, self._evictions, self.maxsize, len(self._entries)
+            )
+
+    def cache_clear(self) -> None:
+        """Очищает память и сбрасывает статистику."""
+        with self._lock:
+            self._entries.clear()
+            self._used.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
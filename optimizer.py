@@ -0,0 +1,240 @@
+from collections.abc import Collection, Mapping, Sequence
+from typing import Optional, Union
+
+from calc import evaluate_tokens, parse_tokens
+from registry import CONSTANT, JUMP, JUMP_IF_ZERO, OPERATOR, SYMBOLS, is_jump, is_number
+
+# Виды узлов графа вычислений
+_CONST = 0
+_VAR = 1
+_APPLY = 2
+# Условие if с ветвями в виде исходных токенов ПОЛИЗ
+_CONDITIONAL = 3
+
+# Ошибки, из-за которых подвыражение не сворачивается, а вычисляется позже
+_FOLD_ERRORS = (ValueError, ArithmeticError)
+
+
+class OptimizedExpression:
+    """
+    Выражение в виде графа вычислений без повторяющихся подвыражений.
+
+    Узлы хранятся в порядке первого появления в ПОЛИЗ, каждый узел
+    вычисляется один раз. Подвыражения из одних констант свернуты в
+    значения; если свертка вызывает ошибку (например, деление на ноль),
+    подвыражение остается в графе и ошибка возникает при вычислении.
+    Ветви if с условием от переменных не оптимизируются: узел хранит их
+    токены и вычисляет только выбранную ветвь.
+
+    Attributes:
+        operations_before: Количество операций и функций в исходном ПОЛИЗ
+        operations_after: Количество операций и функций в графе
+        folded: Количество операций, свернутых в константы
+    """
+
+    def __init__(
+        self,
+        nodes: list[tuple],
+        operations_before: int,
+        folded: int,
+    ) -> None:
+        self._nodes = nodes
+        self.operations_before = operations_before
+        self.operations_after = sum(
+            1 if node[0] == _APPLY else 1 + sum(map(_operations, node[1]))
+            for node in nodes
+            if node[0] in (_APPLY, _CONDITIONAL)
+        )
+        self.folded = folded
+
+    @property
+    def removed(self) -> int:
+        """Количество операций, удаленных сверткой констант и устранением повторов."""
+        return self.operations_before - self.operations_after
+
+    def evaluate(self, variables: Optional[Mapping[str, float]] = None) -> float:
+        """
+        Вычисляет выражение.
+
+        Args:
+            variables: Значения переменных, используемых в выражении
+
+        Returns:
+            Результат вычисления
+
+        Raises:
+            ValueError: При делении на ноль или отсутствии значения переменной
+        """
+        values: list[float] = []
+        append = values.append
+
+        for kind, payload, arguments in self._nodes:
+            if kind == _CONST:
+                append(payload)
+            elif kind == _VAR:
+                if variables is None or payload not in variables:
+                    raise ValueError(f"Неизвестный токен: {payload}")
+                append(float(variables[payload]))
+            elif kind == _CONDITIONAL:
+                then, otherwise = payload
+                branch = then if values[arguments[0]] else otherwise
+                append(evaluate_tokens(branch, variables))
+            elif len(arguments) == 2:
+                append(payload(values[arguments[0]], values[arguments[1]]))
+            else:
+                append(payload(*[values[index] for index in arguments]))
+
+        return values[-1]
+
+    def __repr__(self) -> str:
+        return (
+            f"OptimizedExpression(operations_before={self.operations_before}, "
+            f"operations_after={self.operations_after})"
+        )
+
+
+def optimize(
+    rpn: Union[str, Sequence[str]], variables: Collection[str] = ()
+) -> OptimizedExpression:
+    """
+    Оптимизирует выражение в ПОЛИЗ: сворачивает константы и устраняет повторы.
+
+    Каждому подвыражению сопоставляется структурный ключ (операция и номера
+    узлов-аргументов), поэтому одинаковые подвыражения попадают в один узел
+    и вычисляются один раз. Подвыражения без переменных, включая pi и sin,
+    вычисляются сразу. Из if с постоянным условием остается выбранная ветвь,
+    остальные if становятся узлами с исходными токенами ветвей.
+
+    Args:
+        rpn: Токены выражения в обратной польской нотации (результат
+             shunting_yard) или строка с токенами через пробел
+        variables: Имена переменных, допустимых в выражении
+
+    Returns:
+        Оптимизированное выражение
+
+    Raises:
+        ValueError: При недостаточном количестве операндов, неизвестном
+                   токене или некорректном выражении
+    """
+    tokens = parse_tokens(rpn) if isinstance(rpn, str) else rpn
+    nodes: list[tuple] = []
+    keys: dict[tuple, int] = {}
+    stack: list[int] = []
+    folded = 0
+
+    def add(key: tuple, node: tuple) -> int:
+        index = keys.get(key)
+        if index is None:
+            index = keys[key] = len(nodes)
+            nodes.append(node)
+        return index
+
+    def add_constant(value: float) -> int:
+        # Ключ учитывает тип, чтобы 0.0 и -0.0 не склеивались
+        return add((_CONST, value, repr(value)), (_CONST, value, ()))
+
+    position = 0
+    while position < len(tokens):
+        token = tokens[position]
+        position += 1
+        symbol = SYMBOLS.get(token)
+        if symbol is None:
+            if is_number(token):
+                stack.append(add_constant(float(token)))
+            elif token in variables:
+                stack.append(add((_VAR, token), (_VAR, token, ())))
+            elif token[:1] == JUMP and is_jump(token):
+                # Конец выбранной ветви if с постоянным условием
+                position += int(token[1:])
+            elif token[:1] == JUMP_IF_ZERO and is_jump(token):
+                if not stack:
+                    raise ValueError("Недостаточно операндов для условия")
+                condition = stack.pop()
+                end_then = position + int(token[1:]) - 1
+                if end_then >= len(tokens) or not (
+                    tokens[end_then][:1] == JUMP and is_jump(tokens[end_then])
+                ):
+                    raise ValueError(f"Некорректный переход: {token}")
+                end = end_then + 1 + int(tokens[end_then][1:])
+                if end > len(tokens):
+                    raise ValueError(f"Некорректный переход: {tokens[end_then]}")
+                if nodes[condition][0] == _CONST:
+                    # Продолжаем разбор выбранной ветви
+                    folded += 1
+                    if not nodes[condition][1]:
+                        position = end_then + 1
+                    continue
+                then = tuple(tokens[position:end_then])
+                otherwise = tuple(tokens[end_then + 1:end])
+                stack.append(add(
+                    (_CONDITIONAL, then, otherwise, condition),
+                    (_CONDITIONAL, (then, otherwise), (condition,)),
+                ))
+                position = end
+            else:
+                raise ValueError(f"Неизвестный токен: {token}")
+            continue
+        if symbol.kind == CONSTANT:
+            stack.append(add_constant(symbol.value))
+            continue
+
+        if len(stack) < symbol.arity:
+            if symbol.kind == OPERATOR:
+                raise ValueError("Недостаточно операндов для операции")
+            raise ValueError("Недостаточно операндов для функции")
+        arguments = tuple(stack[len(stack) - symbol.arity:])
+        del stack[len(stack) - symbol.arity:]
+
+        if all(nodes[index][0] == _CONST for index in arguments):
+            try:
+                value = symbol.implementation(*[nodes[index][1] for index in arguments])
+            except _FOLD_ERRORS:
+                pass
+            else:
+                folded += 1
+                stack.append(add_constant(value))
+                continue
+        stack.append(
+            add((_APPLY, token, arguments), (_APPLY, symbol.implementation, arguments))
+        )
+
+    if len(stack) != 1:
+        raise ValueError("Некорректное выражение: в стеке остается не один элемент")
+
+    return OptimizedExpression(_prune(nodes, stack[0]), _operations(tokens), folded)
+
+
+def _operations(tokens: Sequence[str]) -> int:
+    """Количество операций, функций и if в токенах ПОЛИЗ."""
+    count = 0
+    for token in tokens:
+        symbol = SYMBOLS.get(token)
+        if symbol is not None:
+            count += symbol.kind != CONSTANT
+        elif token[:1] == JUMP_IF_ZERO and is_jump(token):
+            count += 1
+    return count
+
+
+def _prune(nodes: list[tuple], root: int) -> list[tuple]:
+    """
+    Удаляет узлы, не участвующие в вычислении корня, и перенумеровывает остальные.
+
+    Корень становится последним узлом.
+    """
+    used = [False] * len(nodes)
+    used[root] = True
+    for index in range(root, -1, -1):
+        if used[index]:
+            for argument in nodes[index][2]:
+                used[argument] = True
+
+    renumbered: dict[int, int] = {}
+    result: list[tuple] = []
+    for index in range(root + 1):
+        if used[index]:
+            kind, payload, arguments = nodes[index]
+            renumbered[index] = len(result)
+            result.append((kind, payload, tuple(renumbered[a] for a in arguments)))
+    return result
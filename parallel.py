@@ -0,0 +1,304 @@
+import re
+from collections.abc import Callable, Collection, Iterator, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Optional
+
+from batch import map_chunks
+from calc import evaluate_tokens
+from registry import CONSTANT, FUNCTION, OPERATOR, SYMBOLS, is_jump, snapshot
+from shunting_yard import is_exponent_sign, shunting_yard
+from stream import EXPRESSION_ERRORS
+from validation import ParseError, strict_shunting_yard
+
+# Желаемая длина части выражения в символах: части короче не окупают
+# передачу в процесс
+DEFAULT_SEGMENT_SIZE = 1 << 20
+
+# Выражение режется только по операторам с приоритетом не выше, чем у + и -
+# (сравнения, + и -): операнды операторов с большим приоритетом обычно
+# короткие
+_MAX_CUT_PRECEDENCE = SYMBOLS["+"].precedence
+
+# Результат вычисления части: пары (оператор перед слагаемым или None для
+# первого слагаемого, значение слагаемого) и ошибка вычисления, прервавшая часть
+_Terms = tuple[list[tuple[Optional[str], float]], Optional[BaseException]]
+
+
+def split_expression(
+    expression: str, segment_size: int = DEFAULT_SEGMENT_SIZE
+) -> list[int]:
+    """
+    Находит позиции, в которых выражение можно разрезать на части.
+
+    Выражение режется только по операторам вне скобок с наименьшим
+    приоритетом среди встречающихся вне скобок (сравнения, иначе + и -):
+    такие операторы левоассоциативны, поэтому ПОЛИЗ выражения — ПОЛИЗ
+    первой части, за которой следуют ПОЛИЗ остальных частей, и каждая часть
+    преобразуется независимо. Первая позиция — первый такой оператор (первая
+    часть — одно слагаемое), следующие — первые такие операторы не ближе
+    segment_size символов к предыдущей. Глубина скобок в точке вычисляется
+    подсчетом скобок в пропущенном фрагменте, без разбора на токены.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+        segment_size: Желаемая длина части в символах
+
+    Returns:
+        Возрастающие позиции операторов, перед которыми начинаются части;
+        пустой список, если выражение не режется
+
+    Raises:
+        ValueError: При неположительном segment_size
+    """
+    if segment_size < 1:
+        raise ValueError("Размер части должен быть положительным")
+    for search in _cut_patterns(expression):
+        if search is None:
+            break
+        cuts = _find_cuts(expression, search, segment_size)
+        if cuts:
+            return cuts
+        # Операторов этого приоритета вне скобок нет: пробуем следующий
+    return []
+
+
+def _find_cuts(
+    expression: str,
+    search: Callable[[str, int], Optional[re.Match]],
+    segment_size: int,
+) -> list[int]:
+    """Позиции операторов вне скобок, найденных search, не ближе segment_size друг к другу."""
+    cuts: list[int] = []
+    count = expression.count
+    position = 0
+    depth = 0
+    target = 0
+    while target < len(expression):
+        match = search(expression, target)
+        while match is not None:
+            index = match.start()
+            depth += count("(", position, index) - count(")", position, index)
+            position = index
+            if depth == 0 and not is_exponent_sign(expression, index):
+                break
+            match = search(expression, index + 1)
+        if match is None:
+            break
+        cuts.append(position)
+        target = position + segment_size
+    return cuts
+
+
+def parallel_shunting_yard(
+    expression: str,
+    variables: Collection[str] = (),
+    workers: Optional[int] = None,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+    executor_class: Callable[[int], Executor] = ProcessPoolExecutor,
+) -> list[str]:
+    """
+    Преобразует длинное выражение в ПОЛИЗ по частям в пуле процессов.
+
+    Выражение режется split_expression, части преобразуются в ПОЛИЗ
+    параллельно и склеиваются в исходном порядке. Результат совпадает с
+    shunting_yard токен в токен. Части проверяются строго; если хотя бы одна
+    часть некорректна, все выражение преобразуется shunting_yard
+    последовательно, чтобы результат (или ошибка) совпал с ним и для
+    некорректных выражений.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+        variables: Имена переменных, допустимых в выражении; для пула
+                   процессов должны сериализоваться pickle
+        workers: Количество исполнителей (по умолчанию — число процессоров)
+        segment_size: Желаемая длина части в символах
+        executor_class: Класс пула исполнителей
+
+    Returns:
+        Список токенов в обратной польской нотации
+
+    Raises:
+        ValueError: При ошибке разбора
+    """
+    cuts = split_expression(expression, segment_size)
+    if not cuts:
+        return shunting_yard(expression, variables)
+    function = partial(_convert_segments, variables)
+    output: list[str] = []
+    for rpn in map_chunks(function, _segments(expression, cuts), workers, 1, executor_class):
+        if rpn is None:
+            return shunting_yard(expression, variables)
+        output.extend(rpn.split())
+    return output
+
+
+def parallel_evaluate(
+    expression: str,
+    variables: Optional[Mapping[str, float]] = None,
+    workers: Optional[int] = None,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+    executor_class: Callable[[int], Executor] = ProcessPoolExecutor,
+) -> float:
+    """
+    Вычисляет длинное выражение по частям в пуле процессов.
+
+    Каждая часть преобразуется и вычисляется в своем процессе; в основной
+    процесс возвращаются только значения слагаемых верхнего уровня, которые
+    складываются и вычитаются слева направо. Поэтому результат и первая
+    ошибка вычисления совпадают с evaluate_tokens(shunting_yard(...)) до
+    последнего бита. Если хотя бы одна часть некорректна, выражение
+    вычисляется последовательно.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+        variables: Значения переменных; для пула процессов должны
+                   сериализоваться pickle
+        workers: Количество исполнителей (по умолчанию — число процессоров)
+        segment_size: Желаемая длина части в символах
+        executor_class: Класс пула исполнителей
+
+    Returns:
+        Результат вычисления
+
+    Raises:
+        ValueError: При ошибке разбора или вычисления
+        ArithmeticError: При переполнении
+    """
+    names = variables if variables is not None else ()
+    cuts = split_expression(expression, segment_size)
+    if cuts:
+        function = partial(_evaluate_segments, variables)
+        results = list(
+            map_chunks(function, _segments(expression, cuts), workers, 1, executor_class)
+        )
+        # Ошибка разбора любой части важнее ошибок вычисления
+        if None not in results:
+            return _fold(results)
+    return evaluate_tokens(shunting_yard(expression, names), variables)
+
+
+def _cut_patterns(
+    expression: str,
+) -> Iterator[Optional[Callable[[str, int], Optional[re.Match]]]]:
+    """
+    Поиск операторов, по которым можно резать выражение, по возрастанию приоритета.
+
+    Выдаются только приоритеты не выше _MAX_CUT_PRECEDENCE, операторы
+    которых есть в тексте выражения.
+
+    Returns:
+        Методы search регулярных выражений; None, если операторы очередного
+        приоритета правоассоциативны и резать по следующим нельзя
+    """
+    levels: dict[int, list[str]] = {}
+    for name, symbol in snapshot().items():
+        if symbol.kind == OPERATOR and symbol.precedence <= _MAX_CUT_PRECEDENCE:
+            levels.setdefault(symbol.precedence, []).append(name)
+    for precedence in sorted(levels):
+        names = [name for name in levels[precedence] if name in expression]
+        if not names:
+            continue
+        if any(SYMBOLS[name].right_associative for name in names):
+            yield None
+            return
+        # Длинные операторы раньше: <= не должен находиться как <
+        names.sort(key=len, reverse=True)
+        yield re.compile("|".join(map(re.escape, names))).search
+
+
+def _segments(expression: str, cuts: list[int]) -> Iterator[tuple[bool, str]]:
+    """Части выражения с признаком первой части; копии создаются по мере выдачи."""
+    starts = [0, *cuts]
+    ends = [*cuts, len(expression)]
+    for start, end in zip(starts, ends):
+        yield start == 0, expression[start:end]
+
+
+def _segment_rpn(
+    first: bool, text: str, variables: Collection[str]
+) -> Optional[list[str]]:
+    """
+    Строгое преобразование части в ПОЛИЗ; None — часть некорректна.
+
+    Часть, кроме первой, начинается с оператора: перед ней подставляется
+    операнд 0, который затем убирается из ПОЛИЗ.
+    """
+    try:
+        if first:
+            return strict_shunting_yard(text, variables)
+        return strict_shunting_yard("0" + text, variables)[1:]
+    except ParseError:
+        return None
+
+
+def _convert_segments(
+    variables: Collection[str], segments: list[tuple[bool, str]]
+) -> list[Optional[str]]:
+    """Преобразует части в ПОЛИЗ; токены возвращаются одной строкой через пробел."""
+    results = []
+    for first, text in segments:
+        rpn = _segment_rpn(first, text, variables)
+        results.append(None if rpn is None else " ".join(rpn))
+    return results
+
+
+def _evaluate_segments(
+    variables: Optional[Mapping[str, float]], segments: list[tuple[bool, str]]
+) -> list[Optional[_Terms]]:
+    """Преобразует части и вычисляет их слагаемые верхнего уровня."""
+    results: list[Optional[_Terms]] = []
+    for first, text in segments:
+        rpn = _segment_rpn(first, text, variables if variables is not None else ())
+        results.append(None if rpn is None else _evaluate_terms(first, rpn, variables))
+    return results
+
+
+def _evaluate_terms(
+    first: bool, rpn: list[str], variables: Optional[Mapping[str, float]]
+) -> _Terms:
+    """
+    Вычисляет слагаемые верхнего уровня ПОЛИЗ части.
+
+    Первая часть — одно слагаемое. ПОЛИЗ остальных частей имеет вид
+    T1 op1 T2 op2 ...: оператор верхнего уровня — оператор, перед которым в
+    стеке вычисления одно значение. Ветви if учитываются так, как будто
+    вычисляется одна из них.
+    """
+    terms: list[tuple[Optional[str], float]] = []
+    try:
+        if first:
+            terms.append((None, evaluate_tokens(rpn, variables)))
+            return terms, None
+        symbols = SYMBOLS
+        depth = 0
+        start = 0
+        for index, token in enumerate(rpn):
+            symbol = symbols.get(token)
+            if symbol is None or symbol.kind == CONSTANT:
+                # Переход снимает со стека условие (?n) или значение ветви,
+                # вместо которой вычисляется другая (:n)
+                depth += -1 if is_jump(token) else 1
+            elif symbol.kind == FUNCTION:
+                depth += 1 - symbol.arity
+            elif depth == 1:
+                terms.append((token, evaluate_tokens(rpn[start:index], variables)))
+                start = index + 1
+                depth = 0
+            else:
+                depth -= 1
+    except EXPRESSION_ERRORS as e:
+        return terms, e
+    return terms, None
+
+
+def _fold(results: list[Optional[_Terms]]) -> float:
+    """Складывает слагаемые частей слева направо; выбрасывает первую ошибку."""
+    symbols = SYMBOLS
+    value = 0.0
+    for terms, error in results:
+        for operator, term in terms:
+            value = term if operator is None else symbols[operator].implementation(value, term)
+        if error is not None:
+            raise error
+    return value
@@ -0,0 +1,169 @@
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Collection
+from typing import NamedTuple
+
+import registry
+from shunting_yard import shunting_yard
+
+
+class CacheInfo(NamedTuple):
+    """
+    Статистика кэша разбора.
+
+    Attributes:
+        hits: Количество попаданий
+        misses: Количество промахов
+        evictions: Количество вытесненных записей
+        maxsize: Максимальное количество записей
+        maxbytes: Максимальный суммарный размер записей в байтах
+        currsize: Текущее количество записей
+        currbytes: Текущий суммарный размер записей в байтах
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    maxbytes: int
+    currsize: int
+    currbytes: int
+
+
+def normalize(expression: str) -> str:
+    """
+    Нормализует текст выражения для использования в качестве ключа кэша.
+
+    Убирает пробелы по краям и заменяет каждую последовательность пробельных
+    символов одним пробелом. Пробелы не удаляются полностью, так как
+    "1 2" и "12" разбираются по-разному.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+
+    Returns:
+        Нормализованное выражение
+    """
+    return " ".join(expression.split())
+
+
+def _entry_size(key: tuple[str, tuple[str, ...]], rpn: tuple[str, ...]) -> int:
+    """Оценивает объем памяти, занимаемый записью кэша, в байтах."""
+    size = sys.getsizeof(key[0]) + sys.getsizeof(rpn)
+    size += sum(sys.getsizeof(name) for name in key[1])
+    return size + sum(sys.getsizeof(token) for token in rpn)
+
+
+class ParseCache:
+    """
+    Ограниченный LRU-кэш результатов shunting_yard.
+
+    Кэш ограничен одновременно количеством записей и их суммарным размером;
+    при превышении любого из ограничений вытесняются давно не
+    использовавшиеся записи. Результаты хранятся и возвращаются в виде
+    кортежей, поэтому вызывающий код не может их испортить. Выражения,
+    вызвавшие ошибку, не кэшируются. Результат разбора зависит от реестра
+    функций и констант, поэтому после его изменения (registry.version)
+    кэш очищается при следующем обращении.
+
+    Кэш можно использовать из нескольких потоков: записи и статистика
+    изменяются под блокировкой, а разбор выполняется вне нее, поэтому
+    промахи разных потоков не ждут друг друга.
+    """
+
+    def __init__(self, maxsize: int = 4096, maxbytes: int = 16 * 1024 * 1024) -> None:
+        """
+        Args:
+            maxsize: Максимальное количество записей
+            maxbytes: Максимальный суммарный размер записей в байтах
+        """
+        if maxsize < 0 or maxbytes < 0:
+            raise ValueError("Размер кэша не может быть отрицательным")
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        # Ключ -> (ПОЛИЗ, размер записи в байтах)
+        self._entries: OrderedDict[
+            tuple[str, tuple[str, ...]], tuple[tuple[str, ...], int]
+        ] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # Номер изменения реестра, при котором разобраны записи
+        self._version = registry.version()
+        self._lock = threading.Lock()
+
+    def shunting_yard(
+        self, expression: str, variables: Collection[str] = ()
+    ) -> tuple[str, ...]:
+        """
+        Преобразует выражение в ПОЛИЗ, используя кэш.
+
+        Args:
+            expression: Арифметическое выражение в инфиксной записи
+            variables: Имена переменных, допустимых в выражении
+
+        Returns:
+            Кортеж токенов в обратной польской нотации
+
+        Raises:
+            ValueError: При ошибке разбора выражения
+        """
+        key = (normalize(expression), tuple(variables))
+        version = registry.version()
+        with self._lock:
+            if version != self._version:
+                # Реестр изменился: функции и константы в записях устарели
+                self._entries.clear()
+                self._bytes = 0
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return entry[0]
+            self._misses += 1
+
+        rpn = tuple(shunting_yard(key[0], key[1]))
+        size = _entry_size(key, rpn)
+        if self.maxsize == 0 or size > self.maxbytes:
+            return rpn
+
+        with self._lock:
+            if registry.version() != version or self._version != version:
+                # Реестр изменился во время разбора
+                return rpn
+            # Выражение мог разобрать и добавить другой поток
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (rpn, size)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or self._bytes > self.maxbytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+        return rpn
+
+    def cache_info(self) -> CacheInfo:
+        """Возвращает статистику кэша."""
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                self.maxsize,
+                self.maxbytes,
+                len(self._entries),
+                self._bytes,
+            )
+
+    def cache_clear(self) -> None:
+        """Очищает кэш и сбрасывает статистику."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
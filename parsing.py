@@ -0,0 +1,194 @@
+from collections.abc import Callable, Collection, Iterable
+from typing import NamedTuple
+
+from pratt import pratt
+from registry import CONDITIONAL, CONDITIONAL_ARITY, JUMP, JUMP_IF_ZERO, SYMBOLS, is_jump
+from shunting_yard import shunting_yard
+from validation import strict_shunting_yard
+
+# Способы преобразования выражения в ПОЛИЗ: название -> функция(выражение, переменные)
+ENGINES: dict[str, Callable[[str, Collection[str]], list[str]]] = {
+    "shunting_yard": shunting_yard,
+    "strict": strict_shunting_yard,
+    "pratt": pratt,
+}
+
+
+class Node(NamedTuple):
+    """
+    Узел синтаксического дерева выражения.
+
+    Attributes:
+        token: Число, переменная, константа, оператор или функция (в том
+               числе условная функция if)
+        children: Операнды оператора или аргументы функции; у чисел,
+                  переменных и констант пусто
+    """
+
+    token: str
+    children: tuple["Node", ...] = ()
+
+
+def parse(
+    expression: str, engine: str = "shunting_yard", variables: Collection[str] = ()
+) -> list[str]:
+    """
+    Преобразует выражение в ПОЛИЗ выбранным способом.
+
+    Все способы дают одинаковую ПОЛИЗ для корректных выражений. Способ
+    shunting_yard пропускает часть ошибок до вычисления, strict и pratt
+    отклоняют любое некорректное выражение с позицией ошибки.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+        engine: Название способа из ENGINES
+        variables: Имена переменных, допустимых в выражении
+
+    Returns:
+        Список токенов в обратной польской нотации
+
+    Raises:
+        ValueError: При неизвестном способе или ошибке разбора
+    """
+    return _engine(engine)(expression, variables)
+
+
+def parse_ast(
+    expression: str, engine: str = "pratt", variables: Collection[str] = ()
+) -> Node:
+    """
+    Преобразует выражение в синтаксическое дерево.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+        engine: Название способа из ENGINES
+        variables: Имена переменных, допустимых в выражении
+
+    Returns:
+        Корень дерева
+
+    Raises:
+        ValueError: При неизвестном способе или ошибке разбора
+    """
+    return to_ast(_engine(engine)(expression, variables))
+
+
+def to_ast(rpn: Iterable[str]) -> Node:
+    """
+    Строит синтаксическое дерево по токенам ПОЛИЗ.
+
+    Переходы условной функции (condition ?n then :m otherwise) образуют
+    узел if с тремя детьми. Ветви строятся в том же проходе без рекурсии.
+
+    Args:
+        rpn: Токены выражения в обратной польской нотации
+
+    Returns:
+        Корень дерева
+
+    Raises:
+        ValueError: Если ПОЛИЗ некорректна
+    """
+    symbols = SYMBOLS
+    stack: list[Node] = []
+    # Открытые if: [переход ?n, условие, отложенный стек, номер последнего
+    # токена текущей ветви, ветвь значения или None, пока строится она]
+    conditionals: list[list] = []
+    tokens = iter(rpn)
+    position = -1
+    for token in tokens:
+        position += 1
+        symbol = symbols.get(token)
+        arity = 0 if symbol is None else symbol.arity
+        if symbol is None and is_jump(token):
+            if token[0] != JUMP_IF_ZERO:
+                raise ValueError(f"Некорректный переход: {token}")
+            if not stack:
+                raise ValueError("Недостаточно операндов для условия")
+            conditionals.append(
+                [token, stack.pop(), stack, position + max(int(token[1:]) - 1, 0), None]
+            )
+            stack = []
+        elif arity:
+            if len(stack) < arity:
+                raise ValueError("Недостаточно операндов для операции")
+            children = tuple(stack[-arity:])
+            del stack[-arity:]
+            stack.append(Node(token, children))
+        else:
+            stack.append(Node(token))
+
+        # Завершение ветвей, последний токен которых прочитан
+        while conditionals and conditionals[-1][3] <= position:
+            conditional = conditionals[-1]
+            branch = _single(stack)
+            if conditional[4] is None:
+                conditional[4] = branch
+                jump = next(tokens, "")
+                position += 1
+                if jump[:1] != JUMP or not is_jump(jump):
+                    raise ValueError(f"Некорректный переход: {conditional[0]}")
+                conditional[3] = position + int(jump[1:])
+                stack = []
+            else:
+                conditionals.pop()
+                stack = conditional[2]
+                stack.append(Node(CONDITIONAL, (conditional[1], conditional[4], branch)))
+    if conditionals:
+        raise ValueError(f"Некорректный переход: {conditionals[-1][0]}")
+    return _single(stack)
+
+
+def to_rpn(node: Node) -> list[str]:
+    """
+    Возвращает токены ПОЛИЗ синтаксического дерева (обход в обратном порядке).
+
+    Args:
+        node: Корень дерева
+
+    Returns:
+        Список токенов в обратной польской нотации
+    """
+    output: list[str] = []
+    # Узлы, ожидающие обхода, и количество уже обойденных детей. У узла if
+    # после условия и после ветви значения в выход записывается переход;
+    # его длина дописывается, когда обойдена следующая ветвь
+    stack: list[tuple[Node, int]] = [(node, 0)]
+    jumps: list[int] = []
+    while stack:
+        current, visited = stack.pop()
+        if current.token == CONDITIONAL and len(current.children) == CONDITIONAL_ARITY:
+            if visited == 2:
+                # Ветвь значения обойдена: ?n перескакивает ее и переход :m
+                index = jumps.pop()
+                output[index] += str(len(output) - index)
+            elif visited == 3:
+                index = jumps.pop()
+                output[index] += str(len(output) - index - 1)
+            if visited in (1, 2):
+                jumps.append(len(output))
+                output.append(JUMP_IF_ZERO if visited == 1 else JUMP)
+            if visited < 3:
+                stack.append((current, visited + 1))
+                stack.append((current.children[visited], 0))
+        elif visited or not current.children:
+            output.append(current.token)
+        else:
+            stack.append((current, 1))
+            stack.extend((child, 0) for child in reversed(current.children))
+    return output
+
+
+def _single(stack: list[Node]) -> Node:
+    """Единственный элемент стека — корень дерева или ветви."""
+    if len(stack) != 1:
+        raise ValueError("Некорректное выражение: в стеке остается не один элемент")
+    return stack[0]
+
+
+def _engine(name: str) -> Callable[[str, Collection[str]], list[str]]:
+    """Возвращает функцию преобразования по названию способа."""
+    try:
+        return ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Неизвестный способ разбора: {name}") from None
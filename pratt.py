@@ -0,0 +1,174 @@
+from collections.abc import Collection
+from typing import Optional
+
+from registry import CONDITIONAL, CONSTANT, FUNCTION, SYMBOLS, conditional_rpn
+from shunting_yard import iter_tokens
+from validation import ParseError, function_arity, token_position
+
+
+def pratt(expression: str, variables: Collection[str] = ()) -> list[str]:
+    """
+    Преобразует выражение в ПОЛИЗ методом Пратта (подъем по приоритетам).
+
+    Разбор правого операнда оператора ограничен минимальной силой связывания:
+    для левоассоциативного оператора она на единицу больше его приоритета,
+    для правоассоциативного равна ему. Следующий оператор завершает
+    операнд, если его приоритет меньше текущей минимальной силы. Вместо
+    рекурсивного вызова состояние разбора (оператор и сила связывания
+    внешнего выражения) сохраняется в стеке, поэтому глубина вложенности не
+    ограничена глубиной рекурсии Python. Сила связывания вычисляется один
+    раз при чтении оператора; при выталкивании операторов сравниваются
+    целые числа без обращения к реестру.
+
+    Для любого корректного выражения результат совпадает с shunting_yard
+    токен в токен. Некорректные выражения, которые shunting_yard пропускает
+    до вычисления, отклоняются так же, как strict_shunting_yard.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+        variables: Имена переменных, допустимых в выражении
+
+    Returns:
+        Список токенов в обратной польской нотации
+
+    Raises:
+        ParseError: При первой ошибке разбора, с ее позицией
+    """
+    output: list[str] = []
+    try:
+        _parse(expression, variables, output)
+    except _Invalid as e:
+        message, index = e.args
+        raise ParseError(message, token_position(expression, index)) from None
+    return output
+
+
+class _Invalid(Exception):
+    """Ошибка разбора с номером токена; позиция вычисляется только при ошибке."""
+
+
+def _parse(expression: str, variables: Collection[str], output: list[str]) -> None:
+    """
+    Разбор выражения с записью токенов ПОЛИЗ в output.
+
+    Raises:
+        _Invalid: С описанием ошибки и номером ошибочного токена (None —
+                  конец выражения)
+    """
+    symbols = SYMBOLS
+    emit = output.append
+    # Отложенные операторы и скобки с минимальной силой связывания внешнего
+    # выражения
+    frames: list[tuple[str, int]] = []
+    # Открытые скобки: [номер токена, функция или None, арность, число
+    # аргументов, длины ПОЛИЗ в конце аргументов if]
+    groups: list[list] = []
+    min_power = 0
+    expect_operand = True
+    function: Optional[str] = None
+    previous: Optional[str] = None
+    index = -1
+
+    try:
+        for index, token in enumerate(iter_tokens(expression)):
+            symbol = symbols.get(token)
+
+            if expect_operand:
+                if function is not None:
+                    if token != "(":
+                        raise _Invalid(f"После функции {function} ожидается (", index)
+                    groups.append([index, function, function_arity(function), 1, []])
+                    function = None
+                    frames.append((token, min_power))
+                    min_power = 0
+                elif symbol is None:
+                    if token == "(":
+                        groups.append([index, None, 0, 1, []])
+                        frames.append((token, min_power))
+                        min_power = 0
+                    elif token == ")":
+                        if not groups:
+                            raise _Invalid("Непарная закрывающая скобка", index)
+                        if previous == "(":
+                            raise _Invalid("Пустые скобки", index)
+                        raise _Invalid("Ожидается операнд", index)
+                    elif token == ",":
+                        if not groups or groups[-1][1] is None:
+                            raise _Invalid("Запятая вне аргументов функции", index)
+                        raise _Invalid("Ожидается операнд", index)
+                    elif token == CONDITIONAL and token not in variables:
+                        function = token
+                    elif token.isalpha() and token not in variables:
+                        raise _Invalid(f"Неизвестная функция или константа: {token}", index)
+                    else:
+                        # Число или переменная
+                        emit(token)
+                        expect_operand = False
+                elif symbol.kind == CONSTANT:
+                    emit(token)
+                    expect_operand = False
+                elif symbol.kind == FUNCTION:
+                    function = token
+                else:
+                    raise _Invalid("Ожидается операнд", index)
+
+            elif symbol is not None:
+                if symbol.kind != FUNCTION and symbol.kind != CONSTANT:
+                    # Оператор завершает правые операнды более сильных операторов
+                    precedence = symbol.precedence
+                    while precedence < min_power:
+                        operator, min_power = frames.pop()
+                        emit(operator)
+                    frames.append((token, min_power))
+                    min_power = precedence if symbol.right_associative else precedence + 1
+                    expect_operand = True
+                else:
+                    raise _Invalid("Ожидается оператор", index)
+
+            elif token == ")" or token == ",":
+                if not groups:
+                    if token == ")":
+                        raise _Invalid("Непарная закрывающая скобка", index)
+                    raise _Invalid("Запятая вне аргументов функции", index)
+                group = groups[-1]
+                if token == "," and group[1] is None:
+                    raise _Invalid("Запятая вне аргументов функции", index)
+                while frames[-1][0] != "(":
+                    emit(frames.pop()[0])
+                if token == ",":
+                    group[3] += 1
+                    group[4].append(len(output))
+                    min_power = 0
+                    expect_operand = True
+                else:
+                    min_power = frames.pop()[1]
+                    groups.pop()
+                    _, name, arity, count, marks = group
+                    if name is not None:
+                        if count != arity:
+                            raise _Invalid(
+                                f"Функция {name} ожидает аргументов: {arity}, передано: {count}",
+                                index,
+                            )
+                        if name == CONDITIONAL:
+                            start, middle = marks
+                            output[start:] = conditional_rpn(
+                                [], output[start:middle], output[middle:]
+                            )
+                        else:
+                            emit(name)
+            else:
+                raise _Invalid("Ожидается оператор", index)
+            previous = token
+    except ValueError as e:
+        # Неизвестный символ: токенизатор не смог выдать следующий токен
+        raise _Invalid(str(e), index + 1) from None
+
+    if function is not None:
+        raise _Invalid(f"После функции {function} ожидается (", None)
+    if expect_operand:
+        raise _Invalid("Неожиданный конец выражения", None)
+    if groups:
+        raise _Invalid("Незакрытая скобка", groups[-1][0])
+    while frames:
+        emit(frames.pop()[0])
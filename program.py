@@ -0,0 +1,341 @@
+import math
+import mmap
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import Union
+
+from registry import CONSTANT, SYMBOLS, is_number
+
+# Коды операций. Операнды OP_CONST берутся из пула констант по порядку,
+# поэтому инструкции не содержат аргументов и занимают один байт
+OP_CONST = 0
+OP_ADD = 1
+OP_SUB = 2
+OP_MUL = 3
+OP_DIV = 4
+OP_POW = 5
+OP_SIN = 6
+
+_OPERATOR_CODES = {"+": OP_ADD, "-": OP_SUB, "*": OP_MUL, "/": OP_DIV, "^": OP_POW}
+_FUNCTION_CODES = {"sin": OP_SIN}
+
+# Заголовок пакета: сигнатура, версия, количество программ
+_HEADER = struct.Struct("<4sII")
+_MAGIC = b"RPNB"
+_VERSION = 1
+# Запись оглавления: смещение кода, длина кода, смещение констант,
+# количество констант, максимальная глубина стека
+_ENTRY = struct.Struct("<QIQII")
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+# Стек вычисления, свой у каждого потока: выделяется один раз и
+# увеличивается только для программы с большей глубиной
+_stacks = threading.local()
+
+
+class Program:
+    """
+    Выражение в компактном двоичном виде: массив кодов операций и пул констант.
+
+    Максимальная глубина стека вычисляется при компиляции, поэтому стек
+    не растет при вычислении. Стек выделяется один раз на поток и
+    используется повторно всеми программами.
+
+    Attributes:
+        code: Коды операций, по одному байту на инструкцию
+        constants: Пул констант (числа double)
+        max_depth: Максимальная глубина стека при вычислении
+    """
+
+    __slots__ = ("code", "constants", "max_depth")
+
+    def __init__(self, code: Buffer, constants: Sequence[float], max_depth: int) -> None:
+        self.code = code
+        self.constants = constants
+        self.max_depth = max_depth
+
+    def evaluate(self) -> float:
+        """
+        Вычисляет программу.
+
+        Returns:
+            Результат вычисления
+
+        Raises:
+            ValueError: При делении на ноль или возведении отрицательного
+                       числа в дробную степень
+            ZeroDivisionError: При возведении нуля в отрицательную степень
+            OverflowError: При переполнении
+        """
+        return _run(self.code, self.constants, self.max_depth)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Program):
+            return NotImplemented
+        return (
+            bytes(self.code) == bytes(other.code)
+            and list(self.constants) == list(other.constants)
+            and self.max_depth == other.max_depth
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Program(code={bytes(self.code)!r}, constants={list(self.constants)!r}, "
+            f"max_depth={self.max_depth})"
+        )
+
+
+def compile_program(rpn: Union[str, Sequence[str]]) -> Program:
+    """
+    Компилирует выражение в ПОЛИЗ в двоичную программу.
+
+    Проверки количества операндов выполняются здесь, один раз, а не при
+    каждом вычислении. Константы из реестра записываются в пул значениями;
+    функции, зарегистрированные пользователем, не поддерживаются, так как
+    программа должна оставаться переносимой между процессами.
+
+    Args:
+        rpn: Токены выражения в обратной польской нотации (результат
+             shunting_yard) или строка с токенами через пробел
+
+    Returns:
+        Скомпилированная программа
+
+    Raises:
+        ValueError: При недостаточном количестве операндов, неизвестном
+                   токене или некорректном выражении
+    """
+    tokens = rpn.split() if isinstance(rpn, str) else rpn
+    code = bytearray()
+    constants = array("d")
+    depth = 0
+    max_depth = 0
+
+    for token in tokens:
+        symbol = SYMBOLS.get(token)
+        if is_number(token):
+            code.append(OP_CONST)
+            constants.append(float(token))
+            depth += 1
+        elif symbol is not None and symbol.kind == CONSTANT:
+            code.append(OP_CONST)
+            constants.append(symbol.value)
+            depth += 1
+        elif token in _OPERATOR_CODES:
+            if depth < 2:
+                raise ValueError("Недостаточно операндов для операции")
+            code.append(_OPERATOR_CODES[token])
+            depth -= 1
+        elif token in _FUNCTION_CODES and symbol is not None:
+            if depth < 1:
+                raise ValueError("Недостаточно операндов для функции")
+            code.append(_FUNCTION_CODES[token])
+        else:
+            raise ValueError(f"Неизвестный токен: {token}")
+        max_depth = max(max_depth, depth)
+
+    if depth != 1:
+        raise ValueError("Некорректное выражение: в стеке остается не один элемент")
+
+    return Program(bytes(code), constants, max_depth)
+
+
+def _run(code: Buffer, constants: Sequence[float], max_depth: int) -> float:
+    """Выполняет код операций на заранее выделенном стеке потока."""
+    stack = getattr(_stacks, "stack", None)
+    if stack is None or len(stack) < max_depth:
+        stack = _stacks.stack = array("d", bytes(8 * max_depth))
+    sp = 0
+    k = 0
+
+    for op in code:
+        if op == OP_CONST:
+            stack[sp] = constants[k]
+            k += 1
+            sp += 1
+        elif op == OP_SIN:
+            stack[sp - 1] = math.sin(stack[sp - 1])
+        else:
+            sp -= 1
+            b = stack[sp]
+            if op == OP_ADD:
+                stack[sp - 1] += b
+            elif op == OP_SUB:
+                stack[sp - 1] -= b
+            elif op == OP_MUL:
+                stack[sp - 1] *= b
+            elif op == OP_DIV:
+                if b == 0:
+                    raise ValueError("Деление на ноль")
+                stack[sp - 1] /= b
+            elif op == OP_POW:
+                # Как operator.pow в evaluate_rpn: 0 в отрицательной степени
+                # дает ZeroDivisionError, но комплексный результат в стек
+                # чисел double не помещается
+                value = stack[sp - 1] ** b
+                if isinstance(value, complex):
+                    raise ValueError("Возведение отрицательного числа в дробную степень")
+                stack[sp - 1] = value
+            else:
+                raise ValueError(f"Неизвестный код операции: {op}")
+
+    return stack[0]
+
+
+def write_bundle(path: str, programs: Iterable[Program]) -> int:
+    """
+    Записывает программы в файл пакета.
+
+    Формат (все числа little-endian): заголовок "RPNB", версия, количество
+    программ; оглавление с записью на каждую программу; затем данные —
+    код программы и выровненный на 8 байт пул констант.
+
+    Args:
+        path: Путь к файлу пакета
+        programs: Скомпилированные программы
+
+    Returns:
+        Количество записанных программ
+    """
+    programs = list(programs)
+    offset = _HEADER.size + _ENTRY.size * len(programs)
+    entries = bytearray()
+    data = bytearray()
+
+    for program in programs:
+        code_offset = offset + len(data)
+        data += program.code
+        data += bytes(-(offset + len(data)) % 8)
+        constants_offset = offset + len(data)
+        constants = array("d", program.constants)
+        if sys.byteorder != "little":
+            constants.byteswap()
+        data += constants.tobytes()
+        entries += _ENTRY.pack(
+            code_offset,
+            len(program.code),
+            constants_offset,
+            len(constants),
+            program.max_depth,
+        )
+
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, len(programs)))
+        file.write(entries)
+        file.write(data)
+    return len(programs)
+
+
+class Bundle:
+    """
+    Пакет программ, открытый через mmap.
+
+    Программы не разбираются и не копируются при открытии: evaluate читает
+    код и константы напрямую из отображенного в память файла и освобождает
+    срезы до возврата, поэтому пакет можно закрыть в любой момент.
+    Используется как контекстный менеджер.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path: Путь к файлу пакета, записанному write_bundle
+
+        Raises:
+            ValueError: Если файл не является пакетом программ
+        """
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        try:
+            magic, version, count = _HEADER.unpack_from(self._view)
+        except struct.error:
+            magic, version, count = b"", 0, 0
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"Некорректный файл пакета: {path}")
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def program(self, index: int) -> Program:
+        """
+        Возвращает копию программы пакета.
+
+        Программа не ссылается на память файла и остается пригодной после
+        закрытия пакета.
+
+        Args:
+            index: Номер программы
+
+        Returns:
+            Программа
+
+        Raises:
+            IndexError: При неверном номере программы
+        """
+        code, constants, max_depth = self._slices(index)
+        try:
+            return Program(bytes(code), array("d", constants), max_depth)
+        finally:
+            _release(code, constants)
+
+    def evaluate(self, index: int) -> float:
+        """
+        Вычисляет программу пакета без копирования данных.
+
+        Args:
+            index: Номер программы
+
+        Returns:
+            Результат вычисления
+
+        Raises:
+            IndexError: При неверном номере программы
+            ValueError: При ошибке вычисления
+        """
+        code, constants, max_depth = self._slices(index)
+        try:
+            return _run(code, constants, max_depth)
+        finally:
+            _release(code, constants)
+
+    def _slices(self, index: int) -> tuple[memoryview, Sequence[float], int]:
+        """Срезы кода и констант программы над отображением файла и глубина стека."""
+        if not 0 <= index < self._count:
+            raise IndexError("Номер программы вне диапазона")
+        code_offset, code_length, constants_offset, count, max_depth = _ENTRY.unpack_from(
+            self._view, _HEADER.size + _ENTRY.size * index
+        )
+        code = self._view[code_offset:code_offset + code_length]
+        raw = self._view[constants_offset:constants_offset + 8 * count]
+        if sys.byteorder == "little":
+            constants: Sequence[float] = raw.cast("d")
+        else:
+            constants = array("d", raw.tobytes())
+            constants.byteswap()
+        raw.release()
+        return code, constants, max_depth
+
+    def close(self) -> None:
+        """Закрывает пакет и освобождает отображение файла."""
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "Bundle":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _release(*buffers: object) -> None:
+    """Освобождает срезы memoryview, чтобы отображение файла можно было закрыть."""
+    for buffer in buffers:
+        if isinstance(buffer, memoryview):
+            buffer.release()
@@ -0,0 +1,381 @@
+import math
+import operator
+import re
+import threading
+from collections.abc import Callable
+from typing import NamedTuple, Optional
+
+# Виды символов
+OPERATOR = "operator"
+FUNCTION = "function"
+CONSTANT = "constant"
+
+# Числовой литерал: целое число, десятичная дробь или экспоненциальная
+# запись (12, 1.5, 1.5e-3); дробная часть и порядок — необязательный суффикс
+NUMBER_SUFFIX_PATTERN = r"(?:\.\d+)?(?:[eE][+-]?\d+)?"
+NUMBER_PATTERN = r"\d+" + NUMBER_SUFFIX_PATTERN
+
+# Число в ПОЛИЗ может быть отрицательным
+_NUMBER = re.compile("-?" + NUMBER_PATTERN)
+
+# Приоритет функций выше приоритета любого оператора
+FUNCTION_PRECEDENCE = 4
+
+# Приоритет операторов сравнения ниже приоритета + и -
+COMPARISON_PRECEDENCE = 0
+
+# Условная функция if(условие, значение, иначе). Вычисляется лениво: в ПОЛИЗ
+# она записывается переходами, а не токеном, поэтому в SYMBOLS ее нет
+CONDITIONAL = "if"
+CONDITIONAL_ARITY = 3
+
+# Переходы в ПОЛИЗ: токен ?n снимает со стека условие и, если оно равно
+# нулю, пропускает n следующих токенов; токен :n пропускает n следующих
+# токенов. if(c, a, b) записывается как c ?n a :m b, где n — длина ПОЛИЗ a
+# плюс один, m — длина ПОЛИЗ b
+JUMP_IF_ZERO = "?"
+JUMP = ":"
+
+
+class Symbol(NamedTuple):
+    """
+    Описание оператора, функции или константы.
+
+    Attributes:
+        kind: Вид символа: OPERATOR, FUNCTION или CONSTANT
+        arity: Количество аргументов (0 для констант)
+        precedence: Приоритет (0 для констант)
+        right_associative: True для правоассоциативных операторов
+        implementation: Функция Python, вычисляющая результат (None для констант)
+        value: Значение константы (0.0 для операторов и функций)
+    """
+
+    kind: str
+    arity: int
+    precedence: int
+    right_associative: bool
+    implementation: Optional[Callable[..., float]]
+    value: float
+
+
+def _divide(a: float, b: float) -> float:
+    """
+    Делит a на b.
+
+    Raises:
+        ValueError: При делении на ноль
+    """
+    if b == 0:
+        raise ValueError("Деление на ноль")
+    return a / b
+
+
+def _operator(
+    precedence: int, implementation: Callable[[float, float], float], right: bool = False
+) -> Symbol:
+    return Symbol(OPERATOR, 2, precedence, right, implementation, 0.0)
+
+
+def _comparison(test: Callable[[float, float], bool]) -> Symbol:
+    """
+    Оператор сравнения: результат 1.0, если условие выполнено, иначе 0.0.
+
+    Raises:
+        ValueError: При сравнении на < или > комплексного числа
+    """
+
+    def compare(a: float, b: float) -> float:
+        try:
+            return 1.0 if test(a, b) else 0.0
+        except TypeError:
+            raise ValueError("Комплексные числа нельзя сравнивать") from None
+
+    return _operator(COMPARISON_PRECEDENCE, compare)
+
+
+# Таблица всех символов: имя -> описание. Операторы фиксированы,
+# функции и константы можно добавлять через register_function и
+# register_constant. Чтение одного ключа (SYMBOLS.get, SYMBOLS[name])
+# не блокируется: оно атомарно и в сборке без GIL. Перебор таблицы может
+# столкнуться с регистрацией в другом потоке, поэтому перебирать нужно
+# копию из snapshot()
+SYMBOLS: dict[str, Symbol] = {
+    "<": _comparison(operator.lt),
+    ">": _comparison(operator.gt),
+    "<=": _comparison(operator.le),
+    ">=": _comparison(operator.ge),
+    "==": _comparison(operator.eq),
+    "!=": _comparison(operator.ne),
+    "+": _operator(1, operator.add),
+    "-": _operator(1, operator.sub),
+    "*": _operator(2, operator.mul),
+    "/": _operator(2, _divide),
+    "^": _operator(3, operator.pow, right=True),
+    "sin": Symbol(FUNCTION, 1, FUNCTION_PRECEDENCE, False, math.sin, 0.0),
+    "pi": Symbol(CONSTANT, 0, 0, False, None, math.pi),
+}
+
+# Односимвольные операторы и двухсимвольные операторы сравнения — для
+# токенизатора
+OPERATOR_CHARS = frozenset(
+    name for name, symbol in SYMBOLS.items() if symbol.kind == OPERATOR and len(name) == 1
+)
+TWO_CHAR_OPERATORS = frozenset(
+    name for name, symbol in SYMBOLS.items() if symbol.kind == OPERATOR and len(name) == 2
+)
+
+# Изменения реестра из разных потоков выполняются по очереди: проверка
+# имени и запись не должны разделяться записью другого потока
+_LOCK = threading.Lock()
+# Номер изменения реестра; увеличивается при каждой регистрации и удалении
+_version = 0
+
+
+def _check_name(name: str) -> None:
+    """
+    Проверяет, что имя можно зарегистрировать как функцию или константу.
+
+    Raises:
+        ValueError: Если имя не является идентификатором из букв или
+                   совпадает с оператором или условной функцией if
+    """
+    if not name.isalpha():
+        raise ValueError(f"Некорректное имя: {name}")
+    if name == CONDITIONAL:
+        raise ValueError(f"Имя занято условной функцией: {name}")
+    symbol = SYMBOLS.get(name)
+    if symbol is not None and symbol.kind == OPERATOR:
+        raise ValueError(f"Имя занято оператором: {name}")
+
+
+def register_function(
+    name: str, implementation: Callable[..., float], arity: int = 1
+) -> None:
+    """
+    Регистрирует функцию, доступную в выражениях.
+
+    Функции с несколькими аргументами записываются через запятую:
+    max(1, 2). Повторная регистрация заменяет прежнюю функцию.
+
+    Args:
+        name: Имя функции (только буквы)
+        implementation: Функция Python от arity вещественных аргументов
+        arity: Количество аргументов
+
+    Raises:
+        ValueError: При некорректном имени или количестве аргументов
+    """
+    if arity < 1:
+        raise ValueError("Функция должна принимать хотя бы один аргумент")
+    with _LOCK:
+        _check_name(name)
+        SYMBOLS[name] = Symbol(
+            FUNCTION, arity, FUNCTION_PRECEDENCE, False, implementation, 0.0
+        )
+        _changed()
+
+
+def register_constant(name: str, value: float) -> None:
+    """
+    Регистрирует константу, доступную в выражениях.
+
+    Args:
+        name: Имя константы (только буквы)
+        value: Значение константы
+
+    Raises:
+        ValueError: При некорректном имени
+    """
+    with _LOCK:
+        _check_name(name)
+        SYMBOLS[name] = Symbol(CONSTANT, 0, 0, False, None, float(value))
+        _changed()
+
+
+def unregister(name: str) -> None:
+    """
+    Удаляет функцию или константу.
+
+    Args:
+        name: Имя функции или константы
+
+    Raises:
+        ValueError: Если имя не зарегистрировано или является оператором
+    """
+    with _LOCK:
+        symbol = SYMBOLS.get(name)
+        if symbol is None or symbol.kind == OPERATOR:
+            raise ValueError(f"Неизвестная функция или константа: {name}")
+        del SYMBOLS[name]
+        _changed()
+
+
+def _changed() -> None:
+    """Отмечает изменение реестра; вызывается под _LOCK."""
+    global _version
+    _version += 1
+
+
+def snapshot() -> dict[str, Symbol]:
+    """
+    Возвращает копию таблицы символов, снятую под блокировкой реестра.
+
+    Копию можно перебирать, пока другие потоки регистрируют и удаляют
+    функции и константы.
+
+    Returns:
+        Копия SYMBOLS
+    """
+    with _LOCK:
+        return dict(SYMBOLS)
+
+
+def version() -> int:
+    """
+    Возвращает номер изменения реестра.
+
+    Номер увеличивается при каждой регистрации и удалении функции или
+    константы, поэтому по нему кэши узнают, что разобранные раньше
+    выражения могли устареть.
+
+    Returns:
+        Номер изменения реестра
+    """
+    return _version
+
+
+def lookup(token: str) -> Optional[Symbol]:
+    """
+    Возвращает описание символа.
+
+    Args:
+        token: Токен
+
+    Returns:
+        Описание символа или None, если токен не является оператором,
+        функцией или константой
+    """
+    return SYMBOLS.get(token)
+
+
+def get_precedence(operator: str) -> int:
+    """
+    Возвращает приоритет оператора или функции.
+
+    Args:
+        operator: Оператор (+, -, *, /, ^, сравнение) или функция (sin)
+
+    Returns:
+        Приоритет оператора (0 для сравнений, 1 для +, -, 2 для *, /, 3 для
+        ^, 4 для функций)
+    """
+    symbol = SYMBOLS.get(operator)
+    return symbol.precedence if symbol is not None else 0
+
+
+def is_operator(token: str) -> bool:
+    """
+    Проверяет, является ли токен оператором.
+
+    Args:
+        token: Токен для проверки
+
+    Returns:
+        True, если токен является оператором
+    """
+    symbol = SYMBOLS.get(token)
+    return symbol is not None and symbol.kind == OPERATOR
+
+
+def is_right_associative(operator: str) -> bool:
+    """
+    Проверяет, является ли оператор правоассоциативным.
+
+    Args:
+        operator: Оператор для проверки
+
+    Returns:
+        True, если оператор правоассоциативен (^)
+    """
+    symbol = SYMBOLS.get(operator)
+    return symbol is not None and symbol.right_associative
+
+
+def is_function(token: str) -> bool:
+    """
+    Проверяет, является ли токен функцией.
+
+    Args:
+        token: Токен для проверки
+
+    Returns:
+        True, если токен является функцией (sin или зарегистрированной)
+    """
+    symbol = SYMBOLS.get(token)
+    return symbol is not None and symbol.kind == FUNCTION
+
+
+def is_constant(token: str) -> bool:
+    """
+    Проверяет, является ли токен константой.
+
+    Args:
+        token: Токен для проверки
+
+    Returns:
+        True, если токен является константой (pi или зарегистрированной)
+    """
+    symbol = SYMBOLS.get(token)
+    return symbol is not None and symbol.kind == CONSTANT
+
+
+def is_number(token: str) -> bool:
+    """
+    Проверяет, является ли токен числом.
+
+    Числом считается целое число, десятичная дробь или экспоненциальная
+    запись, в том числе со знаком минус (в ПОЛИЗ).
+
+    Args:
+        token: Токен для проверки
+
+    Returns:
+        True, если токен является числом
+    """
+    return token.isdigit() or _NUMBER.fullmatch(token) is not None
+
+
+def is_jump(token: str) -> bool:
+    """
+    Проверяет, является ли токен переходом ПОЛИЗ (?n или :n).
+
+    Args:
+        token: Токен для проверки
+
+    Returns:
+        True, если токен является переходом
+    """
+    return token[:1] in (JUMP_IF_ZERO, JUMP) and token[1:].isdigit()
+
+
+def conditional_rpn(
+    condition: list[str], then: list[str], otherwise: list[str]
+) -> list[str]:
+    """
+    Записывает условную функцию if в ПОЛИЗ с переходами.
+
+    Args:
+        condition: ПОЛИЗ условия
+        then: ПОЛИЗ значения при ненулевом условии
+        otherwise: ПОЛИЗ значения при нулевом условии
+
+    Returns:
+        ПОЛИЗ вида condition ?n then :m otherwise
+    """
+    return [
+        *condition,
+        f"{JUMP_IF_ZERO}{len(then) + 1}",
+        *then,
+        f"{JUMP}{len(otherwise)}",
+        *otherwise,
+    ]
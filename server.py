@@ -0,0 +1,204 @@
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import stream
+from calc import evaluate_rpn
+from calculator import calculate
+
+# Максимальная длина одного запроса в байтах
+MAX_REQUEST_SIZE = 1 << 20
+
+# Количество одновременно обслуживаемых соединений по умолчанию
+DEFAULT_MAX_CONNECTIONS = 1024
+
+# Через сколько запросов подряд соединение уступает очередь другим клиентам
+_FAIRNESS_BATCH = 64
+
+# Запросы длиннее этого размера в байтах вычисляются в пуле потоков, чтобы
+# не останавливать цикл событий; короткие быстрее вычислить на месте, чем
+# передать в пул
+OFFLOAD_SIZE = 4096
+
+# Ответ на запрос длиннее MAX_REQUEST_SIZE, после него соединение закрывается
+_TOO_LONG = (
+    json.dumps({"error": "Запрос слишком длинный"}, ensure_ascii=False) + "\n"
+).encode()
+
+
+def handle_request(line: bytes) -> bytes:
+    """
+    Обрабатывает один запрос протокола.
+
+    Запрос — объект JSON в одной строке: {"expression": "3 + 4"} для
+    инфиксной записи или {"expression": "3 4 +", "rpn": true} для ПОЛИЗ.
+    Ответ содержит все поля запроса и поле "result" с результатом или поле
+    "error" с текстом ошибки.
+
+    Args:
+        line: Строка запроса
+
+    Returns:
+        Строка ответа с символом перевода строки на конце
+    """
+    record = stream.parse_record(line)
+    handler = evaluate_rpn if record.get("rpn") else calculate
+    stream.evaluate_record(record, handler, "result")
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode()
+
+
+class CalculatorServer:
+    """
+    Асинхронный сервер вычисления выражений.
+
+    Клиент может отправлять запросы друг за другом, не дожидаясь ответов:
+    ответы приходят в порядке запросов. Если клиент не читает ответы,
+    сервер перестает читать его запросы (writer.drain), поэтому память на
+    соединение ограничена. Количество одновременно обслуживаемых соединений
+    ограничено max_connections, остальные ждут своей очереди.
+
+    Запросы длиннее OFFLOAD_SIZE вычисляются в пуле потоков: пока длинное
+    выражение вычисляется, цикл событий обслуживает остальные соединения.
+    При GIL потоки пула и цикл событий выполняются по очереди, поэтому
+    длинные выражения не вычисляются быстрее, но и не задерживают короткие.
+    """
+
+    def __init__(
+        self, max_connections: int = DEFAULT_MAX_CONNECTIONS, workers: Optional[int] = None
+    ) -> None:
+        """
+        Args:
+            max_connections: Количество одновременно обслуживаемых соединений
+            workers: Количество потоков для длинных запросов (по умолчанию
+                     выбирает ThreadPoolExecutor)
+        """
+        self._slots = asyncio.Semaphore(max_connections)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._executor = ThreadPoolExecutor(workers)
+        self.requests = 0
+
+    async def start_unix(self, path: str) -> None:
+        """
+        Начинает принимать соединения на Unix-сокете.
+
+        Args:
+            path: Путь к сокету
+        """
+        self._server = await asyncio.start_unix_server(
+            self._serve, path, limit=MAX_REQUEST_SIZE
+        )
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """
+        Начинает принимать TCP-соединения.
+
+        Args:
+            host: Адрес
+            port: Порт (0 — выбрать свободный)
+
+        Returns:
+            Номер порта
+        """
+        self._server = await asyncio.start_server(
+            self._serve, host, port, limit=MAX_REQUEST_SIZE
+        )
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Обслуживает соединения до отмены."""
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Прекращает прием соединений и останавливает пул потоков."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        async with self._slots:
+            handled = 0
+            try:
+                while True:
+                    try:
+                        line = await reader.readuntil(b"\n")
+                    except asyncio.IncompleteReadError as e:
+                        line = e.partial
+                        if not line.strip():
+                            break
+                    except asyncio.LimitOverrunError:
+                        writer.write(_TOO_LONG)
+                        break
+                    if line.strip():
+                        self.requests += 1
+                        handled += 1
+                        if len(line) > OFFLOAD_SIZE:
+                            response = await asyncio.get_running_loop().run_in_executor(
+                                self._executor, handle_request, line
+                            )
+                        else:
+                            response = handle_request(line)
+                        writer.write(response)
+                        await writer.drain()
+                        # Запросы из буфера читаются без ожидания, поэтому
+                        # клиент с длинным конвейером не должен задерживать
+                        # остальных
+                        if handled % _FAIRNESS_BATCH == 0:
+                            await asyncio.sleep(0)
+                    if reader.at_eof():
+                        break
+            except ConnectionError:
+                pass
+            finally:
+                writer.close()
+                try:
+                    await writer.wait_closed()
+                except ConnectionError:
+                    pass
+
+
+async def _main(args: argparse.Namespace) -> None:
+    server = CalculatorServer(args.max_connections, args.workers)
+    if args.unix:
+        await server.start_unix(args.unix)
+        print(f"Сервер слушает {args.unix}", file=sys.stderr)
+    else:
+        port = await server.start_tcp(args.host, args.port)
+        print(f"Сервер слушает {args.host}:{port}", file=sys.stderr)
+    await server.serve_forever()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Сервер вычисления выражений по протоколу JSON-строк."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--unix", help="путь к Unix-сокету")
+    parser.add_argument("--host", default="127.0.0.1", help="адрес TCP")
+    parser.add_argument("--port", type=int, default=8765, help="порт TCP")
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=DEFAULT_MAX_CONNECTIONS,
+        help="количество одновременно обслуживаемых соединений",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="количество потоков для длинных запросов",
+    )
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
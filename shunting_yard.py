@@ -1,119 +1,267 @@
-def tokenize(expression: str) -> list[str]:
+import re
+from collections.abc import Collection, Iterable, Iterator
+from typing import Optional, Union
+
+# Проверки видов токенов определены в registry и доступны отсюда,
+# как и раньше
+from registry import (
+    CONDITIONAL,
+    CONDITIONAL_ARITY,
+    CONSTANT,
+    FUNCTION,
+    NUMBER_SUFFIX_PATTERN,
+    OPERATOR,
+    OPERATOR_CHARS,
+    SYMBOLS,
+    TWO_CHAR_OPERATORS,
+    conditional_rpn,
+    get_precedence,
+    is_constant,
+    is_function,
+    is_number,
+    is_operator,
+    is_right_associative,
+)
+import limits as _limits
+import stats as _stats
+from tokens import COMMA, NUMBER, PARENTHESIS, VARIABLE, Token
+
+# Односимвольные токены: операторы, скобки и разделитель аргументов функций
+_SINGLE_CHAR_TOKENS = OPERATOR_CHARS | frozenset("(),")
+
+# Символы, с которых начинаются двухсимвольные операторы (<=, ==, ...);
+# оператор выделяется целиком, если следующий символ его продолжает
+_TWO_CHAR_STARTS = frozenset(name[0] for name in TWO_CHAR_OPERATORS)
+
+# Дробная часть и порядок числа разбираются регулярным выражением, только
+# если за цифрами идет один из этих символов
+_NUMBER_SUFFIX_CHARS = frozenset(".eE")
+_match_number_suffix = re.compile(NUMBER_SUFFIX_PATTERN).match
+
+
+def tokenize(
+    expression: str,
+    stats: Optional[_stats.Stats] = None,
+    limits: Optional[_limits.Limits] = None,
+) -> list[str]:
     """
     Парсит входную строку в список токенов.
 
     Поддерживает оба формата: с пробелами и без пробелов.
-    Обрабатывает целые числа, операторы: +, -, *, /, ^, функции (sin),
-    константы (pi) и круглые скобки: (, ).
+    Обрабатывает числа (12, 1.5, 1.5e-3), операторы: +, -, *, /, ^,
+    сравнения: <, >, <=, >=, ==, !=, функции (sin, if), константы (pi),
+    круглые скобки: (, ) и запятые между аргументами функций.
 
     Args:
         expression: Арифметическое выражение в виде строки
+        stats: Статистика, в которую записываются время и виды токенов
+        limits: Ограничения длины, количества токенов, вложенности и времени
 
     Returns:
         Список токенов (числа, операторы, функции, константы, скобки)
+
+    Raises:
+        ValueError: При неизвестном символе
+        LimitExceeded: При превышении ограничения
+    """
+    if stats is None and limits is None:
+        return list(iter_tokens(expression))
+    tokens = _limited_tokens(expression, limits)
+    if stats is None:
+        return list(tokens)
+    with stats.phase(_stats.TOKENIZE):
+        tokens = list(tokens)
+    stats.tokens.update(map(_stats.token_kind, tokens))
+    return tokens
+
+
+def _limited_tokens(
+    expression: str, limits: Optional[_limits.Limits]
+) -> Iterator[str]:
+    """Итератор токенов, проверяющий ограничения, если они заданы."""
+    if limits is None:
+        return iter_tokens(expression)
+    limits.check_length(expression)
+    return limits.infix_tokens(iter_tokens(expression))
+
+
+def iter_tokens(expression: str) -> Iterator[str]:
+    """
+    Лениво разбивает входную строку на токены.
+
+    Числа и идентификаторы выделяются срезом строки по найденным границам,
+    поэтому время работы линейно зависит от длины выражения.
+
+    Args:
+        expression: Арифметическое выражение в виде строки
+
+    Returns:
+        Итератор токенов (числа, операторы, функции, константы, скобки)
+
+    Raises:
+        ValueError: При неизвестном символе
     """
-    tokens: list[str] = []
     i = 0
+    length = len(expression)
 
-    while i < len(expression):
+    while i < length:
         char = expression[i]
 
         if char.isspace():
             i += 1
             continue
 
-        if char in "()+-*/^":
-            tokens.append(char)
-            i += 1
-        elif char.isdigit():
-            num_str = ""
-            while i < len(expression) and expression[i].isdigit():
-                num_str += expression[i]
+        if char in _SINGLE_CHAR_TOKENS:
+            if char in _TWO_CHAR_STARTS and expression[i:i + 2] in TWO_CHAR_OPERATORS:
+                yield expression[i:i + 2]
+                i += 2
+            else:
+                yield char
                 i += 1
-            tokens.append(num_str)
+        elif char.isdigit():
+            end = i + 1
+            while end < length and expression[end].isdigit():
+                end += 1
+            if end < length and expression[end] in _NUMBER_SUFFIX_CHARS:
+                end = _match_number_suffix(expression, end).end()
+            yield expression[i:end]
+            i = end
         elif char.isalpha():
-            identifier = ""
-            while i < len(expression) and expression[i].isalpha():
-                identifier += expression[i]
-                i += 1
-            tokens.append(identifier)
+            end = i + 1
+            while end < length and expression[end].isalpha():
+                end += 1
+            yield expression[i:end]
+            i = end
+        elif expression[i:i + 2] in TWO_CHAR_OPERATORS:
+            yield expression[i:i + 2]
+            i += 2
         else:
             raise ValueError(f"Неизвестный символ: {char}")
 
-    return tokens
-
 
-def get_precedence(operator: str) -> int:
-    """
-    Возвращает приоритет оператора или функции.
+# Символы, которые не могут входить в многосимвольные токены: по ним можно
+# безопасно разрезать поток входных данных
+_CHUNK_BOUNDARY_CHARS = _SINGLE_CHAR_TOKENS - frozenset("".join(TWO_CHAR_OPERATORS))
 
-    Args:
-        operator: Оператор (+, -, *, /, ^) или функция (sin)
 
-    Returns:
-        Приоритет оператора (1 для +, -, 2 для *, /, 3 для ^, 4 для функций)
+def iter_tokens_chunked(chunks: Iterable[str]) -> Iterator[str]:
     """
-    if is_function(operator):
-        return 4
-    elif operator == "^":
-        return 3
-    elif operator in ("*", "/"):
-        return 2
-    elif operator in ("+", "-"):
-        return 1
-    return 0
-
+    Лениво разбивает на токены выражение, поступающее частями.
 
-def is_operator(token: str) -> bool:
-    """
-    Проверяет, является ли токен оператором.
+    Позволяет разбирать выражения, которые не помещаются в память целиком
+    (например, читаемые из файла блоками). Каждая часть разбирается до
+    последнего пробела, оператора, скобки или запятой (кроме знака порядка
+    числа, как в 1.5e-3), остаток переносится в следующую часть, поэтому
+    токены на стыке частей не разрываются.
 
     Args:
-        token: Токен для проверки
+        chunks: Части выражения в порядке следования
 
     Returns:
-        True, если токен является оператором
-    """
-    return token in ("+", "-", "*", "/", "^")
-
+        Итератор токенов
 
-def is_right_associative(operator: str) -> bool:
+    Raises:
+        ValueError: При неизвестном символе
     """
-    Проверяет, является ли оператор правоассоциативным.
-
-    Args:
-        operator: Оператор для проверки
-
-    Returns:
-        True, если оператор правоассоциативен (^)
+    tail = ""
+    for chunk in chunks:
+        buffer = tail + chunk
+        cut = len(buffer)
+        while cut > 0 and not (
+            (buffer[cut - 1].isspace() or buffer[cut - 1] in _CHUNK_BOUNDARY_CHARS)
+            and not is_exponent_sign(buffer, cut - 1)
+        ):
+            cut -= 1
+        yield from iter_tokens(buffer[:cut])
+        tail = buffer[cut:]
+    yield from iter_tokens(tail)
+
+
+def is_exponent_sign(text: str, index: int) -> bool:
+    """Проверяет, является ли символ text[index] знаком порядка числа, как в 1.5e-3."""
+    return (
+        text[index] in "+-"
+        and index >= 2
+        and text[index - 1] in "eE"
+        and text[index - 2].isdigit()
+    )
+
+
+def tokenize_typed(expression: str) -> list[Token]:
     """
-    return operator == "^"
-
+    Парсит входную строку в список типизированных токенов.
 
-def is_function(token: str) -> bool:
-    """
-    Проверяет, является ли токен функцией.
+    Разбивает выражение так же, как tokenize, но каждый токен сразу
+    получает вид, позицию в выражении, значение числа или константы и
+    описание символа из реестра. Результат передается в
+    shunting_yard_typed и затем в calc.evaluate_typed.
 
     Args:
-        token: Токен для проверки
+        expression: Арифметическое выражение в виде строки
 
     Returns:
-        True, если токен является функцией (sin)
+        Список токенов Token
+
+    Raises:
+        ValueError: При неизвестном символе
     """
-    return token == "sin"
+    tokens: list[Token] = []
+    append = tokens.append
+    symbols = SYMBOLS
+    i = 0
+    length = len(expression)
 
+    while i < length:
+        char = expression[i]
 
-def is_constant(token: str) -> bool:
-    """
-    Проверяет, является ли токен константой.
+        if char.isspace():
+            i += 1
+            continue
 
-    Args:
-        token: Токен для проверки
+        if char in _SINGLE_CHAR_TOKENS:
+            if char in _TWO_CHAR_STARTS and expression[i:i + 2] in TWO_CHAR_OPERATORS:
+                text = expression[i:i + 2]
+                append(Token(OPERATOR, text, i, None, symbols[text]))
+                i += 2
+                continue
+            symbol = symbols.get(char)
+            if symbol is not None:
+                append(Token(OPERATOR, char, i, None, symbol))
+            elif char == ",":
+                append(Token(COMMA, char, i))
+            else:
+                append(Token(PARENTHESIS, char, i))
+            i += 1
+            continue
 
-    Returns:
-        True, если токен является константой (pi)
-    """
-    return token == "pi"
+        end = i + 1
+        if char.isdigit():
+            while end < length and expression[end].isdigit():
+                end += 1
+            if end < length and expression[end] in _NUMBER_SUFFIX_CHARS:
+                end = _match_number_suffix(expression, end).end()
+            text = expression[i:end]
+            append(Token(NUMBER, text, i, float(text)))
+        elif char.isalpha():
+            while end < length and expression[end].isalpha():
+                end += 1
+            text = expression[i:end]
+            symbol = symbols.get(text)
+            if symbol is None:
+                append(Token(VARIABLE, text, i))
+            elif symbol.kind == CONSTANT:
+                append(Token(CONSTANT, text, i, symbol.value, symbol))
+            else:
+                append(Token(symbol.kind, text, i, None, symbol))
+        elif expression[i:i + 2] in TWO_CHAR_OPERATORS:
+            end = i + 2
+            text = expression[i:end]
+            append(Token(OPERATOR, text, i, None, symbols[text]))
+        else:
+            raise ValueError(f"Неизвестный символ: {char}")
+        i = end
+
+    return tokens
 
 
 def is_left_parenthesis(token: str) -> bool:
@@ -142,80 +290,362 @@ def is_right_parenthesis(token: str) -> bool:
     return token == ")"
 
 
-def shunting_yard(expression: str) -> list[str]:
+def shunting_yard(
+    expression: str,
+    variables: Collection[str] = (),
+    stats: Optional[_stats.Stats] = None,
+    limits: Optional[_limits.Limits] = None,
+) -> list[str]:
     """
     Преобразует арифметическое выражение в инфиксной записи в обратную польскую нотацию (ПОЛИЗ).
 
     Реализует алгоритм сортировочной станции (Shunting Yard).
-    Поддерживает целые числа, операции +, -, *, /, ^, функции (sin),
-    константы (pi) и круглые скобки.
+    Поддерживает числа, операции +, -, *, /, ^, сравнения <, >, <=, >=, ==,
+    !=, функции (sin), константы (pi), переменные и круглые скобки.
+    Условная функция if(условие, значение, иначе) записывается переходами
+    (см. registry.conditional_rpn), поэтому при вычислении выполняется
+    только выбранная ветвь. Если if передано в variables, это имя
+    переменной, а не условная функция.
 
     Args:
         expression: Арифметическое выражение в инфиксной записи
+        variables: Имена переменных, допустимых в выражении
+        stats: Статистика, в которую записываются время фаз tokenize и
+               shunting_yard и глубина стека операторов
+        limits: Ограничения длины, количества токенов, вложенности и времени
 
     Returns:
         Список токенов в обратной польской нотации
+
+    Raises:
+        ValueError: При ошибке разбора
+        LimitExceeded: При превышении ограничения
     """
-    tokens = tokenize(expression)
-    output: list[str] = []
-    operator_stack: list[str] = []
+    if stats is None:
+        return list(
+            iter_shunting_yard(_limited_tokens(expression, limits), variables)
+        )
+    tokens = tokenize(expression, stats, limits)
+    with stats.phase(_stats.SHUNTING_YARD):
+        return list(iter_shunting_yard(tokens, variables, stats))
+
+
+def iter_shunting_yard(
+    tokens: Iterable[str],
+    variables: Collection[str] = (),
+    stats: Optional[_stats.Stats] = None,
+) -> Iterator[str]:
+    """
+    Лениво преобразует поток токенов инфиксной записи в поток токенов ПОЛИЗ.
+
+    Токены выдаются по мере готовности, поэтому объем памяти определяется
+    глубиной стека операторов, а не длиной выражения. ПОЛИЗ условной функции
+    if выдается после ее закрывающей скобки: длины ветвей нужны для
+    переходов.
+
+    Args:
+        tokens: Токены выражения в инфиксной записи
+        variables: Имена переменных, допустимых в выражении
+        stats: Статистика, в которую записывается глубина стека операторов
+
+    Returns:
+        Итератор токенов в обратной польской нотации
+
+    Raises:
+        ValueError: При неизвестной функции или константе или некорректном
+                   вызове if
+    """
+    operator_stack: list[str] = [] if stats is None else stats.operator_stack()
+    symbols = SYMBOLS
+    # Аргументы условной функции читаются из того же итератора
+    tokens = iter(tokens)
 
     for token in tokens:
-        if token.isdigit():
-            output.append(token)
-        elif is_constant(token):
-            output.append(token)
-        elif is_left_parenthesis(token):
-            operator_stack.append(token)
-        elif is_right_parenthesis(token):
-            while operator_stack and not is_left_parenthesis(operator_stack[-1]):
-                output.append(operator_stack.pop())
-            if operator_stack:
-                operator_stack.pop()
-            # Если на вершине стека функция, переносим её в выход
-            if operator_stack and is_function(operator_stack[-1]):
-                output.append(operator_stack.pop())
-        elif is_function(token):
+        symbol = symbols.get(token)
+        if symbol is None:
+            if token.isdigit() or token in variables:
+                yield token
+            elif token == CONDITIONAL:
+                # Условная функция — операнд: ее ПОЛИЗ с переходами выдается целиком
+                yield from _conditional(tokens, variables, operator_stack)
+            elif is_left_parenthesis(token):
+                operator_stack.append(token)
+            elif is_right_parenthesis(token):
+                while operator_stack and not is_left_parenthesis(operator_stack[-1]):
+                    yield operator_stack.pop()
+                if operator_stack:
+                    operator_stack.pop()
+                # Если на вершине стека функция, переносим её в выход
+                if operator_stack and is_function(operator_stack[-1]):
+                    yield operator_stack.pop()
+            elif token == ",":
+                # Разделитель аргументов: выталкиваем операторы до скобки функции
+                while operator_stack and not is_left_parenthesis(operator_stack[-1]):
+                    yield operator_stack.pop()
+            elif token.isalpha():
+                raise ValueError(f"Неизвестная функция или константа: {token}")
+            elif is_number(token):
+                yield token
+        elif symbol.kind == CONSTANT:
+            yield token
+        elif symbol.kind == FUNCTION:
             operator_stack.append(token)
-        elif is_operator(token):
+        else:
             # Для правоассоциативных операторов (^) используем < вместо <=
             # Для левоассоциативных операторов используем <=
-            while (
-                operator_stack
-                and not is_left_parenthesis(operator_stack[-1])
-                and not is_function(operator_stack[-1])
-                and (
-                    get_precedence(token) < get_precedence(operator_stack[-1])
-                    if is_right_associative(token)
-                    else get_precedence(token) <= get_precedence(operator_stack[-1])
-                )
-            ):
+            precedence = symbol.precedence
+            right = symbol.right_associative
+            while operator_stack:
+                top = symbols.get(operator_stack[-1])
+                if (
+                    top is None
+                    or top.kind == FUNCTION
+                    or precedence > top.precedence
+                    or (right and precedence == top.precedence)
+                ):
+                    break
+                yield operator_stack.pop()
+            operator_stack.append(token)
+
+    while operator_stack:
+        yield operator_stack.pop()
+
+
+def _conditional(
+    tokens: Iterator[str], variables: Collection[str], operator_stack: list[str]
+) -> list[str]:
+    """
+    Преобразует вызов условной функции if, следующий за токеном if.
+
+    Разбор идет тем же алгоритмом, что и в iter_shunting_yard, но токены
+    ПОЛИЗ накапливаются в буфере. Скобка if остается в стеке операторов, а
+    при каждой запятой if запоминается длина буфера; на закрывающей скобке
+    аргументы в конце буфера переписываются с переходами
+    (registry.conditional_rpn). Вложенные if обрабатываются тем же стеком
+    без рекурсии. Если выражение кончается раньше закрывающей скобки, if
+    завершается в конце выражения.
+
+    Args:
+        tokens: Токены, следующие за if
+        variables: Имена переменных, допустимых в выражении
+        operator_stack: Стек операторов iter_shunting_yard
+
+    Returns:
+        ПОЛИЗ вызова с переходами
+
+    Raises:
+        ValueError: При неизвестной функции или константе, если после if
+                   нет "(" или аргументов не три
+    """
+    symbols = SYMBOLS
+    output: list[str] = []
+    emit = output.append
+    # Открытые if: [высота стека операторов со скобкой if, начало условия в
+    # output, длины output в конце аргументов]
+    conditionals: list[list] = []
+    token = CONDITIONAL
+
+    while True:
+        if token == CONDITIONAL and token not in variables:
+            if next(tokens, None) != "(":
+                raise ValueError(f"После функции {CONDITIONAL} ожидается (")
+            operator_stack.append(CONDITIONAL)
+            operator_stack.append("(")
+            conditionals.append([len(operator_stack), len(output), []])
+        else:
+            symbol = symbols.get(token)
+            if symbol is None:
+                if token.isdigit() or token in variables:
+                    emit(token)
+                elif is_left_parenthesis(token):
+                    operator_stack.append(token)
+                elif is_right_parenthesis(token):
+                    while not is_left_parenthesis(operator_stack[-1]):
+                        emit(operator_stack.pop())
+                    if len(operator_stack) == conditionals[-1][0]:
+                        del operator_stack[-2:]
+                        _close_conditional(conditionals.pop(), output)
+                        if not conditionals:
+                            return output
+                    else:
+                        operator_stack.pop()
+                        if is_function(operator_stack[-1]):
+                            emit(operator_stack.pop())
+                elif token == ",":
+                    while not is_left_parenthesis(operator_stack[-1]):
+                        emit(operator_stack.pop())
+                    if len(operator_stack) == conditionals[-1][0]:
+                        conditionals[-1][2].append(len(output))
+                elif token.isalpha():
+                    raise ValueError(f"Неизвестная функция или константа: {token}")
+                elif is_number(token):
+                    emit(token)
+            elif symbol.kind == CONSTANT:
+                emit(token)
+            elif symbol.kind == FUNCTION:
+                operator_stack.append(token)
+            else:
+                precedence = symbol.precedence
+                right = symbol.right_associative
+                while True:
+                    top = symbols.get(operator_stack[-1])
+                    if (
+                        top is None
+                        or top.kind == FUNCTION
+                        or precedence > top.precedence
+                        or (right and precedence == top.precedence)
+                    ):
+                        break
+                    emit(operator_stack.pop())
+                operator_stack.append(token)
+
+        token = next(tokens, None)
+        if token is None:
+            break
+
+    # Выражение кончилось внутри if: незакрытые if завершаются
+    while conditionals:
+        while len(operator_stack) > conditionals[-1][0]:
+            emit(operator_stack.pop())
+        del operator_stack[-2:]
+        _close_conditional(conditionals.pop(), output)
+    return output
+
+
+def _close_conditional(conditional: list, output: list[str]) -> None:
+    """
+    Переписывает аргументы закрытого if в конце output в ПОЛИЗ с переходами.
+
+    Args:
+        conditional: Открытый if: высота стека, начало условия в output и
+                     длины output в конце аргументов
+        output: Буфер токенов ПОЛИЗ
+
+    Raises:
+        ValueError: Если аргументов не три
+    """
+    _, start, marks = conditional
+    if len(marks) != CONDITIONAL_ARITY - 1:
+        raise ValueError(
+            f"Функция {CONDITIONAL} ожидает аргументов: {CONDITIONAL_ARITY}, "
+            f"передано: {len(marks) + 1}"
+        )
+    middle, end = marks
+    output[start:] = conditional_rpn(output[start:middle], output[middle:end], output[end:])
+
+
+def shunting_yard_typed(
+    tokens: Union[str, Iterable[Token]], variables: Collection[str] = ()
+) -> list[Token]:
+    """
+    Преобразует типизированные токены инфиксной записи в ПОЛИЗ.
+
+    Работает как shunting_yard, но вид и приоритет каждого токена берутся
+    из самого токена, без поиска в реестре. Выходные токены — те же
+    объекты, что на входе.
+
+    Args:
+        tokens: Результат tokenize_typed или выражение в инфиксной записи
+        variables: Имена переменных, допустимых в выражении
+
+    Returns:
+        Список токенов Token в обратной польской нотации
+
+    Raises:
+        ValueError: При неизвестном символе, функции или константе
+    """
+    if isinstance(tokens, str):
+        tokens = tokenize_typed(tokens)
+    output: list[Token] = []
+    operator_stack: list[Token] = []
+
+    for token in tokens:
+        kind = token.kind
+        if kind == NUMBER or kind == CONSTANT:
+            output.append(token)
+        elif kind == OPERATOR:
+            precedence = token.symbol.precedence
+            right = token.symbol.right_associative
+            while operator_stack:
+                top = operator_stack[-1]
+                if (
+                    top.kind != OPERATOR
+                    or precedence > top.symbol.precedence
+                    or (right and precedence == top.symbol.precedence)
+                ):
+                    break
                 output.append(operator_stack.pop())
             operator_stack.append(token)
+        elif kind == VARIABLE:
+            if token.text not in variables:
+                raise ValueError(f"Неизвестная функция или константа: {token.text}")
+            output.append(token)
+        elif kind == FUNCTION or token.text == "(":
+            operator_stack.append(token)
         else:
-            # Неизвестный идентификатор
-            if token.isalpha():
-                raise ValueError(f"Неизвестная функция или константа: {token}")
+            # Закрывающая скобка или запятая: выталкиваем операторы до скобки
+            while operator_stack and operator_stack[-1].text != "(":
+                output.append(operator_stack.pop())
+            if token.text == ")":
+                if operator_stack:
+                    operator_stack.pop()
+                if operator_stack and operator_stack[-1].kind == FUNCTION:
+                    output.append(operator_stack.pop())
 
     while operator_stack:
         output.append(operator_stack.pop())
-
     return output
 
 
-def main() -> None:
+def _rpn_text(
+    expression: str, stats: Optional[_stats.Stats] = None, strict: bool = False
+) -> str:
+    """Преобразует выражение в строку ПОЛИЗ для вывода CLI."""
+    if strict:
+        from validation import strict_shunting_yard
+
+        return " ".join(strict_shunting_yard(expression))
+    return " ".join(shunting_yard(expression, stats=stats))
+
+
+def main(argv: Optional[list[str]] = None) -> None:
     """CLI интерфейс для преобразования выражений в обратную польскую нотацию."""
+    import argparse
+    import functools
     import sys
 
+    import stream
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    stream.add_arguments(parser)
+    _stats.add_argument(parser)
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="отклонять некорректные выражения с указанием позиции ошибки",
+    )
+    args = parser.parse_args(argv)
+    if args.stats and args.workers > 1:
+        parser.error("--stats несовместим с --workers больше 1")
+    if args.stats and args.strict:
+        parser.error("--stats несовместим с --strict")
+    stats = _stats.Stats() if args.stats else None
+    handler = functools.partial(_rpn_text, stats=stats, strict=args.strict)
+
     try:
+        if stream.run(args, handler, "rpn"):
+            return
+
         expression = sys.stdin.read().strip()
         if not expression:
             return
-        result = shunting_yard(expression)
-        print(" ".join(result))
+        print(handler(expression))
     except ValueError as e:
         print(f"Ошибка: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if stats is not None:
+            print(stats.report(), file=sys.stderr)
 
 
 if __name__ == "__main__":
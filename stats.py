@@ -0,0 +1,171 @@
+import argparse
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from registry import CONDITIONAL, FUNCTION, SYMBOLS, is_jump
+
+# Фазы обработки выражения
+TOKENIZE = "tokenize"
+SHUNTING_YARD = "shunting_yard"
+EVALUATE = "evaluate"
+PHASES = (TOKENIZE, SHUNTING_YARD, EVALUATE)
+
+# Виды токенов для подсчета
+NUMBER = "number"
+VARIABLE = "variable"
+PARENTHESIS = "parenthesis"
+COMMA = "comma"
+JUMP = "jump"
+
+
+def token_kind(token: str) -> str:
+    """
+    Определяет вид токена.
+
+    Args:
+        token: Токен
+
+    Returns:
+        Вид токена: number, operator, function (в том числе условная
+        функция if), constant, variable, parenthesis, comma или jump
+        (переход условной функции в ПОЛИЗ)
+    """
+    symbol = SYMBOLS.get(token)
+    if symbol is not None:
+        return symbol.kind
+    if token in ("(", ")"):
+        return PARENTHESIS
+    if token == ",":
+        return COMMA
+    if token == CONDITIONAL:
+        return FUNCTION
+    if token.isalpha():
+        return VARIABLE
+    if is_jump(token):
+        return JUMP
+    return NUMBER
+
+
+class Stats:
+    """
+    Статистика обработки выражений по фазам.
+
+    Передается в tokenize, shunting_yard и evaluate_rpn параметром stats и
+    накапливает данные по всем вызовам. Без stats функции работают как
+    раньше и статистику не собирают.
+
+    Attributes:
+        times: Суммарное время каждой фазы в секундах
+        calls: Количество вызовов каждой фазы
+        errors: Количество ошибок в каждой фазе
+        tokens: Количество токенов инфиксной записи по видам (в tokenize)
+        rpn_tokens: Количество токенов ПОЛИЗ по видам (в evaluate_rpn)
+        max_operator_stack: Максимальная глубина стека операторов
+        max_value_stack: Максимальная глубина стека значений
+    """
+
+    def __init__(self) -> None:
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.errors = dict.fromkeys(PHASES, 0)
+        self.tokens: Counter = Counter()
+        self.rpn_tokens: Counter = Counter()
+        self.max_operator_stack = 0
+        self.max_value_stack = 0
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Измеряет время фазы и считает ошибки в ней.
+
+        Args:
+            name: Название фазы
+        """
+        self.calls[name] += 1
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.errors[name] += 1
+            raise
+        finally:
+            self.times[name] += time.perf_counter() - start
+
+    def operator_stack(self) -> list:
+        """Возвращает пустой стек операторов, запоминающий свою наибольшую глубину."""
+        return _DepthTrackingStack(self, "max_operator_stack")
+
+    def value_stack(self) -> list:
+        """Возвращает пустой стек значений, запоминающий свою наибольшую глубину."""
+        return _DepthTrackingStack(self, "max_value_stack")
+
+    def report(self) -> str:
+        """
+        Формирует текстовый отчет.
+
+        Returns:
+            Отчет в несколько строк
+        """
+        lines = []
+        for name in PHASES:
+            if self.calls[name]:
+                lines.append(
+                    f"{name}: {self.times[name] * 1000:.3f} мс, "
+                    f"вызовов {self.calls[name]}, ошибок {self.errors[name]}"
+                )
+        for title, tokens in (("токены", self.tokens), ("токены ПОЛИЗ", self.rpn_tokens)):
+            if tokens:
+                counts = ", ".join(
+                    f"{kind} {count}" for kind, count in sorted(tokens.items())
+                )
+                lines.append(f"{title}: {counts}")
+        lines.append(f"максимальная глубина стека операторов: {self.max_operator_stack}")
+        lines.append(f"максимальная глубина стека значений: {self.max_value_stack}")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return (
+            f"Stats(calls={self.calls}, errors={self.errors}, "
+            f"max_operator_stack={self.max_operator_stack}, "
+            f"max_value_stack={self.max_value_stack})"
+        )
+
+
+def add_argument(parser: argparse.ArgumentParser) -> None:
+    """
+    Добавляет в парсер аргументов флаг --stats.
+
+    Статистика собирается только в основном процессе, поэтому флаг
+    несовместим с --workers больше 1.
+
+    Args:
+        parser: Парсер аргументов командной строки
+    """
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="напечатать в stderr статистику по фазам обработки",
+    )
+
+
+class _DepthTrackingStack(list):
+    """
+    Список, записывающий в статистику свою наибольшую длину.
+
+    Глубина отслеживается только в append, поэтому без статистики стеки
+    остаются обычными списками и проверок не требуют.
+    """
+
+    __slots__ = ("_stats", "_attribute")
+
+    def __init__(self, stats: Stats, attribute: str) -> None:
+        super().__init__()
+        self._stats = stats
+        self._attribute = attribute
+
+    def append(self, item: object) -> None:
+        super().append(item)
+        if len(self) > getattr(self._stats, self._attribute):
+            setattr(self._stats, self._attribute, len(self))
@@ -0,0 +1,171 @@
+import argparse
+import json
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, Union
+
+Handler = Callable[[str], Any]
+
+# Ошибки вычисления, после которых потоковый режим переходит к следующей строке
+EXPRESSION_ERRORS = (ValueError, ArithmeticError)
+
+
+def stream_lines(
+    lines: Iterable[str], handler: Handler, start: int = 1
+) -> Iterator[str]:
+    """
+    Обрабатывает выражения построчно: одно выражение в каждой строке.
+
+    На каждую входную строку выдается ровно одна выходная строка, поэтому
+    результаты можно сопоставить с входом по номеру строки. Ошибка
+    печатается в stderr с номером строки, а в выход попадает пустая строка.
+
+    Args:
+        lines: Входные строки (например, sys.stdin)
+        handler: Функция, преобразующая выражение в результат
+        start: Номер первой строки для сообщений об ошибках
+
+    Returns:
+        Итератор выходных строк с символом перевода строки на конце
+    """
+    for number, line in enumerate(lines, start):
+        expression = line.strip()
+        if not expression:
+            yield "\n"
+            continue
+        try:
+            yield f"{handler(expression)}\n"
+        except EXPRESSION_ERRORS as e:
+            print(f"Ошибка в строке {number}: {e}", file=sys.stderr)
+            yield "\n"
+
+
+def stream_jsonl(lines: Iterable[str], handler: Handler, field: str) -> Iterator[str]:
+    """
+    Обрабатывает выражения в формате JSONL.
+
+    Каждая входная строка — объект JSON с полем "expression". Выходная запись
+    содержит все поля входной и поле field с результатом либо поле "error"
+    с текстом ошибки. Пустые строки пропускаются.
+
+    Args:
+        lines: Входные строки (например, sys.stdin)
+        handler: Функция, преобразующая выражение в результат
+        field: Имя поля для результата
+
+    Returns:
+        Итератор выходных строк JSON с символом перевода строки на конце
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+        record = parse_record(line)
+        evaluate_record(record, handler, field)
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def parse_record(line: Union[str, bytes]) -> dict:
+    """
+    Разбирает входную запись JSONL.
+
+    Args:
+        line: Строка с объектом JSON
+
+    Returns:
+        Объект записи; пустой объект, если строка не является объектом JSON
+    """
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return {}
+    return record if isinstance(record, dict) else {}
+
+
+def evaluate_record(record: dict, handler: Handler, field: str) -> None:
+    """
+    Вычисляет выражение записи и добавляет в нее результат или ошибку.
+
+    Args:
+        record: Объект записи с полем "expression"
+        handler: Функция, преобразующая выражение в результат
+        field: Имя поля для результата
+    """
+    expression = record.get("expression")
+    if not isinstance(expression, str):
+        record["error"] = "Некорректная запись: ожидается объект с полем expression"
+        return
+    try:
+        result = handler(expression)
+        record[field] = str(result) if isinstance(result, complex) else result
+    except EXPRESSION_ERRORS as e:
+        record["error"] = str(e)
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Добавляет в парсер аргументов флаги потокового режима.
+
+    Args:
+        parser: Парсер аргументов командной строки
+    """
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--lines",
+        action="store_true",
+        help="читать по одному выражению в строке",
+    )
+    group.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="читать и писать записи JSONL с полем expression",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="количество процессов для потокового режима (по умолчанию 1)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1000,
+        help="количество строк, передаваемых процессу за раз",
+    )
+
+
+def run(args: argparse.Namespace, handler: Handler, field: str) -> bool:
+    """
+    Запускает потоковый режим, если он выбран флагами.
+
+    Вход читается из stdin построчно, поэтому объем памяти не зависит от
+    размера входа. Вывод буферизуется и не сбрасывается после каждой строки.
+    При --workers больше 1 строки обрабатываются частями в пуле процессов,
+    результаты выводятся в порядке входа.
+
+    Args:
+        args: Разобранные аргументы командной строки
+        handler: Функция, преобразующая выражение в результат
+        field: Имя поля для результата в режиме JSONL
+
+    Returns:
+        True, если потоковый режим был выбран и выполнен
+    """
+    if (args.jsonl or args.lines) and args.workers > 1:
+        from batch import stream_parallel
+
+        sys.stdout.writelines(
+            stream_parallel(
+                sys.stdin,
+                handler,
+                field if args.jsonl else None,
+                args.workers,
+                args.chunk_size,
+            )
+        )
+    elif args.jsonl:
+        sys.stdout.writelines(stream_jsonl(sys.stdin, handler, field))
+    elif args.lines:
+        sys.stdout.writelines(stream_lines(sys.stdin, handler))
+    else:
+        return False
+    return True
@@ -0,0 +1,174 @@
+import re
+from collections.abc import Iterable, Sequence
+from typing import Optional, Union
+
+import numpy as np
+
+from batch import BatchResult
+from calc import evaluate_tokens, parse_tokens
+from registry import NUMBER_PATTERN, is_number
+from shunting_yard import shunting_yard
+from stream import EXPRESSION_ERRORS
+from vectorized import evaluate_vectorized
+
+# Место подстановки числа в шаблоне
+PLACEHOLDER = "#"
+
+# Группы меньше этого размера вычисляются построчно: векторное вычисление
+# окупается, только начиная с нескольких строк
+MIN_GROUP_SIZE = 32
+
+# Удаление цифр: у выражений одного шаблона строки без цифр совпадают
+_DELETE_DIGITS = str.maketrans("", "", "0123456789")
+
+# Числа столбца, записанные через пробел
+_LITERALS = re.compile(r"-?{0}(?: -?{0})*".format(NUMBER_PATTERN))
+
+
+def skeleton(rpn: Union[str, Sequence[str]]) -> tuple[tuple[str, ...], list[str]]:
+    """
+    Заменяет числа в ПОЛИЗ местами подстановки.
+
+    Выражения, отличающиеся только числами, получают одинаковый шаблон.
+
+    Args:
+        rpn: Токены выражения в обратной польской нотации (результат
+             shunting_yard) или строка с токенами через пробел
+
+    Returns:
+        Шаблон (токены, в которых числа заменены на PLACEHOLDER) и числа в
+        порядке следования
+    """
+    tokens = parse_tokens(rpn) if isinstance(rpn, str) else rpn
+    template = []
+    literals = []
+    for token in tokens:
+        if is_number(token):
+            template.append(PLACEHOLDER)
+            literals.append(token)
+        else:
+            template.append(token)
+    return tuple(template), literals
+
+
+def evaluate_templates(
+    expressions: Iterable[str], rpn: bool = False
+) -> list[BatchResult]:
+    """
+    Вычисляет пакет выражений, группируя их по шаблону.
+
+    Выражения группируются по шаблону (см. skeleton); каждая группа
+    вычисляется одним проходом evaluate_vectorized, где числа выражений —
+    столбцы. Выражения сначала группируются по строке ПОЛИЗ без цифр, а
+    совпадение шаблона и корректность чисел проверяются для всей группы
+    операциями NumPy, поэтому на каждое выражение приходится несколько
+    операций над строкой целиком, а не над каждым токеном.
+
+    Построчно evaluate_tokens вычисляются строки с делением на ноль или
+    бесконечностью либо nan после ^ или функции (в них evaluate_rpn
+    выбрасывает ошибку или возвращает комплексное число), строки, не
+    совпавшие с шаблоном группы, и группы меньше MIN_GROUP_SIZE. Поэтому
+    результаты и ошибки совпадают с построчным вычислением (с точностью до
+    округления функций NumPy).
+
+    Args:
+        expressions: Выражения
+        rpn: True, если выражения записаны в ПОЛИЗ, иначе — в инфиксной записи
+
+    Returns:
+        Результаты в порядке входа; ошибка выражения попадает в результат
+        и не прерывает пакет
+    """
+    results: list[Optional[BatchResult]] = []
+    # Строка без цифр -> номера выражений и строки ПОЛИЗ
+    groups: dict[str, tuple[list[int], list[str]]] = {}
+    for index, expression in enumerate(expressions):
+        if not rpn:
+            try:
+                expression = " ".join(shunting_yard(expression))
+            except EXPRESSION_ERRORS as e:
+                results.append(BatchResult(None, str(e)))
+                continue
+        key = expression.translate(_DELETE_DIGITS)
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = ([], [])
+        group[0].append(index)
+        group[1].append(expression)
+        results.append(None)
+
+    for indices, texts in groups.values():
+        _evaluate_group(indices, texts, results)
+    return results
+
+
+def _evaluate_group(
+    indices: list[int], texts: list[str], results: list[Optional[BatchResult]]
+) -> None:
+    """Вычисляет группу выражений и записывает результаты."""
+    template, literals = skeleton(texts[0])
+    if len(texts) < MIN_GROUP_SIZE or not literals or "#" in texts[0]:
+        # Выражения без чисел группы могут повторяться
+        cache: dict[str, BatchResult] = {}
+        for index, text in zip(indices, texts):
+            result = cache.get(text)
+            if result is None:
+                result = cache[text] = _evaluate_row(text)
+            results[index] = result
+        return
+
+    rows = [text.split() for text in texts]
+    width = len(template)
+    conforming = np.fromiter((len(row) == width for row in rows), bool, len(rows))
+    positions = np.flatnonzero(conforming)
+    matrix = np.array([rows[row] for row in positions.tolist()], dtype=object)
+
+    # Строки, совпадающие с шаблоном: операторы и имена на своих местах,
+    # числа корректны
+    is_literal = np.array([token == PLACEHOLDER for token in template])
+    valid = (matrix[:, ~is_literal] == np.array(template, dtype=object)[~is_literal]).all(axis=1)
+    numbers = matrix[:, is_literal]
+    for column in range(numbers.shape[1]):
+        valid &= _valid_literals(numbers[:, column])
+    conforming[positions] = valid
+
+    vector = None
+    if valid.any():
+        numbers = numbers[valid].astype(float)
+        names = iter(range(numbers.shape[1]))
+        tokens = [f"#{next(names)}" if token == PLACEHOLDER else token for token in template]
+        columns = {f"#{column}": numbers[:, column] for column in range(numbers.shape[1])}
+        try:
+            vector = evaluate_vectorized(tokens, columns)
+        except ValueError:
+            # Некорректная ПОЛИЗ: порядок ошибок определяет построчное вычисление
+            pass
+
+    # Строки, вычисляемые построчно
+    scalar = np.ones(len(texts), dtype=bool)
+    if vector is not None:
+        recheck = vector.zero_division | vector.irregular
+        ready = np.flatnonzero(conforming)[~recheck]
+        for row, value in zip(ready.tolist(), vector.values[~recheck].tolist()):
+            results[indices[row]] = BatchResult(value, None)
+        scalar[ready] = False
+    for row in np.flatnonzero(scalar).tolist():
+        results[indices[row]] = _evaluate_row(texts[row])
+
+
+def _valid_literals(column: np.ndarray) -> np.ndarray:
+    """Маска корректных чисел столбца группы."""
+    text = " ".join(column.tolist())
+    if text.isascii() and text.replace(" ", "").isdigit():
+        return np.ones(len(column), dtype=bool)
+    if _LITERALS.fullmatch(text) is not None:
+        return np.ones(len(column), dtype=bool)
+    return np.fromiter(map(is_number, column.tolist()), bool, len(column))
+
+
+def _evaluate_row(text: str) -> BatchResult:
+    """Вычисляет одно выражение в ПОЛИЗ."""
+    try:
+        return BatchResult(evaluate_tokens(parse_tokens(text)), None)
+    except EXPRESSION_ERRORS as e:
+        return BatchResult(None, str(e))
@@ -0,0 +1,112 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from batch import (
+    BatchResult,
+    chunked,
+    evaluate_batch,
+    evaluate_batch_threads,
+    map_chunks,
+    stream_parallel,
+)
+from calculator import calculate
+from limits import Limits
+from registry import register_function, unregister
+
+
+def double_all(items):
+    return [item * 2 for item in items]
+
+
+class TestChunked(unittest.TestCase):
+    """Тесты для функции chunked."""
+
+    def test_chunks(self):
+        """Тест разбиения на части."""
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(chunked([], 3)), [])
+
+    def test_invalid_size(self):
+        """Тест ошибки неположительного размера части."""
+        with self.assertRaises(ValueError):
+            list(chunked([1], 0))
+
+
+class TestMapChunks(unittest.TestCase):
+    """Тесты для функции map_chunks."""
+
+    def test_order_preserved(self):
+        """Тест сохранения порядка результатов."""
+        result = map_chunks(double_all, range(100), 3, 7, ThreadPoolExecutor)
+        self.assertEqual(list(result), [i * 2 for i in range(100)])
+
+
+class TestEvaluateBatch(unittest.TestCase):
+    """Тесты для функции evaluate_batch."""
+
+    def test_infix(self):
+        """Тест пакета выражений в инфиксной записи с ошибками."""
+        expressions = ["1 + 1", "1 / 0", "2 ^ 10", "cos(1)", "3 * 3"]
+        results = list(evaluate_batch(expressions, workers=2, chunk_size=2))
+        self.assertEqual(
+            results,
+            [
+                BatchResult(2.0, None),
+                BatchResult(None, "Деление на ноль"),
+                BatchResult(1024.0, None),
+                BatchResult(None, "Неизвестная функция или константа: cos"),
+                BatchResult(9.0, None),
+            ],
+        )
+
+    def test_rpn(self):
+        """Тест пакета выражений в ПОЛИЗ."""
+        expressions = [f"{i} 2 *" for i in range(50)]
+        results = evaluate_batch(expressions, workers=2, chunk_size=8, rpn=True)
+        self.assertEqual([r.value for r in results], [i * 2.0 for i in range(50)])
+
+
+class TestEvaluateBatchThreads(unittest.TestCase):
+    """Тесты для функции evaluate_batch_threads."""
+
+    def test_matches_sequential(self):
+        """Тест совпадения результатов с последовательным вычислением."""
+        expressions = [f"({i} + 1) * 2 ^ {i % 7} / ({i % 5} - 2)" for i in range(500)]
+        expected = []
+        for expression in expressions:
+            try:
+                expected.append(BatchResult(calculate(expression), None))
+            except ValueError as e:
+                expected.append(BatchResult(None, str(e)))
+        results = list(evaluate_batch_threads(expressions, workers=4, chunk_size=7))
+        self.assertEqual(results, expected)
+
+    def test_runtime_registration_visible(self):
+        """Тест функции, зарегистрированной во время работы и не сериализуемой pickle."""
+        register_function("twice", lambda x: 2 * x)
+        self.addCleanup(unregister, "twice")
+        results = evaluate_batch_threads([f"{i} twice" for i in range(20)], 3, 4, rpn=True)
+        self.assertEqual([r.value for r in results], [2.0 * i for i in range(20)])
+
+    def test_limits(self):
+        """Тест ограничений ресурсов в пуле потоков."""
+        limits = Limits(max_exponent=100)
+        results = list(evaluate_batch_threads(["1 + 1", "2 ^ 5000"], 2, 1, limits=limits))
+        self.assertEqual(results[0], BatchResult(2.0, None))
+        self.assertIsNone(results[1].value)
+
+
+class TestStreamParallel(unittest.TestCase):
+    """Тесты для функции stream_parallel."""
+
+    def test_jsonl(self):
+        """Тест режима JSONL в пуле процессов."""
+        lines = [f'{{"id": {i}, "expression": "{i} + 1"}}\n' for i in range(10)]
+        output = list(stream_parallel(lines, calculate, "result", workers=2, chunk_size=3))
+        self.assertEqual(
+            output,
+            [f'{{"id": {i}, "expression": "{i} + 1", "result": {i + 1.0}}}\n' for i in range(10)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from calc import evaluate_rpn
+from calc import evaluate_rpn, evaluate_tokens
 
 PI = 3.141592653589793
 
@@ -23,6 +23,11 @@ class TestEvaluateRPN(unittest.TestCase):
         """Тест простого деления."""
         self.assertEqual(evaluate_rpn("10 2 /"), 5.0)
 
+    def test_decimal_numbers(self):
+        """Тест десятичных дробей и экспоненциальной записи."""
+        self.assertEqual(evaluate_rpn("1.5 2.5e-1 +"), 1.75)
+        self.assertEqual(evaluate_rpn("-1.5E2 2 /"), -75.0)
+
     def test_power_operation(self):
         """Тест операции возведения в степень."""
         self.assertEqual(evaluate_rpn("2 3 ^"), 8.0)
@@ -77,6 +82,17 @@ class TestEvaluateRPN(unittest.TestCase):
         self.assertEqual(evaluate_rpn("-5 3 +"), -2.0)
         self.assertEqual(evaluate_rpn("5 -3 +"), 2.0)
 
+    def test_variables(self):
+        """Тест переменных."""
+        self.assertEqual(evaluate_rpn("x 2 *", {"x": 4}), 8.0)
+        self.assertEqual(evaluate_rpn("x rate +", {"x": 1, "rate": 0.5}), 1.5)
+
+    def test_unknown_variable_error(self):
+        """Тест ошибки переменной без значения."""
+        with self.assertRaises(ValueError) as context:
+            evaluate_rpn("x y +", {"x": 1})
+        self.assertIn("Неизвестный токен: y", str(context.exception))
+
     def test_division_by_zero_error(self):
         """Тест ошибки деления на ноль."""
         with self.assertRaises(ValueError) as context:
@@ -130,5 +146,35 @@ class TestEvaluateRPN(unittest.TestCase):
         self.assertAlmostEqual(result, expected, places=10)
 
 
+class TestEvaluateTokens(unittest.TestCase):
+    """Тесты для функции evaluate_tokens."""
+
+    def test_generator_input(self):
+        """Тест вычисления потока токенов из генератора."""
+        tokens = (token for token in ["3", "4", "2", "*", "+"])
+        self.assertEqual(evaluate_tokens(tokens), 11.0)
+
+    def test_variables(self):
+        """Тест переменных."""
+        self.assertEqual(evaluate_tokens(iter(["x", "1", "+"]), {"x": 2}), 3.0)
+
+
+    def test_comparisons(self):
+        """Тест операторов сравнения."""
+        self.assertEqual(evaluate_rpn("1 1 + 2 =="), 1.0)
+        self.assertEqual(evaluate_rpn("2 3 ^ 4 2 * <"), 0.0)
+        self.assertEqual(evaluate_rpn("1 2 < 0 !="), 1.0)
+
+    def test_conditional_is_lazy(self):
+        """Тест того, что невыбранная ветвь if не вычисляется."""
+        rpn = ["x", "0", "!=", "?4", "1", "x", "/", ":1", "0"]
+        self.assertEqual(evaluate_tokens(rpn, {"x": 0}), 0.0)
+        self.assertEqual(evaluate_tokens(rpn, {"x": 4}), 0.25)
+        self.assertEqual(evaluate_rpn("1 ?2 2 :1 3 0 ?2 4 :1 5 +"), 7.0)
+        with self.assertRaisesRegex(ValueError, "Деление на ноль"):
+            evaluate_rpn("0 ?2 1 :3 1 0 /")
+        with self.assertRaisesRegex(ValueError, "Недостаточно операндов для условия"):
+            evaluate_rpn("?2 1 :1 2")
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,125 @@
+import io
+import random
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+from calc import evaluate_rpn
+from calculator import calculate, calculate_chunked, evaluate_infix, main
+from shunting_yard import shunting_yard
+
+
+class TestCalculate(unittest.TestCase):
+    """Тесты для функции calculate."""
+
+    def test_expression(self):
+        """Тест вычисления выражения в инфиксной записи."""
+        self.assertEqual(calculate("3 + 4 * 2"), 11.0)
+        self.assertAlmostEqual(calculate("sin(pi / 2) * 2"), 2.0, places=10)
+
+    def test_division_by_zero_error(self):
+        """Тест ошибки деления на ноль."""
+        with self.assertRaises(ValueError) as context:
+            calculate("1 / 0")
+        self.assertIn("Деление на ноль", str(context.exception))
+
+
+class TestEvaluateInfix(unittest.TestCase):
+    """Тесты для функции evaluate_infix."""
+
+    def outcome(self, function):
+        try:
+            return "ok", function()
+        except (ValueError, ArithmeticError) as e:
+            return type(e).__name__, str(e)
+
+    def test_precedence_and_associativity(self):
+        """Тест приоритетов и правоассоциативности ^."""
+        self.assertEqual(evaluate_infix("3 + 4 * 2"), 11.0)
+        self.assertEqual(evaluate_infix("2 ^ 3 ^ 2"), 512.0)
+        self.assertEqual(evaluate_infix("10 - 5 - 2"), 3.0)
+        self.assertEqual(evaluate_infix("(3 + 4) * (2 - 5)"), -21.0)
+
+    def test_variables(self):
+        """Тест переменных."""
+        self.assertEqual(evaluate_infix("x * (1 + rate)", {"x": 10, "rate": 1}), 20.0)
+
+    def test_matches_pipeline(self):
+        """Тест совпадения результатов и ошибок с shunting_yard + evaluate_rpn."""
+        rng = random.Random(42)
+        atoms = ["1", "2", "0", "10", "pi", "x", "sin", "cos", "(", ")",
+                 "+", "-", "*", "/", "^", " ", "$"]
+        for _ in range(5000):
+            expression = "".join(rng.choice(atoms) for _ in range(rng.randint(0, 12)))
+            expected = self.outcome(
+                lambda: evaluate_rpn(" ".join(shunting_yard(expression, ["x"])), {"x": 3})
+            )
+            actual = self.outcome(lambda: evaluate_infix(expression, {"x": 3}))
+            self.assertEqual(actual, expected, expression)
+
+    def test_parse_error_wins_over_evaluation_error(self):
+        """Тест того, что ошибка разбора важнее ошибки вычисления."""
+        with self.assertRaises(ValueError) as context:
+            evaluate_infix("1 / 0 + cos(1)")
+        self.assertIn("Неизвестная функция или константа: cos", str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            evaluate_infix("1 / 0 + $")
+        self.assertIn("Неизвестный символ: $", str(context.exception))
+
+    def test_conditional(self):
+        """Тест условной функции if и операторов сравнения."""
+        self.assertEqual(evaluate_infix("if(x > 2, 1 / 0, x) + (x == 2)", {"x": 2}), 3.0)
+        self.assertEqual(evaluate_infix("1 + 2 < 3 * 4"), 1.0)
+        self.assertEqual(evaluate_infix("if * 2", {"if": 3}), 6.0)
+        with self.assertRaises(ValueError) as context:
+            evaluate_infix("1 / 0 + if(1, 2)")
+        self.assertIn("Функция if ожидает аргументов: 3, передано: 2", str(context.exception))
+
+    def test_unbalanced_parenthesis_error(self):
+        """Тест ошибки незакрытой скобки."""
+        with self.assertRaises(ValueError) as context:
+            evaluate_infix("(1 + 2")
+        self.assertIn("Неизвестный токен: (", str(context.exception))
+
+
+class TestCalculateChunked(unittest.TestCase):
+    """Тесты для функции calculate_chunked."""
+
+    def test_chunks(self):
+        """Тест выражения, разрезанного посреди чисел."""
+        self.assertEqual(calculate_chunked(["1", "0 + 2", "0*", "3"]), 70.0)
+
+    def test_long_expression(self):
+        """Тест длинного выражения из множества частей."""
+        chunks = ("1+" for _ in range(100000))
+        self.assertEqual(calculate_chunked(iter([*chunks, "1"])), 100001.0)
+
+
+class TestMain(unittest.TestCase):
+    """Тесты для CLI интерфейса."""
+
+    def run_main(self, stdin, argv):
+        stdout = io.StringIO()
+        with mock.patch("sys.stdin", io.StringIO(stdin)), redirect_stdout(stdout):
+            main(argv)
+        return stdout.getvalue()
+
+    def test_single_expression(self):
+        """Тест вычисления одного выражения."""
+        self.assertEqual(self.run_main("2 ^ 3 ^ 2\n", []), "512.0\n")
+
+    def test_chunked(self):
+        """Тест чтения одного выражения по частям."""
+        self.assertEqual(self.run_main("(1 + 2) * 3\n", ["--chunked"]), "9.0\n")
+
+    def test_lines(self):
+        """Тест построчного режима."""
+        self.assertEqual(self.run_main("1 + 1\n2 * 3\n", ["--lines"]), "2.0\n6.0\n")
+
+    def test_jsonl(self):
+        """Тест режима JSONL."""
+        output = self.run_main('{"expression": "1 + 1"}\n', ["--jsonl"])
+        self.assertEqual(output, '{"expression": "1 + 1", "result": 2.0}\n')
+
+
+if __name__ == "__main__":
+    unittest.main()
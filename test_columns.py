@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from calc import evaluate_rpn
+from shunting_yard import shunting_yard
+
+try:
+    import numpy as np
+    from columns import COLUMN_DTYPE, ColumnResult, evaluate_columns, main
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy не установлен")
+class TestEvaluateColumns(unittest.TestCase):
+    """Тесты для функции evaluate_columns."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def column(self, name, values):
+        path = os.path.join(self.directory, name)
+        np.asarray(values, dtype=COLUMN_DTYPE).tofile(path)
+        return path
+
+    def read(self, path):
+        return np.fromfile(path, dtype=COLUMN_DTYPE)
+
+    def test_matches_evaluate_rpn(self):
+        """Тест совпадения с построчным evaluate_rpn при любом размере части."""
+        xs = np.linspace(-3, 3, 25)
+        ys = np.arange(25.0)
+        columns = {"x": self.column("x", xs), "y": self.column("y", ys)}
+        rpn = shunting_yard("x * 1.5 + sin(y) ^ 2", ["x", "y"])
+        output = os.path.join(self.directory, "out")
+        for chunk_rows in (1, 4, 25, 1000):
+            result = evaluate_columns(rpn, columns, output, chunk_rows)
+            self.assertEqual(result, ColumnResult(25, 0))
+            values = self.read(output)
+            for i in range(25):
+                expected = evaluate_rpn(" ".join(rpn), {"x": xs[i], "y": ys[i]})
+                self.assertAlmostEqual(values[i], expected, places=10)
+
+    def test_zero_division(self):
+        """Тест деления на ноль в отдельных строках."""
+        columns = {"x": self.column("x", [0.0, 1.0, 3.0, 1.0])}
+        output = os.path.join(self.directory, "out")
+        result = evaluate_columns("10 x 1 - /", columns, output, chunk_rows=3)
+        self.assertEqual(result, ColumnResult(4, 2))
+        values = self.read(output)
+        self.assertEqual(values[[0, 2]].tolist(), [-10.0, 5.0])
+        self.assertTrue(np.isnan(values[[1, 3]]).all())
+
+    def test_constant_broadcast(self):
+        """Тест растягивания константы на длину столбцов."""
+        columns = {"x": self.column("x", [1.0, 2.0, 3.0])}
+        output = os.path.join(self.directory, "out")
+        evaluate_columns(["pi"], columns, output, chunk_rows=2)
+        self.assertEqual(self.read(output).tolist(), [3.141592653589793] * 3)
+
+    def test_empty_columns(self):
+        """Тест пустых столбцов."""
+        columns = {"x": self.column("x", [])}
+        output = os.path.join(self.directory, "out")
+        self.assertEqual(evaluate_columns("x 1 +", columns, output), ColumnResult(0, 0))
+        self.assertEqual(os.path.getsize(output), 0)
+        with self.assertRaisesRegex(ValueError, "Неизвестный токен: y"):
+            evaluate_columns("y 1 +", columns, output)
+
+    def test_invalid_columns(self):
+        """Тест некорректных столбцов."""
+        output = os.path.join(self.directory, "out")
+        columns = {"x": self.column("x", [1.0, 2.0]), "y": self.column("y", [1.0])}
+        with self.assertRaisesRegex(ValueError, "разную длину"):
+            evaluate_columns("x y +", columns, output)
+        path = os.path.join(self.directory, "bad")
+        with open(path, "wb") as file:
+            file.write(b"\0" * 12)
+        with self.assertRaisesRegex(ValueError, "не кратен 8"):
+            evaluate_columns("x", {"x": path}, output)
+        with self.assertRaisesRegex(ValueError, "Не задан"):
+            evaluate_columns("1", {}, output)
+        with self.assertRaisesRegex(ValueError, "положительным"):
+            evaluate_columns("x", {"x": columns["x"]}, output, chunk_rows=0)
+
+    def test_cli(self):
+        """Тест CLI."""
+        x = self.column("x", [1.0, 2.0, 0.0])
+        output = os.path.join(self.directory, "out")
+        stdout = StringIO()
+        with redirect_stdout(stdout):
+            main(["1 / x", "--column", f"x={x}", "--output", output, "--chunk-rows", "2"])
+        self.assertEqual(stdout.getvalue(), "строк: 3, деление на ноль: 1\n")
+        self.assertEqual(self.read(output)[:2].tolist(), [1.0, 0.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import math
+import unittest
+from calc import evaluate_rpn
+from compiler import compile
+from shunting_yard import shunting_yard
+
+PI = 3.141592653589793
+
+
+class TestCompile(unittest.TestCase):
+    """Тесты для функции compile."""
+
+    def test_constant_expression(self):
+        """Тест выражения без переменных."""
+        self.assertEqual(compile("3 + 4 * 2")(), 11.0)
+
+    def test_power_right_associative(self):
+        """Тест правоассоциативности возведения в степень."""
+        self.assertEqual(compile("2 ^ 3 ^ 2")(), 512.0)
+
+    def test_sin_and_pi(self):
+        """Тест функции sin и константы pi."""
+        self.assertAlmostEqual(compile("sin(pi / 2) * 2")(), 2.0, places=10)
+        self.assertAlmostEqual(compile("pi")(), PI, places=10)
+
+    def test_variables(self):
+        """Тест выражения с переменными."""
+        expr = compile("x * (1 + rate) ^ 2")
+        self.assertEqual(expr.variables, ("x", "rate"))
+        self.assertAlmostEqual(expr(x=100, rate=0.5), 225.0, places=10)
+        self.assertAlmostEqual(expr(x=2, rate=1), 8.0, places=10)
+
+    def test_result_is_float(self):
+        """Тест того, что результат всегда вещественный."""
+        self.assertIsInstance(compile("x")(x=3), float)
+
+    def test_matches_evaluate_rpn(self):
+        """Тест совпадения результата с evaluate_rpn."""
+        expression = "15/(7-(1+1))*3-(2+(1+1))*15/(7-(200+1))*3-(2+(1+1))*(15/(7-(1+1))*3-(2+(1+1))+15/(7-(1+1))*3-(2+(1+1)))"
+        expected = evaluate_rpn(" ".join(shunting_yard(expression)))
+        self.assertAlmostEqual(compile(expression)(), expected, places=10)
+
+    def test_keyword_variable_name(self):
+        """Тест переменной, совпадающей с ключевым словом Python."""
+        self.assertEqual(compile("lambda + if")(**{"lambda": 1, "if": 2}), 3.0)
+
+    def test_conditional_and_comparisons(self):
+        """Тест условной функции if и операторов сравнения."""
+        expr = compile("if(x > 0, 1 / x, if(x == 0, 0, 0 - x)) + (x <= 2)")
+        self.assertEqual(expr.variables, ("x",))
+        self.assertEqual(expr(x=4), 0.25)
+        self.assertEqual(expr(x=0), 1.0)
+        self.assertEqual(expr(x=-3), 4.0)
+        for x in (4, 0, -3):
+            self.assertEqual(expr(x=x), evaluate_rpn(" ".join(expr.rpn), {"x": x}))
+
+    def test_long_expression(self):
+        """Тест выражения, слишком глубокого для компилятора Python."""
+        expr = compile("x + " * 5000 + "x / y")
+        self.assertEqual(expr.variables, ("x", "y"))
+        self.assertEqual(expr(x=1, y=2), 5000.5)
+        with self.assertRaisesRegex(ValueError, "Деление на ноль"):
+            expr(x=1, y=0)
+
+    def test_deep_conditional(self):
+        """Тест вложенности if глубже предела рекурсии."""
+        depth = 5000
+        expr = compile("if(x, " * depth + "7" + ", 2)" * depth)
+        self.assertEqual(expr(x=1), 7.0)
+        self.assertEqual(expr(x=0), 2.0)
+
+    def test_division_by_zero_error(self):
+        """Тест ошибки деления на ноль."""
+        expr = compile("10 / x")
+        self.assertEqual(expr(x=2), 5.0)
+        with self.assertRaises(ValueError) as context:
+            expr(x=0)
+        self.assertIn("Деление на ноль", str(context.exception))
+
+    def test_missing_variable_error(self):
+        """Тест ошибки отсутствующей переменной."""
+        with self.assertRaises(ValueError) as context:
+            compile("x + y")(x=1)
+        self.assertIn("Не задано значение переменной: y", str(context.exception))
+
+    def test_unknown_variable_error(self):
+        """Тест ошибки неизвестной переменной."""
+        with self.assertRaises(ValueError) as context:
+            compile("x + 1")(x=1, y=2)
+        self.assertIn("Неизвестная переменная: y", str(context.exception))
+
+    def test_insufficient_operands_error(self):
+        """Тест ошибки недостаточно операндов."""
+        with self.assertRaises(ValueError) as context:
+            compile("3 +")
+        self.assertIn("Недостаточно операндов для операции", str(context.exception))
+
+    def test_invalid_expression_error(self):
+        """Тест ошибки некорректного выражения."""
+        with self.assertRaises(ValueError) as context:
+            compile("3 4")
+        self.assertIn("Некорректное выражение", str(context.exception))
+
+    def test_sin_of_variable(self):
+        """Тест функции от переменной."""
+        self.assertAlmostEqual(compile("sin(x)")(x=1.0), math.sin(1.0), places=10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import random
+import re
+import unittest
+
+from incremental import IncrementalParser
+from shunting_yard import shunting_yard
+
+
+class TestIncrementalParser(unittest.TestCase):
+    """Тесты для класса IncrementalParser."""
+
+    def assertParses(self, parser, expression, update):
+        self.assertEqual(parser.parse(expression), shunting_yard(expression, parser.variables))
+        self.assertEqual(parser.last_update, update)
+
+    def test_first_parse_is_full(self):
+        """Тест полного разбора при первом вызове."""
+        self.assertParses(IncrementalParser(), "3 + 4 * 2", "full")
+
+    def test_edit_inside_group(self):
+        """Тест преобразования только измененной группы."""
+        parser = IncrementalParser()
+        parser.parse("(1 + 2) * (3 - 4) ^ (5 / sin(6))")
+        self.assertParses(parser, "(1 + 2) * (3 * 7 - 4) ^ (5 / sin(6))", "group")
+        self.assertParses(parser, "(1 + 2) * (3 * 7 - 4) ^ (5 / sin(68))", "group")
+        self.assertParses(parser, "(1 + 2) * (3 * 7 - 4) ^ (5 / sin(68 + pi))", "group")
+        self.assertParses(parser, "(1 + 2) * (3 - 4) ^ (5 / sin(68 + pi))", "group")
+
+    def test_number_merge(self):
+        """Тест слияния числа с соседними цифрами."""
+        parser = IncrementalParser()
+        parser.parse("(12 + 3)")
+        self.assertParses(parser, "(125 + 3)", "group")
+        self.assertParses(parser, "(12 + 3)", "group")
+        self.assertParses(parser, "(12 3)", "group")
+
+    def test_top_level_edit(self):
+        """Тест правки вне скобок."""
+        parser = IncrementalParser()
+        parser.parse("(1 + 2) * 3")
+        self.assertParses(parser, "(1 + 2) - 3", "top_level")
+
+    def test_whitespace_only(self):
+        """Тест правки, не меняющей токены."""
+        parser = IncrementalParser()
+        parser.parse("(1 + 2) * 3")
+        self.assertParses(parser, "(1 +  2) * 3", "unchanged")
+        self.assertParses(parser, "(1 +  2) * 3", "unchanged")
+
+    def test_parenthesis_change_is_full(self):
+        """Тест полного разбора при изменении скобок."""
+        parser = IncrementalParser()
+        parser.parse("(1 + 2) * 3")
+        self.assertParses(parser, "(1 + 2) * (3", "full")
+        self.assertParses(parser, "(1 + 2) * (3 + 1", "full")
+
+    def test_conditional_is_full(self):
+        """Тест полного разбора выражения с условной функцией."""
+        parser = IncrementalParser(["x"])
+        parser.parse("if(x > 1, (x + 1), 2)")
+        self.assertParses(parser, "if(x > 1, (x + 10), 2)", "full")
+        self.assertParses(parser, "(x + 10) * 2", "full")
+
+    def test_scientific_literal(self):
+        """Тест правки, превращающей соседние токены в одно число."""
+        parser = IncrementalParser(["e"])
+        parser.parse("(1 + 2e*3)")
+        self.assertParses(parser, "(1 + 2e-3)", "group")
+        self.assertParses(parser, "(1 + 2e-3 * e)", "group")
+
+    def test_variables(self):
+        """Тест переменных."""
+        parser = IncrementalParser(["x", "y"])
+        parser.parse("(x + 1) * y")
+        self.assertParses(parser, "(x + y) * y", "group")
+
+    def test_error_resets_state(self):
+        """Тест ошибки и последующего разбора."""
+        parser = IncrementalParser()
+        parser.parse("(1 + 2) * 3")
+        with self.assertRaisesRegex(ValueError, "Неизвестная функция или константа: q"):
+            parser.parse("(1 + q) * 3")
+        with self.assertRaisesRegex(ValueError, "Неизвестная функция или константа: q"):
+            parser.parse("(1 + q) * 3 $")
+        self.assertIsNone(parser.last_update)
+        self.assertParses(parser, "(1 + 2) * 3", "full")
+
+    def test_random_edits(self):
+        """Тест совпадения с shunting_yard на случайных правках."""
+        rng = random.Random(0)
+        alphabet = list("0123456789+-*/^ ,.e") + ["x", "pi", "sin(", "q"]
+        for _ in range(100):
+            parser = IncrementalParser(["x"])
+            text = "(1 + (2 * x)) ^ (sin(3) - (4 / (5 + pi)))"
+            for _ in range(30):
+                position = rng.randint(0, len(text))
+                end = min(len(text), position + rng.randint(0, 2))
+                insert = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 2)))
+                text = text[:position] + insert + text[end:]
+                try:
+                    expected = shunting_yard(text, ["x"])
+                except ValueError as e:
+                    with self.assertRaisesRegex(ValueError, re.escape(str(e))):
+                        parser.parse(text)
+                else:
+                    self.assertEqual(parser.parse(text), expected, text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from unittest import mock
+
+from batch import evaluate_batch
+from calc import evaluate_rpn
+from limits import (
+    ExponentTooLarge,
+    InputTooLong,
+    LimitExceeded,
+    Limits,
+    NestingTooDeep,
+    StackTooDeep,
+    TimeLimitExceeded,
+    TooManyTokens,
+)
+from shunting_yard import shunting_yard, tokenize
+from stats import Stats
+
+
+class TestLimits(unittest.TestCase):
+    """Тесты ограничений ресурсов."""
+
+    def test_no_limits(self):
+        """Тест того, что пустые ограничения не меняют результат."""
+        limits = Limits()
+        self.assertEqual(tokenize("2 ^ 3 ^ 2", limits=limits), tokenize("2 ^ 3 ^ 2"))
+        self.assertEqual(shunting_yard("(1 + 2) * 3", limits=limits), ["1", "2", "+", "3", "*"])
+        self.assertEqual(evaluate_rpn("2 3 2 ^ ^", limits=limits), 512)
+
+    def test_input_length(self):
+        """Тест ограничения длины выражения."""
+        limits = Limits(max_length=5)
+        self.assertEqual(tokenize("1 + 2", limits=limits), ["1", "+", "2"])
+        with self.assertRaises(InputTooLong):
+            tokenize("1 + 23", limits=limits)
+        with self.assertRaises(InputTooLong):
+            shunting_yard("1 + 23", limits=limits)
+        with self.assertRaises(InputTooLong):
+            evaluate_rpn("1 23 +", limits=limits)
+
+    def test_token_count(self):
+        """Тест ограничения количества токенов."""
+        limits = Limits(max_tokens=3)
+        self.assertEqual(shunting_yard("1 + 2", limits=limits), ["1", "2", "+"])
+        with self.assertRaisesRegex(TooManyTokens, "больше 3 токенов"):
+            shunting_yard("1 + 2 + 3", limits=limits)
+        with self.assertRaises(TooManyTokens):
+            evaluate_rpn("1 2 + 3 +", limits=limits)
+
+    def test_token_count_is_checked_early(self):
+        """Тест отказа до разбора остатка выражения."""
+        # Неизвестный символ после превышения лимита не достигается
+        with self.assertRaises(TooManyTokens):
+            tokenize("1 + 2 + 3 $", limits=Limits(max_tokens=3))
+
+    def test_nesting(self):
+        """Тест ограничения вложенности скобок."""
+        limits = Limits(max_nesting=2)
+        self.assertEqual(shunting_yard("((1)) + (2)", limits=limits), ["1", "2", "+"])
+        with self.assertRaises(NestingTooDeep):
+            shunting_yard("(((1)))", limits=limits)
+
+    def test_stack_depth(self):
+        """Тест ограничения глубины стека значений."""
+        limits = Limits(max_stack=2)
+        self.assertEqual(evaluate_rpn("1 2 + 3 + sin", limits=limits), evaluate_rpn("1 2 + 3 + sin"))
+        with self.assertRaises(StackTooDeep):
+            evaluate_rpn("1 2 3 + +", limits=limits)
+        self.assertEqual(evaluate_rpn("1 ?2 2 :1 3", limits=Limits(max_stack=1)), 2.0)
+
+    def test_exponent(self):
+        """Тест ограничения показателя степени."""
+        limits = Limits(max_exponent=100)
+        self.assertEqual(evaluate_rpn("2 3 2 ^ ^", limits=limits), 512)
+        with self.assertRaisesRegex(ExponentTooLarge, "больше 100"):
+            evaluate_rpn("2 3 3 3 ^ ^ ^", limits=limits)
+
+    def test_time(self):
+        """Тест ограничения процессорного времени."""
+        limits = Limits(max_time=1.0)
+        rpn = " ".join(["1"] + ["1 +"] * 1000)
+        self.assertEqual(evaluate_rpn(rpn, limits=limits), 1001)
+        with mock.patch("limits.time.thread_time", side_effect=[0.0, 2.0]):
+            with self.assertRaises(TimeLimitExceeded):
+                evaluate_rpn(rpn, limits=limits)
+
+    def test_exceptions_are_value_errors(self):
+        """Тест иерархии исключений."""
+        errors = (
+            InputTooLong,
+            TooManyTokens,
+            NestingTooDeep,
+            StackTooDeep,
+            ExponentTooLarge,
+            TimeLimitExceeded,
+        )
+        for error in errors:
+            self.assertTrue(issubclass(error, LimitExceeded))
+            self.assertTrue(issubclass(error, ValueError))
+
+    def test_with_stats(self):
+        """Тест совместной работы со статистикой."""
+        stats = Stats()
+        with self.assertRaises(NestingTooDeep):
+            shunting_yard("((1))", stats=stats, limits=Limits(max_nesting=1))
+        self.assertEqual(stats.errors["tokenize"], 1)
+
+    def test_batch_skips_poison_inputs(self):
+        """Тест пропуска выражений, превышающих ограничения, в пакете."""
+        results = list(
+            evaluate_batch(
+                ["1 + 2", "2 ^ 999", "(((1)))"],
+                workers=1,
+                limits=Limits(max_nesting=2, max_exponent=10),
+            )
+        )
+        self.assertEqual(results[0].value, 3)
+        self.assertIn("Показатель степени", results[1].error)
+        self.assertIn("Вложенность скобок", results[2].error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from calc import evaluate_rpn
+from memo import MemoInfo, SubresultMemo
+from registry import register_function, unregister
+
+
+class TestSubresultMemo(unittest.TestCase):
+    """Тесты для класса SubresultMemo."""
+
+    def test_matches_evaluate_rpn(self):
+        """Тест совпадения результата с evaluate_rpn."""
+        memo = SubresultMemo()
+        for rpn in ["3 4 2 * +", "2 3 2 ^ ^", "pi 2 / sin", "5", "1 2 - 3 -"]:
+            self.assertEqual(memo.evaluate(rpn), evaluate_rpn(rpn))
+
+    def test_shared_subtree_evaluated_once(self):
+        """Тест однократного вычисления общего поддерева."""
+        calls = []
+        register_function("probe", lambda x: calls.append(x) or x * 2)
+        self.addCleanup(unregister, "probe")
+
+        memo = SubresultMemo()
+        self.assertEqual(memo.evaluate("1 2 + probe 10 *"), 60)
+        self.assertEqual(memo.evaluate("5 1 2 + probe -"), -1)
+        self.assertEqual(memo.evaluate("1 2 + probe 1 2 + probe /"), 1)
+        self.assertEqual(calls, [3.0])
+
+    def test_hit_rate(self):
+        """Тест статистики попаданий."""
+        memo = SubresultMemo()
+        memo.evaluate("1 2 + 3 *")
+        memo.evaluate("1 2 + 4 *")
+        info = memo.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 3, 3))
+        self.assertEqual(info.hit_rate, 0.25)
+        self.assertEqual(MemoInfo(0, 0, 0, 1, 0).hit_rate, 0.0)
+
+    def test_variables_are_part_of_key(self):
+        """Тест того, что значения переменных входят в ключ."""
+        memo = SubresultMemo()
+        self.assertEqual(memo.evaluate("x 1 +", {"x": 1}), 2)
+        self.assertEqual(memo.evaluate("x 1 +", {"x": 5}), 6)
+        self.assertEqual(memo.cache_info().hits, 0)
+
+    def test_errors(self):
+        """Тест ошибок вычисления."""
+        memo = SubresultMemo()
+        with self.assertRaisesRegex(ValueError, "Деление на ноль"):
+            memo.evaluate("1 0 /")
+        with self.assertRaisesRegex(ValueError, "Деление на ноль"):
+            memo.evaluate("1 0 /")
+        with self.assertRaisesRegex(ValueError, "Недостаточно операндов для операции"):
+            memo.evaluate("1 +")
+        with self.assertRaisesRegex(ValueError, "Неизвестный токен: y"):
+            memo.evaluate("y 1 +")
+        with self.assertRaisesRegex(ValueError, "не один элемент"):
+            memo.evaluate("1 2")
+
+    def test_bounded_size(self):
+        """Тест ограничения количества записей."""
+        memo = SubresultMemo(maxsize=8)
+        for n in range(100):
+            memo.evaluate(f"{n} 1 +")
+        info = memo.cache_info()
+        self.assertLessEqual(info.currsize, 8)
+        self.assertEqual(info.evictions, 100 - info.currsize)
+        self.assertEqual(memo.evaluate("99 1 +"), 100)
+
+    def test_frequently_used_entry_survives_eviction(self):
+        """Тест того, что часто используемое подвыражение не вытесняется."""
+        memo = SubresultMemo(maxsize=8)
+        memo.evaluate("1000 1 +")
+        for n in range(100):
+            memo.evaluate(f"{n} 1 +")
+            memo.evaluate("1000 1 +")
+        info = memo.cache_info()
+        self.assertEqual(info.misses, 101)
+        self.assertEqual(info.hits, 100)
+        self.assertGreater(info.evictions, 0)
+
+    def test_zero_size(self):
+        """Тест отключенной памяти."""
+        memo = SubresultMemo(maxsize=0)
+        self.assertEqual(memo.evaluate("1 2 +"), 3)
+        self.assertEqual(memo.cache_info().currsize, 0)
+        with self.assertRaises(ValueError):
+            SubresultMemo(maxsize=-1)
+
+    def test_evaluate_many(self):
+        """Тест вычисления пакета."""
+        memo = SubresultMemo()
+        results = list(memo.evaluate_many(["(1 + 2) * 3", "1 / 0", "(1 + 2) * 4"]))
+        self.assertEqual([r.value for r in results], [9, None, 12])
+        self.assertEqual(results[1].error, "Деление на ноль")
+        self.assertEqual(memo.cache_info().hits, 1)
+
+    def test_conditional(self):
+        """Тест выражения с if: вычисляется только выбранная ветвь."""
+        memo = SubresultMemo()
+        results = list(memo.evaluate_many(["if(1 < 2, 3, 4)", "if(2 - 2, 1 / 0, 5)"]))
+        self.assertEqual([r.value for r in results], [3, 5])
+        self.assertEqual(memo.evaluate("x ?4 1 0 / :1 2", {"x": 0}), 2)
+
+    def test_threads(self):
+        """Тест общей памяти с вытеснением при вычислении из потоков."""
+        memo = SubresultMemo(maxsize=16)
+        expressions = [f"{i % 40} 1 + {i % 7} * 2 ^" for i in range(3000)]
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(memo.evaluate, expressions))
+        self.assertEqual(results, [evaluate_rpn(e) for e in expressions])
+        info = memo.cache_info()
+        self.assertEqual(info.hits + info.misses, 3 * len(expressions))
+
+    def test_cache_clear(self):
+        """Тест очистки памяти."""
+        memo = SubresultMemo()
+        memo.evaluate("1 2 +")
+        memo.cache_clear()
+        self.assertEqual(memo.cache_info(), MemoInfo(0, 0, 0, 65536, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
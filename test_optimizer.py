@@ -0,0 +1,100 @@
+import unittest
+from calc import evaluate_rpn
+from optimizer import optimize
+from shunting_yard import shunting_yard
+
+COMPLEX_EXPRESSION = "15/(7-(1+1))*3-(2+(1+1))*15/(7-(200+1))*3-(2+(1+1))*(15/(7-(1+1))*3-(2+(1+1))+15/(7-(1+1))*3-(2+(1+1)))"
+
+
+class TestOptimize(unittest.TestCase):
+    """Тесты для функции optimize."""
+
+    def test_constant_folding(self):
+        """Тест свертки константного выражения."""
+        optimized = optimize(shunting_yard(COMPLEX_EXPRESSION))
+        self.assertAlmostEqual(optimized.evaluate(), -30.072164948453608, places=10)
+        self.assertEqual(optimized.operations_after, 0)
+        self.assertEqual(optimized.removed, optimized.operations_before)
+
+    def test_fold_sin_and_pi(self):
+        """Тест свертки подвыражений с sin и pi."""
+        optimized = optimize(shunting_yard("x * sin(pi / 2)", ["x"]), ["x"])
+        self.assertEqual(optimized.operations_after, 1)
+        self.assertEqual(optimized.folded, 2)
+        self.assertAlmostEqual(optimized.evaluate({"x": 3}), 3.0, places=10)
+
+    def test_common_subexpressions(self):
+        """Тест устранения повторяющихся подвыражений."""
+        expression = "(x + 1) * (x + 1) - sin(x + 1) / (x + 1)"
+        rpn = shunting_yard(expression, ["x"])
+        optimized = optimize(rpn, ["x"])
+        self.assertEqual(optimized.operations_before, 8)
+        self.assertEqual(optimized.operations_after, 5)
+        self.assertEqual(optimized.removed, 3)
+        for x in (0.5, 2.0, -3.0):
+            self.assertAlmostEqual(
+                optimized.evaluate({"x": x}),
+                evaluate_rpn(" ".join(rpn), {"x": x}),
+                places=10,
+            )
+
+    def test_variable_division_by_zero(self):
+        """Тест деления на ноль с переменной во время вычисления."""
+        optimized = optimize("x 0 /", ["x"])
+        with self.assertRaises(ValueError) as context:
+            optimized.evaluate({"x": 1})
+        self.assertIn("Деление на ноль", str(context.exception))
+
+    def test_constant_division_by_zero_not_folded(self):
+        """Тест того, что деление на ноль не сворачивается и падает при вычислении."""
+        optimized = optimize(shunting_yard("1 + 1 / (2 - 2)"))
+        self.assertEqual(optimized.operations_after, 2)
+        with self.assertRaises(ValueError) as context:
+            optimized.evaluate()
+        self.assertIn("Деление на ноль", str(context.exception))
+
+    def test_missing_variable_error(self):
+        """Тест ошибки отсутствующей переменной."""
+        with self.assertRaises(ValueError) as context:
+            optimize("x 1 +", ["x"]).evaluate({})
+        self.assertIn("Неизвестный токен: x", str(context.exception))
+
+    def test_conditional(self):
+        """Тест if с условием от переменной: вычисляется только выбранная ветвь."""
+        rpn = shunting_yard("if(x < 2, 1 / x, x + 1) + (x + 1)", ["x"])
+        optimized = optimize(rpn, ["x"])
+        self.assertEqual(optimized.operations_before, 6)
+        self.assertEqual(optimized.operations_after, 6)
+        self.assertEqual(optimized.evaluate({"x": 0.5}), 3.5)
+        self.assertEqual(optimized.evaluate({"x": 3}), 8.0)
+        with self.assertRaisesRegex(ValueError, "Деление на ноль"):
+            optimized.evaluate({"x": 0})
+
+    def test_constant_conditional(self):
+        """Тест if с постоянным условием: остается только выбранная ветвь."""
+        rpn = shunting_yard("if(1 < 2, x * 2, 1 / 0) + if(0, 1 / 0, if(x, 3, 4))", ["x"])
+        optimized = optimize(rpn, ["x"])
+        self.assertEqual(optimized.folded, 3)
+        self.assertEqual(optimized.operations_after, 3)
+        self.assertEqual(optimized.evaluate({"x": 1}), 5.0)
+        self.assertEqual(optimized.evaluate({"x": 0}), 4.0)
+
+    def test_structure_errors(self):
+        """Тест ошибок структуры выражения."""
+        cases = {
+            "3 +": "Недостаточно операндов для операции",
+            "sin": "Недостаточно операндов для функции",
+            "3 4 cos": "Неизвестный токен: cos",
+            "3 4 + 5": "Некорректное выражение",
+            "?2 1 :1 2": "Недостаточно операндов для условия",
+            "1 ?3 1 :1 2": "Некорректный переход: ?3",
+            "1 ?2 1 :2 2": "Некорректный переход: :2",
+        }
+        for rpn, message in cases.items():
+            with self.assertRaises(ValueError) as context:
+                optimize(rpn)
+            self.assertIn(message, str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.generator import Profile, generate
+from calc import evaluate_tokens
+from parallel import parallel_evaluate, parallel_shunting_yard, split_expression
+from shunting_yard import shunting_yard
+
+
+class TestSplitExpression(unittest.TestCase):
+    """Тесты для функции split_expression."""
+
+    def test_top_level_operators(self):
+        """Тест разрезания по + и - вне скобок."""
+        expression = "(1+2) - 3e-4 + (4-5)*2 - 1"
+        self.assertEqual(split_expression(expression, 1), [6, 13, 23])
+        self.assertEqual(split_expression(expression, 10), [6, 23])
+        self.assertEqual(split_expression(expression, 100), [6])
+
+    def test_no_split(self):
+        """Тест выражений без операторов + и - вне скобок."""
+        self.assertEqual(split_expression("2 * (1 + 2) ^ 3", 1), [])
+        self.assertEqual(split_expression("1e-3", 1), [])
+        self.assertEqual(split_expression("", 1), [])
+
+    def test_comparisons_and_conditional(self):
+        """Тест разрезания по сравнениям и только вне аргументов if."""
+        self.assertEqual(split_expression("1 + 2 < 3 * 4 == 1", 1), [6, 14])
+        self.assertEqual(split_expression("if(1, 2 + 3, 4) + 5 - 1", 1), [16, 20])
+
+    def test_invalid_size(self):
+        """Тест ошибки неположительного размера части."""
+        with self.assertRaises(ValueError):
+            split_expression("1 + 2", 0)
+
+
+class TestParallelShuntingYard(unittest.TestCase):
+    """Тесты для функции parallel_shunting_yard."""
+
+    def convert(self, expression, variables=(), segment_size=8):
+        return parallel_shunting_yard(expression, variables, 2, segment_size, ThreadPoolExecutor)
+
+    def test_matches_shunting_yard(self):
+        """Тест совпадения с последовательным преобразованием."""
+        for profile in [
+            Profile(size=30),
+            Profile(size=5, depth=4),
+            Profile(size=20, pow_chain=4, pow_density=0.5),
+            Profile(size=20, function_density=0.6),
+        ]:
+            for expression in generate(profile, 20):
+                for segment_size in (1, 8, 50):
+                    self.assertEqual(self.convert(expression, segment_size=segment_size), shunting_yard(expression))
+
+    def test_associativity(self):
+        """Тест склейки частей с левоассоциативными операторами."""
+        self.assertEqual(self.convert("1 - 2 - 3 + 4", segment_size=1), ["1", "2", "-", "3", "-", "4", "+"])
+        self.assertEqual(
+            self.convert("2 ^ 3 ^ 2 - 8 / 4 / 2 - x", ["x"], 1),
+            ["2", "3", "2", "^", "^", "8", "4", "/", "2", "/", "-", "x", "-"],
+        )
+
+    def test_malformed_expression(self):
+        """Тест некорректных выражений: результат и ошибки как у shunting_yard."""
+        for expression in ["1 + 2 ) * 3 - 4", "1 - (2 + 3", "1 + - 2 - 3", "1 - 2 2 - 3"]:
+            self.assertEqual(self.convert(expression, segment_size=1), shunting_yard(expression))
+        with self.assertRaisesRegex(ValueError, "Неизвестная функция или константа: y"):
+            self.convert("1 - 2 - y", segment_size=1)
+
+    def test_conditional(self):
+        """Тест выражения с if и сравнениями."""
+        expression = "if(x > 1, 1 - x, 2) - 3 < x + if(1, 2 - 1, 3) != 0"
+        self.assertEqual(self.convert(expression, ["x"], 1), shunting_yard(expression, ["x"]))
+
+    def test_process_pool(self):
+        """Тест пула процессов."""
+        expression = " + ".join(generate(Profile(size=10), 50))
+        self.assertEqual(parallel_shunting_yard(expression, workers=2, segment_size=200), shunting_yard(expression))
+
+
+class TestParallelEvaluate(unittest.TestCase):
+    """Тесты для функции parallel_evaluate."""
+
+    def evaluate(self, expression, variables=None, segment_size=8):
+        return parallel_evaluate(expression, variables, 2, segment_size, ThreadPoolExecutor)
+
+    def test_matches_sequential(self):
+        """Тест побитового совпадения с последовательным вычислением."""
+        variables = {"x": 0.1}
+        expression = " - ".join(f"{i} * x / 3 + sin(x + {i}) - 0.{i} ^ 2" for i in range(1, 60))
+        expected = evaluate_tokens(shunting_yard(expression, variables), variables)
+        for segment_size in (1, 20, 200):
+            self.assertEqual(self.evaluate(expression, variables, segment_size), expected)
+
+    def test_conditional_is_lazy(self):
+        """Тест того, что невыбранная ветвь if не вычисляется в части."""
+        self.assertEqual(self.evaluate("if(0, 1 / 0, 2) + if(1, 3, 1 / 0) - 1 < 5", segment_size=1), 1.0)
+
+    def test_first_error(self):
+        """Тест ошибки вычисления в одной из частей."""
+        with self.assertRaisesRegex(ValueError, "Деление на ноль"):
+            self.evaluate("1 - 2 + 3 / 0 - 4 / (2 - 2)", segment_size=1)
+
+    def test_malformed_expression(self):
+        """Тест некорректного выражения: ошибка как при последовательном вычислении."""
+        with self.assertRaisesRegex(ValueError, "Недостаточно операндов"):
+            self.evaluate("2 - * 3 - 1 / 0", segment_size=1)
+        with self.assertRaisesRegex(ValueError, "Неизвестная функция или константа: x"):
+            self.evaluate("1 - x - 2", {"y": 1}, segment_size=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
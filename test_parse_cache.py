@@ -0,0 +1,111 @@
+import math
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from parse_cache import ParseCache, normalize
+from registry import register_constant, register_function, unregister
+from shunting_yard import shunting_yard
+
+
+class TestParseCache(unittest.TestCase):
+    """Тесты для класса ParseCache."""
+
+    def test_result_matches_shunting_yard(self):
+        """Тест результата разбора."""
+        cache = ParseCache()
+        self.assertEqual(cache.shunting_yard("3 + 4 * 2"), ("3", "4", "2", "*", "+"))
+
+    def test_hits_and_misses(self):
+        """Тест подсчета попаданий и промахов."""
+        cache = ParseCache()
+        first = cache.shunting_yard("3 + 4")
+        second = cache.shunting_yard("  3   +\t4 ")
+        self.assertIs(first, second)
+        info = cache.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def test_whitespace_is_significant_between_digits(self):
+        """Тест того, что нормализация не склеивает числа."""
+        self.assertNotEqual(normalize("1 2"), normalize("12"))
+
+    def test_variables_are_part_of_key(self):
+        """Тест того, что набор переменных входит в ключ."""
+        cache = ParseCache()
+        self.assertEqual(cache.shunting_yard("x + 1", ["x"]), ("x", "1", "+"))
+        with self.assertRaises(ValueError):
+            cache.shunting_yard("x + 1")
+
+    def test_result_is_immutable(self):
+        """Тест неизменяемости результата."""
+        rpn = ParseCache().shunting_yard("1 + 2")
+        with self.assertRaises(TypeError):
+            rpn[0] = "5"
+
+    def test_evicts_least_recently_used(self):
+        """Тест вытеснения давно не использовавшейся записи."""
+        cache = ParseCache(maxsize=2)
+        cache.shunting_yard("1 + 1")
+        cache.shunting_yard("2 + 2")
+        cache.shunting_yard("1 + 1")
+        cache.shunting_yard("3 + 3")
+        cache.shunting_yard("1 + 1")
+        info = cache.cache_info()
+        self.assertEqual((info.hits, info.evictions, info.currsize), (2, 1, 2))
+        cache.shunting_yard("2 + 2")
+        self.assertEqual(cache.cache_info().misses, 4)
+
+    def test_byte_limit(self):
+        """Тест ограничения суммарного размера."""
+        cache = ParseCache(maxbytes=2000)
+        for i in range(50):
+            cache.shunting_yard(f"{i} + {i} * {i}")
+        info = cache.cache_info()
+        self.assertLessEqual(info.currbytes, 2000)
+        self.assertGreater(info.evictions, 0)
+
+    def test_errors_are_not_cached(self):
+        """Тест того, что ошибки не кэшируются."""
+        cache = ParseCache()
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                cache.shunting_yard("cos(1)")
+        self.assertEqual(cache.cache_info().currsize, 0)
+
+    def test_registry_change(self):
+        """Тест того, что после изменения реестра записи разбираются заново."""
+        cache = ParseCache()
+        self.assertEqual(cache.shunting_yard("e + 1", ["e"]), ("e", "1", "+"))
+        register_constant("e", math.e)
+        self.addCleanup(unregister, "e")
+        self.assertEqual(cache.shunting_yard("e + 1", ["e"]), ("e", "1", "+"))
+        self.assertEqual(cache.cache_info().misses, 2)
+        register_function("cos", math.cos)
+        self.assertEqual(cache.shunting_yard("cos(1)"), ("1", "cos"))
+        unregister("cos")
+        with self.assertRaisesRegex(ValueError, "Неизвестная функция или константа: cos"):
+            cache.shunting_yard("cos(1)")
+
+    def test_cache_clear(self):
+        """Тест очистки кэша."""
+        cache = ParseCache()
+        cache.shunting_yard("1 + 1")
+        cache.shunting_yard("1 + 1")
+        cache.cache_clear()
+        self.assertEqual(cache.cache_info(), (0, 0, 0, cache.maxsize, cache.maxbytes, 0, 0))
+
+
+    def test_threads(self):
+        """Тест согласованности записей и статистики при доступе из потоков."""
+        cache = ParseCache(maxsize=50)
+        expressions = [f"{i % 80} + {i % 80} * 2" for i in range(4000)]
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(cache.shunting_yard, expressions))
+        self.assertEqual(results, [tuple(shunting_yard(e)) for e in expressions])
+        info = cache.cache_info()
+        self.assertEqual(info.hits + info.misses, len(expressions))
+        self.assertLessEqual(info.currsize, 50)
+        sizes = [size for _, size in cache._entries.values()]
+        self.assertEqual(info.currbytes, sum(sizes))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import sys
+import unittest
+
+from parsing import ENGINES, Node, parse, parse_ast, to_ast, to_rpn
+from registry import register_function, unregister
+from validation import ParseError
+
+
+class TestParse(unittest.TestCase):
+    """Тесты для функций parse и parse_ast."""
+
+    def test_engines_agree(self):
+        """Тест одинаковой ПОЛИЗ у всех способов."""
+        expression = "3 + 4 * 2 / (1 - x) ^ 2 ^ 3 - sin(pi)"
+        expected = parse(expression, variables=["x"])
+        for engine in ENGINES:
+            self.assertEqual(parse(expression, engine, ["x"]), expected)
+
+    def test_unknown_engine(self):
+        """Тест неизвестного способа разбора."""
+        with self.assertRaisesRegex(ValueError, "Неизвестный способ разбора: lalr"):
+            parse("1", "lalr")
+
+    def test_strict_engines(self):
+        """Тест ошибок разбора строгих способов."""
+        self.assertEqual(parse("1 +"), ["1", "+"])
+        for engine in ("strict", "pratt"):
+            with self.assertRaises(ParseError):
+                parse("1 +", engine)
+
+    def test_ast(self):
+        """Тест синтаксического дерева."""
+        self.assertEqual(
+            parse_ast("1 - sin(x) * 2", variables=["x"]),
+            Node("-", (Node("1"), Node("*", (Node("sin", (Node("x"),)), Node("2"))))),
+        )
+        self.assertEqual(parse_ast("pi"), Node("pi"))
+
+
+class TestTree(unittest.TestCase):
+    """Тесты для функций to_ast и to_rpn."""
+
+    def setUp(self):
+        register_function("max", max, 2)
+        self.addCleanup(unregister, "max")
+
+    def test_round_trip(self):
+        """Тест восстановления ПОЛИЗ по дереву."""
+        for expression in ["1", "max(1, 2 ^ 3 ^ 4) - pi", "((1 + 2) * (3 - 4)) / 5"]:
+            rpn = parse(expression)
+            self.assertEqual(to_rpn(to_ast(rpn)), rpn)
+
+    def test_conditional(self):
+        """Тест узла if и восстановления переходов по дереву."""
+        rpn = parse("if(x > 1, 2, max(x, 3)) * 2", variables=["x"])
+        tree = to_ast(rpn)
+        self.assertEqual(
+            tree.children[0],
+            Node("if", (Node(">", (Node("x"), Node("1"))), Node("2"), Node("max", (Node("x"), Node("3"))))),
+        )
+        self.assertEqual(to_rpn(tree), rpn)
+        with self.assertRaisesRegex(ValueError, "Некорректный переход: \\?2"):
+            to_ast(["1", "?2", "2"])
+
+    def test_deep_conditional(self):
+        """Тест вложенности if глубже предела рекурсии."""
+        depth = sys.getrecursionlimit() * 2
+        rpn = parse("if(x, " * depth + "7" + ", if(x, 2, 3))" * depth, variables=["x"])
+        self.assertEqual(to_rpn(to_ast(rpn)), rpn)
+
+    def test_function_arguments(self):
+        """Тест порядка аргументов функции."""
+        self.assertEqual(to_ast(["1", "2", "max"]), Node("max", (Node("1"), Node("2"))))
+
+    def test_invalid_rpn(self):
+        """Тест некорректной ПОЛИЗ."""
+        with self.assertRaisesRegex(ValueError, "Недостаточно операндов"):
+            to_ast(["1", "+"])
+        with self.assertRaisesRegex(ValueError, "не один элемент"):
+            to_ast(["1", "2"])
+        with self.assertRaisesRegex(ValueError, "не один элемент"):
+            to_ast([])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import random
+import sys
+import unittest
+
+from benchmarks.generator import Profile, generate
+from pratt import pratt
+from registry import register_function, unregister
+from shunting_yard import shunting_yard
+from validation import ParseError, strict_shunting_yard
+
+
+class TestPratt(unittest.TestCase):
+    """Тесты для функции pratt."""
+
+    def setUp(self):
+        register_function("max", max, 2)
+        self.addCleanup(unregister, "max")
+
+    def assertError(self, expression, message, position):
+        with self.assertRaises(ParseError) as context:
+            pratt(expression, ["x"])
+        self.assertEqual((context.exception.message, context.exception.position), (message, position))
+
+    def test_associativity(self):
+        """Тест приоритетов и ассоциативности."""
+        self.assertEqual(pratt("1 - 2 - 3"), ["1", "2", "-", "3", "-"])
+        self.assertEqual(pratt("2 ^ 3 ^ 2"), ["2", "3", "2", "^", "^"])
+        self.assertEqual(pratt("1 + 2 * 3 - 4"), ["1", "2", "3", "*", "+", "4", "-"])
+        self.assertEqual(pratt("(1 + 2) * 3"), ["1", "2", "+", "3", "*"])
+
+    def test_matches_shunting_yard(self):
+        """Тест совпадения с shunting_yard на выражениях разной формы."""
+        for expression in [
+            "3 + 4 * 2 / (1 - 5) ^ 2 ^ 3",
+            "max(1, sin(x)) * pi",
+            "1.5e-3 - max(max(1, 2 * x), 3 ^ x ^ 2)",
+        ]:
+            self.assertEqual(pratt(expression, ["x"]), shunting_yard(expression, ["x"]))
+        for profile in [
+            Profile(size=20),
+            Profile(size=2, depth=30),
+            Profile(size=10, pow_chain=8, pow_density=0.5),
+            Profile(size=10, function_density=0.6),
+        ]:
+            for expression in generate(profile, 50):
+                self.assertEqual(pratt(expression), shunting_yard(expression))
+
+    def test_deep_nesting(self):
+        """Тест вложенности глубже предела рекурсии."""
+        depth = sys.getrecursionlimit() * 2
+        expression = "(" * depth + "1" + ")" * depth + " ^ 2" * depth
+        self.assertEqual(pratt(expression), shunting_yard(expression))
+
+    def test_conditional(self):
+        """Тест условной функции if и операторов сравнения."""
+        for expression in ["if(x < 1, max(x, 2), 3 ^ x) * 2", "if(if(1, x, 0), 1, 2) != 1 <= 2"]:
+            self.assertEqual(pratt(expression, ["x"]), shunting_yard(expression, ["x"]))
+        self.assertError("if(1, 2, 3, 4)", "Функция if ожидает аргументов: 3, передано: 4", 13)
+
+    def test_errors(self):
+        """Тест ошибок разбора."""
+        self.assertError("1 2", "Ожидается оператор", 2)
+        self.assertError("1 +", "Неожиданный конец выражения", 3)
+        self.assertError("1 ) + 2", "Непарная закрывающая скобка", 2)
+        self.assertError("1 + (2 * 3", "Незакрытая скобка", 4)
+        self.assertError("()", "Пустые скобки", 1)
+        self.assertError("sin 1", "После функции sin ожидается (", 4)
+        self.assertError("max(1)", "Функция max ожидает аргументов: 2, передано: 1", 5)
+        self.assertError("(1, 2)", "Запятая вне аргументов функции", 2)
+        self.assertError("1 + q", "Неизвестная функция или константа: q", 4)
+        self.assertError("1 + $", "Неизвестный символ: $", 4)
+
+    def test_matches_strict_on_random_input(self):
+        """Тест совпадения результата и ошибок со strict_shunting_yard."""
+        rng = random.Random(0)
+        alphabet = ["1", "2.5", "x", "pi", "sin", "max", "(", ")", ",", "+", "-", "^", "$"]
+        for _ in range(2000):
+            expression = " ".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+            try:
+                expected = strict_shunting_yard(expression, ["x"])
+            except ParseError as e:
+                with self.assertRaises(ParseError) as context:
+                    pratt(expression, ["x"])
+                self.assertEqual(
+                    (context.exception.message, context.exception.position),
+                    (e.message, e.position),
+                    expression,
+                )
+            else:
+                self.assertEqual(pratt(expression, ["x"]), expected, expression)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import math
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from calc import evaluate_rpn
+from program import Bundle, compile_program, write_bundle
+from shunting_yard import shunting_yard
+
+EXPRESSIONS = [
+    "3 + 4 * 2",
+    "2 ^ 3 ^ 2",
+    "sin(pi / 2) * 2",
+    "3 + 4 * 2 / (1 - 5) ^ 2 ^ 3",
+    "15/(7-(1+1))*3-(2+(1+1))*15/(7-(200+1))*3",
+    "42",
+]
+
+
+class TestCompileProgram(unittest.TestCase):
+    """Тесты для функции compile_program."""
+
+    def test_matches_evaluate_rpn(self):
+        """Тест совпадения результата с evaluate_rpn."""
+        for expression in EXPRESSIONS:
+            rpn = shunting_yard(expression)
+            self.assertAlmostEqual(
+                compile_program(rpn).evaluate(),
+                evaluate_rpn(" ".join(rpn)),
+                places=10,
+                msg=expression,
+            )
+
+    def test_rpn_string(self):
+        """Тест выражения в виде строки."""
+        self.assertEqual(compile_program("3 4 2 * +").evaluate(), 11.0)
+
+    def test_max_depth(self):
+        """Тест вычисления максимальной глубины стека."""
+        self.assertEqual(compile_program("1 2 +").max_depth, 2)
+        self.assertEqual(compile_program("1 2 3 4 ^ ^ ^").max_depth, 4)
+        self.assertEqual(compile_program("pi sin").max_depth, 1)
+
+    def test_shared_stack(self):
+        """Тест повторного использования стека программами разной глубины и потоками."""
+        shallow = compile_program("1 2 +")
+        deep = compile_program(" ".join(["1"] * 50 + ["+"] * 49))
+        self.assertEqual(shallow.evaluate(), 3.0)
+        self.assertEqual(deep.evaluate(), 50.0)
+        self.assertEqual(shallow.evaluate(), 3.0)
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(lambda p: p.evaluate(), [shallow, deep] * 100))
+        self.assertEqual(results, [3.0, 50.0] * 100)
+
+    def test_division_by_zero_error(self):
+        """Тест ошибки деления на ноль."""
+        with self.assertRaises(ValueError) as context:
+            compile_program("10 0 /").evaluate()
+        self.assertIn("Деление на ноль", str(context.exception))
+
+    def test_power_errors(self):
+        """Тест ошибок возведения в степень, согласованных с evaluate_rpn."""
+        with self.assertRaisesRegex(ValueError, "Возведение отрицательного числа в дробную степень"):
+            compile_program(shunting_yard("(0 - 1) ^ 0.5")).evaluate()
+        rpn = shunting_yard("0 ^ (0 - 1)")
+        with self.assertRaises(ZeroDivisionError):
+            evaluate_rpn(" ".join(rpn))
+        with self.assertRaises(ZeroDivisionError):
+            compile_program(rpn).evaluate()
+        self.assertEqual(compile_program("0 1 - 3 ^").evaluate(), -1.0)
+
+    def test_compile_errors(self):
+        """Тест ошибок, обнаруживаемых при компиляции."""
+        cases = {
+            "3 +": "Недостаточно операндов для операции",
+            "sin": "Недостаточно операндов для функции",
+            "3 4 cos": "Неизвестный токен: cos",
+            "3 4 + 5": "Некорректное выражение",
+            "": "Некорректное выражение",
+        }
+        for rpn, message in cases.items():
+            with self.assertRaises(ValueError) as context:
+                compile_program(rpn)
+            self.assertIn(message, str(context.exception))
+
+
+class TestBundle(unittest.TestCase):
+    """Тесты для пакета программ."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "formulas.rpnb")
+
+    def test_round_trip(self):
+        """Тест записи и чтения пакета."""
+        programs = [compile_program(shunting_yard(e)) for e in EXPRESSIONS]
+        self.assertEqual(write_bundle(self.path, programs), len(programs))
+        with Bundle(self.path) as bundle:
+            self.assertEqual(len(bundle), len(programs))
+            for index, program in enumerate(programs):
+                self.assertEqual(bundle.evaluate(index), program.evaluate())
+            self.assertEqual(bundle.program(2), programs[2])
+
+    def test_program_outlives_bundle(self):
+        """Тест того, что программа пакета остается пригодной после закрытия."""
+        expected = compile_program(shunting_yard(EXPRESSIONS[0]))
+        write_bundle(self.path, [expected])
+        with Bundle(self.path) as bundle:
+            program = bundle.program(0)
+        self.assertEqual(program, expected)
+        self.assertEqual(program.evaluate(), expected.evaluate())
+
+    def test_pi_precision(self):
+        """Тест точного сохранения констант."""
+        write_bundle(self.path, [compile_program("pi")])
+        with Bundle(self.path) as bundle:
+            self.assertEqual(bundle.evaluate(0), math.pi)
+
+    def test_index_error(self):
+        """Тест ошибки неверного номера программы."""
+        write_bundle(self.path, [compile_program("1")])
+        with Bundle(self.path) as bundle:
+            with self.assertRaises(IndexError):
+                bundle.evaluate(1)
+
+    def test_invalid_file(self):
+        """Тест ошибки при открытии файла другого формата."""
+        with open(self.path, "wb") as file:
+            file.write(b"not a bundle at all")
+        with self.assertRaises(ValueError):
+            Bundle(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
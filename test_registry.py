@@ -0,0 +1,129 @@
+import math
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from calc import evaluate_rpn
+from calculator import evaluate_infix
+from compiler import compile
+from registry import (
+    get_precedence,
+    is_function,
+    is_right_associative,
+    register_constant,
+    register_function,
+    snapshot,
+    unregister,
+)
+from shunting_yard import shunting_yard
+
+
+class TestRegistry(unittest.TestCase):
+    """Тесты для реестра операторов, функций и констант."""
+
+    def register_function(self, name, implementation, arity=1):
+        register_function(name, implementation, arity)
+        self.addCleanup(unregister, name)
+
+    def test_builtin_symbols(self):
+        """Тест встроенных операторов и функций."""
+        self.assertEqual(get_precedence("+"), 1)
+        self.assertEqual(get_precedence("/"), 2)
+        self.assertEqual(get_precedence("^"), 3)
+        self.assertEqual(get_precedence("sin"), 4)
+        self.assertTrue(is_right_associative("^"))
+        self.assertFalse(is_right_associative("-"))
+
+    def test_register_function(self):
+        """Тест регистрации функции одного аргумента."""
+        self.register_function("cos", math.cos)
+        self.assertTrue(is_function("cos"))
+        rpn = shunting_yard("cos(0) * 2")
+        self.assertEqual(rpn, ["0", "cos", "2", "*"])
+        self.assertEqual(evaluate_rpn(" ".join(rpn)), 2.0)
+        self.assertEqual(evaluate_infix("cos(0) * 2"), 2.0)
+        self.assertEqual(compile("cos(x)")(x=0), 1.0)
+
+    def test_two_argument_function(self):
+        """Тест функции двух аргументов."""
+        self.register_function("max", max, 2)
+        rpn = shunting_yard("max(1 + 2, 3 * 4) - 1")
+        self.assertEqual(rpn, ["1", "2", "+", "3", "4", "*", "max", "1", "-"])
+        self.assertEqual(evaluate_rpn(" ".join(rpn)), 11.0)
+        self.assertEqual(evaluate_infix("max(1 + 2, 3 * 4) - 1"), 11.0)
+        self.assertEqual(compile("max(x, 2)")(x=5), 5.0)
+
+    def test_insufficient_operands_function(self):
+        """Тест ошибки недостаточно операндов для функции двух аргументов."""
+        self.register_function("min", min, 2)
+        with self.assertRaises(ValueError) as context:
+            evaluate_rpn("1 min")
+        self.assertIn("Недостаточно операндов для функции", str(context.exception))
+
+    def test_register_constant(self):
+        """Тест регистрации константы."""
+        register_constant("e", math.e)
+        self.addCleanup(unregister, "e")
+        self.assertEqual(shunting_yard("e * 2"), ["e", "2", "*"])
+        self.assertAlmostEqual(evaluate_rpn("e 2 *"), math.e * 2, places=10)
+
+    def test_unregister(self):
+        """Тест удаления функции."""
+        register_function("sqrt", math.sqrt)
+        unregister("sqrt")
+        with self.assertRaises(ValueError):
+            shunting_yard("sqrt(4)")
+
+    def test_invalid_registration(self):
+        """Тест ошибок регистрации."""
+        with self.assertRaises(ValueError):
+            register_function("log10", math.log10)
+        with self.assertRaises(ValueError):
+            register_function("f", math.sin, arity=0)
+        with self.assertRaises(ValueError):
+            unregister("+")
+        with self.assertRaises(ValueError):
+            unregister("cos")
+        with self.assertRaisesRegex(ValueError, "Имя занято условной функцией: if"):
+            register_constant("if", 1.0)
+
+
+    def test_registration_from_threads(self):
+        """Тест регистрации и вычисления из нескольких потоков."""
+        names = ["f" + "".join(chr(ord("a") + int(d)) for d in str(i)) for i in range(50)]
+
+        def register_and_evaluate(index):
+            name = names[index]
+            register_function(name, lambda x: x + index)
+            self.addCleanup(unregister, name)
+            return evaluate_rpn(f"1 {name}")
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(register_and_evaluate, range(50)))
+        self.assertEqual(results, [1.0 + i for i in range(50)])
+        self.assertTrue(all(is_function(name) for name in names))
+
+    def test_snapshot_during_registration(self):
+        """Тест перебора копии таблицы во время регистрации в другом потоке."""
+        names = ["fsnap" + chr(ord("a") + i) for i in range(20)]
+
+        def register_and_unregister():
+            for _ in range(50):
+                for name in names:
+                    register_function(name, abs)
+                for name in names:
+                    unregister(name)
+
+        with ThreadPoolExecutor(1) as executor:
+            writer = executor.submit(register_and_unregister)
+            while not writer.done():
+                symbols = snapshot()
+                for name, symbol in symbols.items():
+                    self.assertIsNotNone(symbol.kind)
+            writer.result()
+        copy = snapshot()
+        del copy["+"]
+        self.assertEqual(get_precedence("+"), 1)
+        self.assertFalse(any(is_function(name) for name in names))
+
+
+if __name__ == "__main__":
+    unittest.main()
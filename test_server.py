@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from client import Client
+from server import OFFLOAD_SIZE, CalculatorServer, handle_request
+
+
+class TestHandleRequest(unittest.TestCase):
+    """Тесты для функции handle_request."""
+
+    def request(self, record):
+        return json.loads(handle_request(json.dumps(record).encode()))
+
+    def test_infix(self):
+        """Тест вычисления выражения в инфиксной записи."""
+        response = self.request({"id": 1, "expression": "3 + 4 * 2"})
+        self.assertEqual(response, {"id": 1, "expression": "3 + 4 * 2", "result": 11})
+
+    def test_rpn(self):
+        """Тест вычисления выражения в ПОЛИЗ."""
+        response = self.request({"expression": "3 4 2 * +", "rpn": True})
+        self.assertEqual(response["result"], 11)
+
+    def test_error(self):
+        """Тест ошибки вычисления."""
+        response = self.request({"expression": "1 / 0"})
+        self.assertEqual(response["error"], "Деление на ноль")
+
+    def test_invalid_record(self):
+        """Тест некорректного запроса."""
+        response = json.loads(handle_request(b"not json\n"))
+        self.assertIn("error", response)
+
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+    """Тесты для сервера и клиента."""
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "calc.sock")
+        self.server = CalculatorServer(max_connections=2)
+        await self.server.start_unix(self.path)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.directory.cleanup()
+
+    async def test_evaluate(self):
+        """Тест вычисления одного выражения."""
+        async with await Client.connect_unix(self.path) as client:
+            self.assertEqual(await client.evaluate("2 ^ 3"), 8)
+            self.assertEqual(await client.evaluate("2 3 ^", rpn=True), 8)
+            with self.assertRaisesRegex(ValueError, "Деление на ноль"):
+                await client.evaluate("1 / 0")
+
+    async def test_pipeline_order(self):
+        """Тест порядка ответов при конвейерной отправке."""
+        expressions = [f"{i} * 2" for i in range(2000)]
+        async with await Client.connect_unix(self.path) as client:
+            responses = await client.evaluate_many(expressions)
+        self.assertEqual([r["result"] for r in responses], [i * 2 for i in range(2000)])
+
+    async def test_concurrent_clients(self):
+        """Тест одновременных клиентов сверх max_connections."""
+
+        async def work(n):
+            async with await Client.connect_unix(self.path) as client:
+                return [r["result"] for r in await client.evaluate_many([f"{n} + 1"] * 50)]
+
+        results = await asyncio.gather(*(work(n) for n in range(5)))
+        self.assertEqual(results, [[n + 1] * 50 for n in range(5)])
+        self.assertEqual(self.server.requests, 250)
+
+    async def test_long_request_does_not_block_others(self):
+        """Тест того, что длинное выражение не задерживает другие соединения."""
+        expression = "1 + " * 2000 + "1"
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking_handle_request(line):
+            # Длинный запрос ждет, пока тест не получит ответ на короткий
+            if len(line) > OFFLOAD_SIZE:
+                started.set()
+                release.wait(5)
+            return handle_request(line)
+
+        with mock.patch("server.handle_request", blocking_handle_request):
+            async with await Client.connect_unix(self.path) as slow, \
+                    await Client.connect_unix(self.path) as fast:
+                long_request = asyncio.create_task(slow.evaluate(expression))
+                self.assertTrue(await asyncio.to_thread(started.wait, 5))
+                self.assertEqual(await fast.evaluate("2 + 2"), 4)
+                self.assertFalse(long_request.done())
+                release.set()
+                self.assertEqual(await long_request, 2001)
+
+    async def test_tcp(self):
+        """Тест подключения по TCP."""
+        server = CalculatorServer()
+        port = await server.start_tcp()
+        try:
+            async with await Client.connect_tcp("127.0.0.1", port) as client:
+                self.assertEqual(await client.evaluate("pi - pi"), 0)
+        finally:
+            await server.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
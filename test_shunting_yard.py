@@ -1,5 +1,12 @@
+import sys
 import unittest
-from shunting_yard import shunting_yard
+from shunting_yard import (
+    iter_shunting_yard,
+    iter_tokens,
+    iter_tokens_chunked,
+    shunting_yard,
+    tokenize,
+)
 
 
 class TestShuntingYard(unittest.TestCase):
@@ -31,6 +38,16 @@ class TestShuntingYard(unittest.TestCase):
         self.assertEqual(shunting_yard("3+4*2"), ["3", "4", "2", "*", "+"])
         self.assertEqual(shunting_yard("10-5/2"), ["10", "5", "2", "/", "-"])
 
+    def test_decimal_literals(self):
+        """Тест десятичных дробей и экспоненциальной записи."""
+        self.assertEqual(
+            tokenize("1.5e-3*2 + 2E+2 - 0.25/1e2"),
+            ["1.5e-3", "*", "2", "+", "2E+2", "-", "0.25", "/", "1e2"],
+        )
+        self.assertEqual(tokenize("2e-x"), ["2", "e", "-", "x"])
+        with self.assertRaisesRegex(ValueError, "Неизвестный символ: ."):
+            tokenize("1.")
+
     def test_expression_with_parentheses(self):
         """Тест выражений с круглыми скобками."""
         self.assertEqual(shunting_yard("(3 + 4) * 2"), ["3", "4", "+", "2", "*"])
@@ -104,6 +121,19 @@ class TestShuntingYard(unittest.TestCase):
             ["2", "3", "+", "sin", "3", "/", "pi", "*"],
         )
 
+    def test_variables(self):
+        """Тест переменных."""
+        self.assertEqual(shunting_yard("x * 2", ["x"]), ["x", "2", "*"])
+        self.assertEqual(
+            shunting_yard("sin(x) + rate", ("x", "rate")), ["x", "sin", "rate", "+"]
+        )
+
+    def test_unknown_variable_error(self):
+        """Тест ошибки при незаявленной переменной."""
+        with self.assertRaises(ValueError) as context:
+            shunting_yard("x + y", ["x"])
+        self.assertIn("Неизвестная функция или константа: y", str(context.exception))
+
     def test_unknown_function_error(self):
         """Тест ошибки при парсинге неизвестной функции."""
         with self.assertRaises(ValueError) as context:
@@ -125,6 +155,102 @@ class TestShuntingYard(unittest.TestCase):
         ]
         self.assertEqual(shunting_yard(expression), expected)
 
+    def test_comparisons(self):
+        """Тест операторов сравнения с наименьшим приоритетом."""
+        self.assertEqual(tokenize("1<=2!=3"), ["1", "<=", "2", "!=", "3"])
+        self.assertEqual(
+            shunting_yard("1 + 2 < 3 * 4 == 1"),
+            ["1", "2", "+", "3", "4", "*", "<", "1", "=="],
+        )
+
+    def test_conditional(self):
+        """Тест условной функции if: ветви разделены переходами."""
+        self.assertEqual(
+            shunting_yard("if(x > 0, x, 0 - x) * 2", ["x"]),
+            ["x", "0", ">", "?2", "x", ":3", "0", "x", "-", "2", "*"],
+        )
+        self.assertEqual(
+            shunting_yard("if(1, if(0, 2, 3), 4)"),
+            ["1", "?6", "0", "?2", "2", ":1", "3", ":1", "4"],
+        )
+        self.assertEqual(shunting_yard("if + 1", ["if"]), ["if", "1", "+"])
+
+    def test_deep_conditional(self):
+        """Тест вложенности if глубже предела рекурсии."""
+        depth = sys.getrecursionlimit() * 2
+        rpn = shunting_yard("if(1, " * depth + "7" + ", 2)" * depth)
+        self.assertEqual(rpn[:3], ["1", f"?{4 * depth - 2}", "1"])
+        self.assertEqual(len(rpn), 4 * depth + 1)
+
+    def test_conditional_errors(self):
+        """Тест ошибок записи условной функции."""
+        with self.assertRaisesRegex(ValueError, "После функции if ожидается \\("):
+            shunting_yard("if + 1")
+        with self.assertRaisesRegex(ValueError, "Функция if ожидает аргументов: 3, передано: 2"):
+            shunting_yard("if(1, 2)")
+        with self.assertRaisesRegex(ValueError, "Неизвестный символ: ="):
+            shunting_yard("1 = 2")
+
+
+class TestStreamingPipeline(unittest.TestCase):
+    """Тесты для потоковых функций iter_tokens, iter_tokens_chunked и iter_shunting_yard."""
+
+    EXPRESSION = "sin(12 + pi) * 345 ^ 2 ^ 3 - (7/(100-1))"
+
+    def test_iter_tokens_is_lazy(self):
+        """Тест ленивой токенизации."""
+        tokens = iter_tokens("1 + 2 $")
+        self.assertEqual([next(tokens), next(tokens), next(tokens)], ["1", "+", "2"])
+        with self.assertRaises(ValueError):
+            next(tokens)
+
+    def test_long_literal(self):
+        """Тест длинного числа."""
+        literal = "9" * 100000
+        self.assertEqual(tokenize(f"{literal}+1"), [literal, "+", "1"])
+
+    def test_chunked_matches_tokenize(self):
+        """Тест совпадения токенизации по частям с обычной при любом разрезе."""
+        expected = tokenize(self.EXPRESSION)
+        for size in range(1, len(self.EXPRESSION) + 1):
+            chunks = [
+                self.EXPRESSION[i:i + size]
+                for i in range(0, len(self.EXPRESSION), size)
+            ]
+            self.assertEqual(list(iter_tokens_chunked(chunks)), expected)
+
+    def test_chunked_scientific_literals(self):
+        """Тест того, что знак порядка числа не разрезает число."""
+        expression = "1.5e-3*2e+10 - 4E-2"
+        expected = tokenize(expression)
+        for size in range(1, len(expression) + 1):
+            chunks = [expression[i:i + size] for i in range(0, len(expression), size)]
+            self.assertEqual(list(iter_tokens_chunked(chunks)), expected)
+
+    def test_chunked_comparisons(self):
+        """Тест того, что граница части не разрезает оператор сравнения."""
+        expression = "1<=2 != 3>=4==5<6"
+        expected = tokenize(expression)
+        for size in range(1, len(expression) + 1):
+            chunks = [expression[i:i + size] for i in range(0, len(expression), size)]
+            self.assertEqual(list(iter_tokens_chunked(chunks)), expected)
+
+    def test_iter_shunting_yard_is_lazy(self):
+        """Тест выдачи токенов ПОЛИЗ до конца входа."""
+        def tokens():
+            yield from ["1", "+", "2", "+"]
+            raise AssertionError("вход прочитан дальше, чем нужно")
+
+        rpn = iter_shunting_yard(tokens())
+        self.assertEqual([next(rpn), next(rpn), next(rpn)], ["1", "2", "+"])
+
+    def test_iter_shunting_yard_matches_shunting_yard(self):
+        """Тест совпадения с shunting_yard."""
+        self.assertEqual(
+            list(iter_shunting_yard(iter_tokens(self.EXPRESSION))),
+            shunting_yard(self.EXPRESSION),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,114 @@
+import io
+import unittest
+from unittest import mock
+
+import calc
+import shunting_yard
+from calc import evaluate_rpn
+from shunting_yard import tokenize
+from stats import Stats, token_kind
+
+
+class TestTokenKind(unittest.TestCase):
+    """Тесты для функции token_kind."""
+
+    def test_kinds(self):
+        """Тест определения видов токенов."""
+        self.assertEqual(token_kind("42"), "number")
+        self.assertEqual(token_kind("-5"), "number")
+        self.assertEqual(token_kind("+"), "operator")
+        self.assertEqual(token_kind("sin"), "function")
+        self.assertEqual(token_kind("pi"), "constant")
+        self.assertEqual(token_kind("x"), "variable")
+        self.assertEqual(token_kind("("), "parenthesis")
+        self.assertEqual(token_kind(","), "comma")
+        self.assertEqual(token_kind("<="), "operator")
+        self.assertEqual(token_kind("?3"), "jump")
+        self.assertEqual(token_kind("if"), "function")
+
+
+class TestStats(unittest.TestCase):
+    """Тесты сбора статистики."""
+
+    def test_results_unchanged(self):
+        """Тест совпадения результатов со статистикой и без нее."""
+        stats = Stats()
+        expression = "3 + 4 * (2 - sin(pi)) ^ 2"
+        self.assertEqual(
+            shunting_yard.shunting_yard(expression, stats=stats),
+            shunting_yard.shunting_yard(expression),
+        )
+        rpn = " ".join(shunting_yard.shunting_yard(expression))
+        self.assertEqual(evaluate_rpn(rpn, stats=stats), evaluate_rpn(rpn))
+
+    def test_tokens_and_calls(self):
+        """Тест подсчета токенов и вызовов фаз."""
+        stats = Stats()
+        shunting_yard.shunting_yard("(1 + x) * pi", ["x"], stats=stats)
+        self.assertEqual(stats.calls, {"tokenize": 1, "shunting_yard": 1, "evaluate": 0})
+        self.assertEqual(
+            dict(stats.tokens),
+            {"parenthesis": 2, "number": 1, "operator": 2, "variable": 1, "constant": 1},
+        )
+        self.assertGreaterEqual(stats.times["tokenize"], 0)
+
+    def test_stack_depths(self):
+        """Тест максимальной глубины стеков."""
+        stats = Stats()
+        shunting_yard.shunting_yard("1 + (2 * (3 - 4))", stats=stats)
+        # +, (, *, (, -
+        self.assertEqual(stats.max_operator_stack, 5)
+        evaluate_rpn("1 2 3 4 - * +", stats=stats)
+        self.assertEqual(stats.max_value_stack, 4)
+
+    def test_errors(self):
+        """Тест подсчета ошибок по фазам."""
+        stats = Stats()
+        with self.assertRaises(ValueError):
+            tokenize("1 $ 2", stats)
+        with self.assertRaises(ValueError):
+            evaluate_rpn("1 0 /", stats=stats)
+        self.assertEqual(stats.errors, {"tokenize": 1, "shunting_yard": 0, "evaluate": 1})
+
+    def test_report(self):
+        """Тест текстового отчета."""
+        stats = Stats()
+        evaluate_rpn("1 2 +", stats=stats)
+        report = stats.report()
+        self.assertIn("evaluate:", report)
+        self.assertIn("токены ПОЛИЗ: number 2, operator 1", report)
+        self.assertNotIn("tokenize:", report)
+
+
+class TestStatsFlag(unittest.TestCase):
+    """Тесты флага --stats."""
+
+    def run_main(self, main, stdin, argv):
+        with mock.patch("sys.stdin", io.StringIO(stdin)), mock.patch(
+            "sys.stdout", new_callable=io.StringIO
+        ) as stdout, mock.patch("sys.stderr", new_callable=io.StringIO) as stderr:
+            main(argv)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_shunting_yard_cli(self):
+        """Тест --stats в shunting_yard.py."""
+        stdout, stderr = self.run_main(shunting_yard.main, "1 + 2\n", ["--stats"])
+        self.assertEqual(stdout, "1 2 +\n")
+        self.assertIn("shunting_yard:", stderr)
+
+    def test_calc_cli_lines(self):
+        """Тест --stats в calc.py в построчном режиме."""
+        stdout, stderr = self.run_main(calc.main, "1 2 +\n1 0 /\n", ["--lines", "--stats"])
+        self.assertEqual(stdout, "3.0\n\n")
+        self.assertIn("evaluate: ", stderr)
+        self.assertIn("ошибок 1", stderr)
+
+    def test_workers_rejected(self):
+        """Тест несовместимости --stats с --workers."""
+        with mock.patch("sys.stderr", new_callable=io.StringIO):
+            with self.assertRaises(SystemExit):
+                calc.main(["--lines", "--stats", "--workers", "2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
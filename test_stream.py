@@ -0,0 +1,67 @@
+import io
+import json
+import unittest
+from contextlib import redirect_stderr
+from calc import evaluate_rpn
+from stream import stream_jsonl, stream_lines
+
+
+class TestStreamLines(unittest.TestCase):
+    """Тесты для функции stream_lines."""
+
+    def test_one_result_per_line(self):
+        """Тест одной выходной строки на каждую входную."""
+        lines = ["3 4 +\n", "\n", "2 3 ^\n"]
+        self.assertEqual(list(stream_lines(lines, evaluate_rpn)), ["7.0\n", "\n", "8.0\n"])
+
+    def test_continues_after_error(self):
+        """Тест продолжения обработки после ошибки."""
+        stderr = io.StringIO()
+        with redirect_stderr(stderr):
+            output = list(stream_lines(["10 0 /\n", "1 2 +\n"], evaluate_rpn))
+        self.assertEqual(output, ["\n", "3.0\n"])
+        self.assertIn("Ошибка в строке 1: Деление на ноль", stderr.getvalue())
+
+    def test_lazy(self):
+        """Тест ленивой обработки бесконечного входа."""
+        def lines():
+            while True:
+                yield "1 1 +\n"
+
+        output = stream_lines(lines(), evaluate_rpn)
+        self.assertEqual(next(output), "2.0\n")
+
+
+class TestStreamJsonl(unittest.TestCase):
+    """Тесты для функции stream_jsonl."""
+
+    def run_jsonl(self, lines):
+        return [json.loads(line) for line in stream_jsonl(lines, evaluate_rpn, "result")]
+
+    def test_result_field(self):
+        """Тест поля с результатом и сохранения остальных полей."""
+        records = self.run_jsonl(['{"id": 7, "expression": "3 4 +"}\n'])
+        self.assertEqual(records, [{"id": 7, "expression": "3 4 +", "result": 7.0}])
+
+    def test_error_field(self):
+        """Тест поля с ошибкой."""
+        records = self.run_jsonl(['{"expression": "10 0 /"}', '{"expression": "1 2 +"}'])
+        self.assertEqual(records[0]["error"], "Деление на ноль")
+        self.assertEqual(records[1]["result"], 3.0)
+
+    def test_invalid_record(self):
+        """Тест некорректных записей."""
+        records = self.run_jsonl(["не json\n", "[1, 2]\n", '{"id": 1}\n', "\n"])
+        self.assertEqual(len(records), 3)
+        for record in records:
+            self.assertIn("Некорректная запись", record["error"])
+        self.assertEqual(records[2]["id"], 1)
+
+    def test_overflow_error(self):
+        """Тест ошибки переполнения."""
+        records = self.run_jsonl(['{"expression": "10 400 ^"}'])
+        self.assertIn("error", records[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from batch import BatchResult
+from calc import evaluate_rpn
+from calculator import calculate
+
+try:
+    import numpy as np
+    from templates import evaluate_templates, skeleton
+except ImportError:
+    np = None
+
+
+def reference(evaluate, expression):
+    try:
+        return BatchResult(evaluate(expression), None)
+    except (ValueError, ArithmeticError) as e:
+        return BatchResult(None, str(e))
+
+
+@unittest.skipIf(np is None, "numpy не установлен")
+class TestSkeleton(unittest.TestCase):
+    """Тесты для функции skeleton."""
+
+    def test_literals_replaced(self):
+        """Тест замены чисел местами подстановки."""
+        self.assertEqual(
+            skeleton(["3", "x", "-1.5e-3", "*", "+", "pi", "sin", "-"]),
+            (("#", "x", "#", "*", "+", "pi", "sin", "-"), ["3", "-1.5e-3"]),
+        )
+        self.assertEqual(skeleton("3 4 2 * +".split())[0], skeleton("5 1 9 * +".split())[0])
+        self.assertNotEqual(skeleton("3 4 +")[0], skeleton("3 4 -")[0])
+
+
+@unittest.skipIf(np is None, "numpy не установлен")
+class TestEvaluateTemplates(unittest.TestCase):
+    """Тесты для функции evaluate_templates."""
+
+    def test_matches_evaluate_rpn(self):
+        """Тест совпадения результатов и ошибок с построчным evaluate_rpn."""
+        expressions = []
+        for a in ["0", "1", "-2", "2.5", "1e300"]:
+            for b in ["0", "2", "-0.5", "400"]:
+                expressions += [
+                    f"{a} {b} 3 * +",
+                    f"{a} {b} /",
+                    f"{a} {b} ^",
+                    f"1 {a} {b} ^ ^",
+                    f"{a} sin {b} -",
+                    f"{a} {b} + +",
+                    f"{a} 0 / +",
+                ]
+        expressions += ["pi", "pi", "#0", "1 2 x +", "1 2 +", "1 2 +"]
+        expressions += ["1 #0 +", "2 #0 +", "3 #0 +", "4 #0 +"]
+        expressions += ["1 x1 +", "2 x2 +", "3 x3 +", "4 1_0 +", "1abc 2 +"]
+        results = evaluate_templates(expressions, rpn=True)
+        self.assertEqual(len(results), len(expressions))
+        for expression, result in zip(expressions, results):
+            self.assertEqual(result, reference(evaluate_rpn, expression), expression)
+
+    def test_infix(self):
+        """Тест выражений в инфиксной записи."""
+        expressions = [f"{i} + {i + 1} * 2 / ({i} - 3)" for i in range(10)] + ["1 + q", "(1 + 2"]
+        results = evaluate_templates(expressions)
+        for expression, result in zip(expressions, results):
+            self.assertEqual(result, reference(calculate, expression), expression)
+        self.assertEqual(results[3], BatchResult(None, "Деление на ноль"))
+
+    def test_group_with_different_structure(self):
+        """Тест выражений, совпадающих без цифр, но с разной структурой."""
+        expressions = ["1 2 +", "3 4 +", "5 6 +", " 12 +", "x1 2 +", "x 2 +", "1 2 +", "7 8 +"]
+        results = evaluate_templates(expressions, rpn=True)
+        for expression, result in zip(expressions, results):
+            self.assertEqual(result, reference(evaluate_rpn, expression), expression)
+
+    def test_empty(self):
+        """Тест пустого пакета."""
+        self.assertEqual(evaluate_templates([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
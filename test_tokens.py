@@ -0,0 +1,137 @@
+import unittest
+
+from calc import evaluate_tokens, evaluate_typed
+from registry import is_number
+from shunting_yard import shunting_yard, shunting_yard_typed, tokenize, tokenize_typed
+from tokens import (
+    COMMA,
+    CONSTANT,
+    FUNCTION,
+    NUMBER,
+    OPERATOR,
+    PARENTHESIS,
+    VARIABLE,
+    Token,
+)
+
+
+class TestToken(unittest.TestCase):
+    """Тесты для класса Token."""
+
+    def test_slots(self):
+        """Тест хранения атрибутов без словаря экземпляра."""
+        token = Token(NUMBER, "1.5", 3, 1.5)
+        self.assertFalse(hasattr(token, "__dict__"))
+        with self.assertRaises(AttributeError):
+            token.extra = 1
+
+    def test_text(self):
+        """Тест строкового представления."""
+        token = Token(NUMBER, "1.5", 3, 1.5)
+        self.assertEqual(str(token), "1.5")
+        self.assertEqual(repr(token), "Token('number', '1.5', 3)")
+
+
+class TestTokenizeTyped(unittest.TestCase):
+    """Тесты для функции tokenize_typed."""
+
+    def test_kinds_offsets_values(self):
+        """Тест вида, позиции и значения токенов."""
+        tokens = tokenize_typed("max(x, 1.5e-3) * pi")
+        self.assertEqual(
+            [(t.kind, t.text, t.offset) for t in tokens],
+            [
+                (VARIABLE, "max", 0),
+                (PARENTHESIS, "(", 3),
+                (VARIABLE, "x", 4),
+                (COMMA, ",", 5),
+                (NUMBER, "1.5e-3", 7),
+                (PARENTHESIS, ")", 13),
+                (OPERATOR, "*", 15),
+                (CONSTANT, "pi", 17),
+            ],
+        )
+        self.assertEqual(tokens[4].value, 0.0015)
+        self.assertEqual(tokens[7].value, 3.141592653589793)
+        self.assertEqual(tokens[6].symbol.precedence, 2)
+        self.assertEqual(tokenize_typed("sin(1)")[0].kind, FUNCTION)
+
+    def test_matches_tokenize(self):
+        """Тест совпадения текста токенов с tokenize."""
+        expression = "sin(12 + pi) * 3.25 ^ 2E+2 ^ 3 - (7/(100-1e3))"
+        self.assertEqual([t.text for t in tokenize_typed(expression)], tokenize(expression))
+
+    def test_unknown_character(self):
+        """Тест неизвестного символа."""
+        with self.assertRaisesRegex(ValueError, "Неизвестный символ: \\$"):
+            tokenize_typed("1 + $")
+
+
+class TestTypedPipeline(unittest.TestCase):
+    """Тесты для функций shunting_yard_typed и evaluate_typed."""
+
+    EXPRESSIONS = [
+        "3 + 4 * 2 / (1 - 5) ^ 2 ^ 3",
+        "sin(pi / 2) - 1.5e-3 * x",
+        "((x))",
+        "2 ^ -x",
+        "1 2",
+    ]
+
+    def test_matches_shunting_yard(self):
+        """Тест совпадения с shunting_yard."""
+        for expression in self.EXPRESSIONS:
+            rpn = shunting_yard_typed(tokenize_typed(expression), ["x"])
+            self.assertEqual([t.text for t in rpn], shunting_yard(expression, ["x"]))
+
+    def test_string_input(self):
+        """Тест передачи выражения строкой."""
+        self.assertEqual([t.text for t in shunting_yard_typed("1 + 2")], ["1", "2", "+"])
+
+    def test_tokens_are_shared(self):
+        """Тест того, что в ПОЛИЗ попадают те же объекты токенов."""
+        tokens = tokenize_typed("1 + 2")
+        rpn = shunting_yard_typed(tokens)
+        self.assertIs(rpn[0], tokens[0])
+        self.assertIs(rpn[2], tokens[1])
+
+    def test_unknown_identifier(self):
+        """Тест неизвестного идентификатора."""
+        with self.assertRaisesRegex(ValueError, "Неизвестная функция или константа: y"):
+            shunting_yard_typed("x + y", ["x"])
+
+    def test_evaluate_matches_evaluate_tokens(self):
+        """Тест совпадения evaluate_typed с evaluate_tokens."""
+        for expression in self.EXPRESSIONS[:3]:
+            rpn = shunting_yard_typed(expression, ["x"])
+            for x in (0.5, 2, -3):
+                self.assertEqual(
+                    evaluate_typed(rpn, {"x": x}),
+                    evaluate_tokens(shunting_yard(expression, ["x"]), {"x": x}),
+                )
+
+    def test_evaluate_errors(self):
+        """Тест ошибок вычисления."""
+        with self.assertRaisesRegex(ValueError, "Деление на ноль"):
+            evaluate_typed(shunting_yard_typed("1 / 0"))
+        with self.assertRaisesRegex(ValueError, "Недостаточно операндов для операции"):
+            evaluate_typed(shunting_yard_typed("1 +"))
+        with self.assertRaisesRegex(ValueError, "Неизвестный токен: x"):
+            evaluate_typed(shunting_yard_typed("x + 1", ["x"]))
+        with self.assertRaisesRegex(ValueError, "не один элемент"):
+            evaluate_typed(shunting_yard_typed("1 2"))
+
+
+class TestIsNumber(unittest.TestCase):
+    """Тесты для функции is_number."""
+
+    def test_is_number(self):
+        """Тест распознавания чисел."""
+        for token in ["12", "1.5", "1.5e-3", "2E+10", "-7", "-0.5e2"]:
+            self.assertTrue(is_number(token), token)
+        for token in ["", "-", "1.", ".5", "1e", "e5", "x", "+", "1.5.2"]:
+            self.assertFalse(is_number(token), token)
+
+
+if __name__ == "__main__":
+    unittest.main()
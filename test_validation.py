@@ -0,0 +1,120 @@
+import pickle
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from registry import register_function, unregister
+from shunting_yard import main, shunting_yard
+from validation import ParseError, strict_shunting_yard, validate, validate_many
+
+
+class TestStrictShuntingYard(unittest.TestCase):
+    """Тесты для функции strict_shunting_yard."""
+
+    def setUp(self):
+        register_function("max", max, 2)
+        self.addCleanup(unregister, "max")
+
+    def assertError(self, expression, message, position):
+        with self.assertRaises(ParseError) as context:
+            strict_shunting_yard(expression, ["x"])
+        self.assertEqual((context.exception.message, context.exception.position), (message, position))
+
+    def test_matches_shunting_yard(self):
+        """Тест совпадения с shunting_yard на корректных выражениях."""
+        for expression in [
+            "3 + 4 * 2 / (1 - 5) ^ 2 ^ 3",
+            "max(1, sin(x)) * pi",
+            "((x))",
+            "1.5e-3 - max(max(1, 2), 3 ^ x)",
+        ]:
+            self.assertEqual(strict_shunting_yard(expression, ["x"]), shunting_yard(expression, ["x"]))
+
+    def test_operands_and_operators(self):
+        """Тест пропущенных операндов и операторов."""
+        self.assertError("1 2", "Ожидается оператор", 2)
+        self.assertError("1 + * 2", "Ожидается операнд", 4)
+        self.assertError("* 2", "Ожидается операнд", 0)
+        self.assertError("1 +", "Неожиданный конец выражения", 3)
+        self.assertError("", "Неожиданный конец выражения", 0)
+        self.assertError("(1)(2)", "Ожидается оператор", 3)
+        self.assertError("2 sin(1)", "Ожидается оператор", 2)
+
+    def test_parentheses(self):
+        """Тест несбалансированных и пустых скобок."""
+        self.assertError("1 ) + 2", "Непарная закрывающая скобка", 2)
+        self.assertError("1 + (2 * 3", "Незакрытая скобка", 4)
+        self.assertError("()", "Пустые скобки", 1)
+        self.assertError("(1 + )", "Ожидается операнд", 5)
+
+    def test_functions(self):
+        """Тест вызова функций."""
+        self.assertError("sin 1", "После функции sin ожидается (", 4)
+        self.assertError("1 + sin", "После функции sin ожидается (", 7)
+        self.assertError("max(1)", "Функция max ожидает аргументов: 2, передано: 1", 5)
+        self.assertError("max(1, 2, 3)", "Функция max ожидает аргументов: 2, передано: 3", 11)
+        self.assertError("(1, 2)", "Запятая вне аргументов функции", 2)
+        self.assertError("max(1, )", "Ожидается операнд", 7)
+
+    def test_conditional(self):
+        """Тест условной функции if и операторов сравнения."""
+        for expression in ["if(x < 1, max(x, 2), 3 ^ x) * 2", "if(if(1, x, 0), 1, 2) != 1 <= 2"]:
+            self.assertEqual(strict_shunting_yard(expression, ["x"]), shunting_yard(expression, ["x"]))
+        self.assertError("if(1, 2)", "Функция if ожидает аргументов: 3, передано: 2", 7)
+        self.assertError("if + 1", "После функции if ожидается (", 3)
+        self.assertError("1 < < 2", "Ожидается операнд", 4)
+
+    def test_first_error_wins(self):
+        """Тест того, что сообщается первая по тексту ошибка."""
+        self.assertError("1 2 $", "Ожидается оператор", 2)
+        self.assertError("1 + $ q", "Неизвестный символ: $", 4)
+        self.assertError("q + $", "Неизвестная функция или константа: q", 0)
+
+    def test_error_is_value_error(self):
+        """Тест текста и иерархии исключения."""
+        error = ParseError("Ожидается операнд", 4)
+        self.assertIsInstance(error, ValueError)
+        self.assertEqual(str(error), "Ожидается операнд (позиция 4)")
+        restored = pickle.loads(pickle.dumps(error))
+        self.assertEqual((restored.message, restored.position), (error.message, error.position))
+
+
+class TestValidate(unittest.TestCase):
+    """Тесты для функций validate и validate_many."""
+
+    def test_validate(self):
+        """Тест проверки одного выражения."""
+        self.assertIsNone(validate("x * (1 + 2)", ["x"]))
+        with self.assertRaisesRegex(ParseError, "позиция 4"):
+            validate("x * (1 + 2", ["x"])
+
+    def test_validate_many(self):
+        """Тест проверки пакета выражений."""
+        errors = list(validate_many(["1 + 2", "1 +", "sin(pi)", "(1", "x"], ["x"]))
+        self.assertEqual(errors[0], None)
+        self.assertEqual(errors[1].position, 3)
+        self.assertEqual(errors[2], None)
+        self.assertEqual(errors[3].message, "Незакрытая скобка")
+        self.assertEqual(errors[4], None)
+
+
+class TestStrictCli(unittest.TestCase):
+    """Тесты флага --strict."""
+
+    def test_strict_lines(self):
+        """Тест построчной строгой проверки."""
+        stdout, stderr = StringIO(), StringIO()
+        with mock.patch("sys.stdin", StringIO("1 + 2\n1 + (2\n")), \
+                redirect_stdout(stdout), redirect_stderr(stderr):
+            main(["--lines", "--strict"])
+        self.assertEqual(stdout.getvalue(), "1 2 +\n\n")
+        self.assertIn("Незакрытая скобка (позиция 4)", stderr.getvalue())
+
+    def test_strict_with_stats_rejected(self):
+        """Тест несовместимости --strict с --stats."""
+        with redirect_stderr(StringIO()), self.assertRaises(SystemExit):
+            main(["--strict", "--stats"])
+
+if __name__ == "__main__":
+    unittest.main()
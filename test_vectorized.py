@@ -0,0 +1,101 @@
+import unittest
+from calc import evaluate_rpn
+from shunting_yard import shunting_yard
+
+try:
+    import numpy as np
+    from vectorized import evaluate_vectorized
+except ImportError:
+    np = None
+
+
+@unittest.skipIf(np is None, "numpy не установлен")
+class TestEvaluateVectorized(unittest.TestCase):
+    """Тесты для функции evaluate_vectorized."""
+
+    def test_matches_evaluate_rpn(self):
+        """Тест совпадения с построчным evaluate_rpn."""
+        rpn = shunting_yard("x * (1 + rate) ^ 2 - sin(x / pi) * 3", ["x", "rate"])
+        xs = np.array([1.0, 2.5, 100.0, -4.0])
+        rates = np.array([0.0, 0.5, 0.05, 2.0])
+        result = evaluate_vectorized(rpn, {"x": xs, "rate": rates})
+        for i in range(len(xs)):
+            expected = evaluate_rpn(" ".join(rpn), {"x": xs[i], "rate": rates[i]})
+            self.assertAlmostEqual(result.values[i], expected, places=10)
+        self.assertFalse(result.zero_division.any())
+
+    def test_rpn_string(self):
+        """Тест выражения в виде строки."""
+        result = evaluate_vectorized("x 2 ^", {"x": [1, 2, 3]})
+        self.assertEqual(result.values.tolist(), [1.0, 4.0, 9.0])
+
+    def test_constant_expression(self):
+        """Тест выражения без переменных."""
+        result = evaluate_vectorized(shunting_yard("3 + 4 * 2"), {})
+        self.assertEqual(result.values.tolist(), [11.0])
+
+    def test_constant_broadcast(self):
+        """Тест растягивания константы на длину столбцов."""
+        result = evaluate_vectorized(["pi"], {"x": [1, 2]})
+        self.assertEqual(result.values.shape, (2,))
+
+    def test_division_by_zero_mask(self):
+        """Тест маски деления на ноль."""
+        rpn = shunting_yard("10 / (x - 1) + 1", ["x"])
+        result = evaluate_vectorized(rpn, {"x": [0.0, 1.0, 3.0, 1.0]})
+        self.assertEqual(result.zero_division.tolist(), [False, True, False, True])
+        self.assertEqual(result.error_rows.tolist(), [1, 3])
+        self.assertEqual(result.values[0], -9.0)
+        self.assertEqual(result.values[2], 6.0)
+        self.assertTrue(np.isnan(result.values[1]))
+
+    def test_irregular_mask(self):
+        """Тест маски переполнения и выхода из области определения."""
+        result = evaluate_vectorized(["1", "x", "-1", "^", "^"], {"x": [0.0, 2.0, -8.0]})
+        self.assertEqual(result.irregular.tolist(), [True, False, False])
+        self.assertEqual(result.values[0], 1.0)
+        result = evaluate_vectorized(["x", "0.5", "^", "x", "sin", "+"], {"x": [4.0, -4.0]})
+        self.assertEqual(result.irregular.tolist(), [False, True])
+        self.assertFalse(result.zero_division.any())
+
+    def test_comparisons_and_conditional(self):
+        """Тест сравнений и условной функции: маски берутся из выбранной ветви."""
+        rpn = shunting_yard("if(x != 1, 10 / (x - 1), 1 / 0) + (x >= 2)", ["x"])
+        xs = [0.0, 1.0, 3.0]
+        result = evaluate_vectorized(rpn, {"x": xs})
+        self.assertEqual(result.zero_division.tolist(), [False, True, False])
+        self.assertEqual(result.values[0], -10.0)
+        self.assertEqual(result.values[2], 6.0)
+        rpn = shunting_yard("if(x > 0, x ^ 0.5, 0 - x)", ["x"])
+        result = evaluate_vectorized(rpn, {"x": [4.0, -4.0]})
+        self.assertEqual(result.values.tolist(), [2.0, 4.0])
+        self.assertFalse(result.irregular.any())
+
+    def test_deep_conditional(self):
+        """Тест вложенности if глубже предела рекурсии."""
+        depth = 3000
+        rpn = shunting_yard("if(x, " * depth + "7" + ", 1 / x)" * depth, ["x"])
+        result = evaluate_vectorized(rpn, {"x": [0.0, 2.0]})
+        self.assertEqual(result.values[1], 7.0)
+        self.assertEqual(result.zero_division.tolist(), [True, False])
+
+    def test_unknown_token_error(self):
+        """Тест ошибки неизвестного токена."""
+        with self.assertRaises(ValueError) as context:
+            evaluate_vectorized(["x", "y", "+"], {"x": [1]})
+        self.assertIn("Неизвестный токен: y", str(context.exception))
+
+    def test_insufficient_operands_error(self):
+        """Тест ошибки недостаточно операндов."""
+        with self.assertRaises(ValueError) as context:
+            evaluate_vectorized(["3", "+"], {})
+        self.assertIn("Недостаточно операндов для операции", str(context.exception))
+
+    def test_column_length_mismatch_error(self):
+        """Тест ошибки разной длины столбцов."""
+        with self.assertRaises(ValueError):
+            evaluate_vectorized(["x", "y", "+"], {"x": [1, 2], "y": [1]})
+
+
+if __name__ == "__main__":
+    unittest.main()
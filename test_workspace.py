@@ -0,0 +1,116 @@
+import pickle
+import unittest
+
+from validation import ParseError
+from workspace import CycleError, Workspace
+
+
+class TestWorkspace(unittest.TestCase):
+    """Тесты для класса Workspace."""
+
+    def setUp(self):
+        self.workspace = Workspace()
+        self.workspace.update({"revenue": 100, "cost": 60})
+        self.workspace.define("margin", "revenue - cost")
+        self.workspace.define("ratio", "margin / revenue")
+
+    def test_values(self):
+        """Тест вычисления формул."""
+        self.assertEqual(self.workspace["margin"], 40)
+        self.assertEqual(self.workspace["ratio"], 0.4)
+        self.assertEqual(self.workspace.dependencies("ratio"), ("margin", "revenue"))
+        self.assertEqual(self.workspace.dependents("revenue"), {"margin", "ratio"})
+        self.assertIn("cost", self.workspace)
+        with self.assertRaises(KeyError):
+            self.workspace["profit"]
+
+    def test_only_affected_are_recomputed(self):
+        """Тест пересчета только зависящих формул."""
+        self.workspace.define("tax", "revenue * 0.2")
+        self.assertEqual(self.workspace.set_input("cost", 70), 2)
+        self.assertEqual(self.workspace.recomputed, 2)
+        self.assertEqual(self.workspace["ratio"], 0.3)
+        self.assertEqual(self.workspace.set_input("revenue", 200), 3)
+        self.assertEqual(self.workspace["tax"], 40)
+
+    def test_unchanged_value_stops_propagation(self):
+        """Тест того, что неизменившееся значение не пересчитывает зависящие."""
+        self.assertEqual(self.workspace.set_input("cost", 60), 0)
+        self.workspace.define("positive", "margin / margin")
+        self.workspace.define("scaled", "positive * 10")
+        self.assertEqual(self.workspace.set_input("cost", 50), 3)
+        self.assertEqual(self.workspace["scaled"], 10)
+
+    def test_topological_order(self):
+        """Тест пересчета после всех зависимостей, по одному разу."""
+        self.workspace.define("total", "margin + ratio + revenue")
+        self.assertEqual(self.workspace.update({"revenue": 200, "cost": 100}), 3)
+        self.assertEqual(self.workspace["total"], 300.5)
+
+    def test_forward_reference(self):
+        """Тест формулы, заданной раньше своей зависимости."""
+        self.workspace.define("double", "profit * 2")
+        self.assertEqual(self.workspace.error("double"), "Не задано значение переменной: profit")
+        with self.assertRaisesRegex(ValueError, "profit"):
+            self.workspace["double"]
+        self.assertEqual(self.workspace.define("profit", "margin - 10"), 2)
+        self.assertEqual(self.workspace["double"], 60)
+
+    def test_errors_propagate(self):
+        """Тест ошибок вычисления в зависимостях."""
+        self.workspace.set_input("revenue", 0)
+        self.assertEqual(self.workspace.error("ratio"), "Деление на ноль")
+        self.workspace.define("percent", "ratio * 100")
+        self.assertEqual(self.workspace.error("percent"), "Не вычислена формула: ratio")
+        self.workspace.set_input("revenue", 80)
+        self.assertEqual(self.workspace["percent"], 25)
+        self.assertIsNone(self.workspace.error("percent"))
+
+    def test_cycle(self):
+        """Тест обнаружения цикла."""
+        self.workspace.define("a", "ratio + 1")
+        with self.assertRaises(CycleError) as context:
+            self.workspace.define("margin", "a * 2")
+        self.assertEqual(context.exception.cycle, ("margin", "a", "ratio", "margin"))
+        with self.assertRaisesRegex(CycleError, "x -> x"):
+            self.workspace.define("x", "x + 1")
+        # Граф не изменился
+        self.assertEqual(self.workspace.expression("margin"), "revenue - cost")
+        self.assertNotIn("x", self.workspace)
+        restored = pickle.loads(pickle.dumps(context.exception))
+        self.assertEqual(restored.cycle, context.exception.cycle)
+
+    def test_redefine(self):
+        """Тест замены формулы с другими зависимостями."""
+        self.workspace.define("margin", "revenue * 0.5")
+        self.assertEqual(self.workspace["ratio"], 0.5)
+        self.assertEqual(self.workspace.dependents("cost"), frozenset())
+        self.assertEqual(self.workspace.set_input("cost", 1), 0)
+
+    def test_remove(self):
+        """Тест удаления формулы и входного значения."""
+        self.assertEqual(self.workspace.remove("margin"), 1)
+        self.assertEqual(self.workspace.error("ratio"), "Не задано значение переменной: margin")
+        self.workspace.remove("cost")
+        self.assertNotIn("cost", self.workspace)
+        with self.assertRaises(KeyError):
+            self.workspace.remove("cost")
+
+    def test_invalid_names_and_expressions(self):
+        """Тест некорректных имен и выражений."""
+        with self.assertRaisesRegex(ValueError, "Некорректное имя"):
+            self.workspace.define("x1", "1")
+        with self.assertRaisesRegex(ValueError, "занято функцией"):
+            self.workspace.define("sin", "1")
+        with self.assertRaisesRegex(ValueError, "занято функцией"):
+            self.workspace.define("if", "1")
+        with self.assertRaisesRegex(ValueError, "занято входным"):
+            self.workspace.define("cost", "1")
+        with self.assertRaisesRegex(ValueError, "занято формулой"):
+            self.workspace.set_input("margin", 1)
+        with self.assertRaises(ParseError):
+            self.workspace.define("bad", "revenue +")
+
+
+if __name__ == "__main__":
+    unittest.main()
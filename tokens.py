@@ -0,0 +1,47 @@
+from typing import Optional
+
+# Виды токенов те же, что в реестре и статистике, и доступны отсюда
+from registry import CONSTANT, FUNCTION, OPERATOR, Symbol
+from stats import COMMA, NUMBER, PARENTHESIS, VARIABLE
+
+
+class Token:
+    """
+    Токен с заранее определенным видом и значением.
+
+    Создается один раз токенизатором tokenize_typed и без изменений проходит
+    через shunting_yard_typed в evaluate_typed: вид токена, значение числа и
+    описание символа из реестра не вычисляются повторно. Атрибуты хранятся
+    в __slots__, без словаря экземпляра.
+
+    Attributes:
+        kind: Вид токена: number, operator, function, constant, variable,
+              parenthesis или comma
+        text: Текст токена
+        offset: Позиция первого символа токена в выражении
+        value: Значение числа или константы (None для остальных токенов)
+        symbol: Описание оператора, функции или константы из реестра на
+                момент разбора (None для остальных токенов)
+    """
+
+    __slots__ = ("kind", "text", "offset", "value", "symbol")
+
+    def __init__(
+        self,
+        kind: str,
+        text: str,
+        offset: int,
+        value: Optional[float] = None,
+        symbol: Optional[Symbol] = None,
+    ) -> None:
+        self.kind = kind
+        self.text = text
+        self.offset = offset
+        self.value = value
+        self.symbol = symbol
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"Token({self.kind!r}, {self.text!r}, {self.offset})"
@@ -0,0 +1,272 @@
+from collections import deque
+from collections.abc import Collection, Iterable, Iterator
+from typing import Optional
+
+from registry import CONDITIONAL, CONDITIONAL_ARITY, CONSTANT, FUNCTION, SYMBOLS, conditional_rpn
+from shunting_yard import iter_tokens
+
+# Приемник токенов ПОЛИЗ, который ничего не сохраняет, — для проверки без
+# построения результата
+_DISCARD: deque = deque(maxlen=0)
+
+
+class ParseError(ValueError):
+    """
+    Ошибка разбора с позицией в выражении.
+
+    Attributes:
+        message: Описание ошибки без позиции
+        position: Позиция первого символа ошибочного токена (с нуля); для
+                  незавершенного выражения — длина выражения
+    """
+
+    def __init__(self, message: str, position: int) -> None:
+        super().__init__(f"{message} (позиция {position})")
+        self.message = message
+        self.position = position
+
+    def __reduce__(self):
+        return ParseError, (self.message, self.position)
+
+
+def strict_shunting_yard(
+    expression: str, variables: Collection[str] = ()
+) -> list[str]:
+    """
+    Преобразует выражение в ПОЛИЗ, отклоняя любое некорректное выражение.
+
+    В отличие от shunting_yard, при преобразовании отслеживается, ожидается
+    ли операнд или оператор, баланс скобок и количество аргументов функций,
+    поэтому ошибка обнаруживается на первом ошибочном токене, а не при
+    вычислении ПОЛИЗ. Выражение просматривается один раз.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+        variables: Имена переменных, допустимых в выражении
+
+    Returns:
+        Список токенов в обратной польской нотации
+
+    Raises:
+        ParseError: При первой ошибке разбора, с ее позицией
+    """
+    output: list[str] = []
+    _convert(expression, variables, output)
+    return output
+
+
+def validate(expression: str, variables: Collection[str] = ()) -> None:
+    """
+    Проверяет выражение так же строго, как strict_shunting_yard, не строя ПОЛИЗ.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+        variables: Имена переменных, допустимых в выражении
+
+    Raises:
+        ParseError: При первой ошибке разбора, с ее позицией
+    """
+    _convert(expression, variables, _DISCARD)
+
+
+def validate_many(
+    expressions: Iterable[str], variables: Collection[str] = ()
+) -> Iterator[Optional[ParseError]]:
+    """
+    Проверяет пакет выражений, не строя ПОЛИЗ.
+
+    Args:
+        expressions: Выражения в инфиксной записи
+        variables: Имена переменных, допустимых в выражениях
+
+    Returns:
+        Итератор в порядке входа: None для корректного выражения, иначе
+        ParseError с позицией первой ошибки
+    """
+    for expression in expressions:
+        try:
+            _convert(expression, variables, _DISCARD)
+        except ParseError as e:
+            yield e
+        else:
+            yield None
+
+
+def _convert(expression: str, variables: Collection[str], output) -> None:
+    """
+    Строгое преобразование в ПОЛИЗ с записью токенов в output.append.
+
+    Raises:
+        ParseError: При первой ошибке разбора
+    """
+    try:
+        _convert_tokens(expression, variables, output)
+    except _Invalid as e:
+        message, index = e.args
+        raise ParseError(message, token_position(expression, index)) from None
+
+
+class _Invalid(Exception):
+    """Ошибка разбора с номером токена; позиция вычисляется только при ошибке."""
+
+
+def _convert_tokens(expression: str, variables: Collection[str], output) -> None:
+    """
+    Строгое преобразование в ПОЛИЗ.
+
+    Raises:
+        _Invalid: С описанием ошибки и номером ошибочного токена (None —
+                  конец выражения)
+    """
+    symbols = SYMBOLS
+    operator_stack: list[str] = []
+    # Открытые скобки: [номер токена, функция или None, арность, число
+    # аргументов, длины ПОЛИЗ в конце аргументов if]
+    groups: list[list] = []
+    expect_operand = True
+    function: Optional[str] = None
+    previous: Optional[str] = None
+    index = -1
+
+    try:
+        for index, token in enumerate(iter_tokens(expression)):
+            if function is not None and token != "(":
+                raise _Invalid(f"После функции {function} ожидается (", index)
+            symbol = symbols.get(token)
+
+            if symbol is None:
+                if token == "(":
+                    if not expect_operand:
+                        raise _Invalid("Ожидается оператор", index)
+                    arity = function_arity(function) if function is not None else 0
+                    groups.append([index, function, arity, 1, []])
+                    function = None
+                    operator_stack.append(token)
+                elif token == ")":
+                    if not groups:
+                        raise _Invalid("Непарная закрывающая скобка", index)
+                    if expect_operand:
+                        if previous == "(":
+                            raise _Invalid("Пустые скобки", index)
+                        raise _Invalid("Ожидается операнд", index)
+                    while operator_stack[-1] != "(":
+                        output.append(operator_stack.pop())
+                    operator_stack.pop()
+                    _, name, arity, count, marks = groups.pop()
+                    if name is not None:
+                        if count != arity:
+                            raise _Invalid(
+                                f"Функция {name} ожидает аргументов: {arity}, передано: {count}",
+                                index,
+                            )
+                        if name == CONDITIONAL:
+                            operator_stack.pop()
+                            if output is not _DISCARD:
+                                start, middle = marks
+                                output[start:] = conditional_rpn(
+                                    [], output[start:middle], output[middle:]
+                                )
+                        else:
+                            output.append(operator_stack.pop())
+                elif token == ",":
+                    if not groups or groups[-1][1] is None:
+                        raise _Invalid("Запятая вне аргументов функции", index)
+                    if expect_operand:
+                        raise _Invalid("Ожидается операнд", index)
+                    while operator_stack[-1] != "(":
+                        output.append(operator_stack.pop())
+                    groups[-1][3] += 1
+                    groups[-1][4].append(len(output))
+                    expect_operand = True
+                elif token == CONDITIONAL and token not in variables:
+                    if not expect_operand:
+                        raise _Invalid("Ожидается оператор", index)
+                    operator_stack.append(token)
+                    function = token
+                elif token.isalpha() and token not in variables:
+                    raise _Invalid(f"Неизвестная функция или константа: {token}", index)
+                else:
+                    # Число или переменная
+                    if not expect_operand:
+                        raise _Invalid("Ожидается оператор", index)
+                    output.append(token)
+                    expect_operand = False
+            elif symbol.kind == CONSTANT:
+                if not expect_operand:
+                    raise _Invalid("Ожидается оператор", index)
+                output.append(token)
+                expect_operand = False
+            elif symbol.kind == FUNCTION:
+                if not expect_operand:
+                    raise _Invalid("Ожидается оператор", index)
+                operator_stack.append(token)
+                function = token
+            else:
+                if expect_operand:
+                    raise _Invalid("Ожидается операнд", index)
+                precedence = symbol.precedence
+                right = symbol.right_associative
+                while operator_stack:
+                    top = symbols.get(operator_stack[-1])
+                    if (
+                        top is None
+                        or top.kind == FUNCTION
+                        or precedence > top.precedence
+                        or (right and precedence == top.precedence)
+                    ):
+                        break
+                    output.append(operator_stack.pop())
+                operator_stack.append(token)
+                expect_operand = True
+            previous = token
+    except ValueError as e:
+        # Неизвестный символ: токенизатор не смог выдать следующий токен
+        raise _Invalid(str(e), index + 1) from None
+
+    if function is not None:
+        raise _Invalid(f"После функции {function} ожидается (", None)
+    if expect_operand:
+        raise _Invalid("Неожиданный конец выражения", None)
+    if groups:
+        raise _Invalid("Незакрытая скобка", groups[-1][0])
+    while operator_stack:
+        output.append(operator_stack.pop())
+
+
+def function_arity(name: str) -> int:
+    """
+    Возвращает количество аргументов функции или условной функции if.
+
+    Args:
+        name: Имя функции из реестра или if
+
+    Returns:
+        Количество аргументов
+    """
+    return CONDITIONAL_ARITY if name == CONDITIONAL else SYMBOLS[name].arity
+
+
+def token_position(expression: str, index: Optional[int]) -> int:
+    """
+    Возвращает позицию первого символа токена выражения.
+
+    Позиция вычисляется повторным разбором, поэтому ее стоит запрашивать
+    только при ошибке.
+
+    Args:
+        expression: Арифметическое выражение в инфиксной записи
+        index: Номер токена (с нуля); None — конец выражения
+
+    Returns:
+        Позиция в expression (с нуля)
+    """
+    if index is None:
+        return len(expression)
+    tokens = iter_tokens(expression)
+    position = 0
+    for _ in range(index):
+        token = next(tokens)
+        position = expression.find(token, position) + len(token)
+    # Токен (или неизвестный символ) начинается с первого непробельного символа
+    rest = expression[position:]
+    return position + len(rest) - len(rest.lstrip())
@@ -0,0 +1,196 @@
+import math
+from collections.abc import Callable, Mapping, Sequence
+from typing import NamedTuple, Union
+
+import numpy as np
+
+from calc import parse_tokens
+from registry import CONSTANT, FUNCTION, JUMP, JUMP_IF_ZERO, SYMBOLS, is_jump, is_number
+
+# Векторные аналоги реализаций функций из реестра. Для остальных функций
+# используется np.vectorize — корректно, но без выигрыша в скорости
+_UFUNCS: dict[Callable[..., float], Callable[..., np.ndarray]] = {
+    math.sin: np.sin,
+    math.cos: np.cos,
+    math.tan: np.tan,
+    math.sqrt: np.sqrt,
+    math.exp: np.exp,
+    math.log: np.log,
+    math.fabs: np.abs,
+    abs: np.abs,
+    max: np.maximum,
+    min: np.minimum,
+}
+
+# Векторные аналоги операторов сравнения; результат — 1.0 или 0.0
+_COMPARISONS: dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]] = {
+    "<": np.less,
+    ">": np.greater,
+    "<=": np.less_equal,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+
+class VectorResult(NamedTuple):
+    """
+    Результат векторного вычисления выражения.
+
+    Attributes:
+        values: Результаты по строкам; в строках с делением на ноль — nan
+        zero_division: Маска строк, в которых произошло деление на ноль
+        irregular: Маска строк, в которых ^ или функция дали бесконечность
+                   или nan; evaluate_rpn в них может выбросить ошибку или
+                   вернуть комплексное число
+    """
+
+    values: np.ndarray
+    zero_division: np.ndarray
+    irregular: np.ndarray
+
+    @property
+    def error_rows(self) -> np.ndarray:
+        """Индексы строк, в которых произошло деление на ноль."""
+        return np.flatnonzero(self.zero_division)
+
+
+def evaluate_vectorized(
+    rpn: Union[str, Sequence[str]], columns: Mapping[str, np.ndarray]
+) -> VectorResult:
+    """
+    Вычисляет выражение в ПОЛИЗ сразу для всех строк столбцов-переменных.
+
+    Каждый оператор выполняется один раз над целым массивом. Деление на ноль
+    не прерывает вычисление, а отмечается в маске zero_division.
+    Возведение отрицательного числа в дробную степень дает nan, а не
+    комплексное число, как в evaluate_rpn; такие строки, как и строки с
+    переполнением или выходом из области определения функции, отмечаются в
+    маске irregular.
+
+    Условная функция if (переходы ?n и :m) вычисляет обе ветви для всех
+    строк и выбирает значение по условию строки; маски строки берутся из
+    выбранной ветви.
+
+    Args:
+        rpn: Токены выражения в обратной польской нотации (результат
+             shunting_yard) или строка с токенами через пробел
+        columns: Значения переменных — одномерные массивы одинаковой длины
+
+    Returns:
+        Результаты и маска строк с делением на ноль
+
+    Raises:
+        ValueError: При разной длине столбцов, недостаточном количестве
+                   операндов, неизвестном токене или некорректном выражении
+    """
+    tokens = parse_tokens(rpn) if isinstance(rpn, str) else rpn
+    arrays = {name: np.asarray(column, dtype=float) for name, column in columns.items()}
+    lengths = {array.shape for array in arrays.values()}
+    if len(lengths) > 1:
+        raise ValueError("Столбцы переменных имеют разную длину")
+    shape = lengths.pop() if lengths else (1,)
+
+    zero_division = np.zeros(shape, dtype=bool)
+    irregular = np.zeros(shape, dtype=bool)
+    stack: list[np.ndarray] = []
+    # Открытые if: [переход ?n, условие, отложенные стек и маски, номер
+    # последнего токена текущей ветви, ветвь значения или None, пока
+    # вычисляется она]
+    conditionals: list[list] = []
+    position = -1
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        tokens = iter(tokens)
+        for token in tokens:
+            position += 1
+            symbol = SYMBOLS.get(token)
+            if symbol is None:
+                if is_jump(token) and token[0] == JUMP_IF_ZERO:
+                    if not stack:
+                        raise ValueError("Недостаточно операндов для условия")
+                    # Ветви вычисляются с пустым стеком и своими масками
+                    conditionals.append([
+                        token,
+                        stack.pop() != 0,
+                        (stack, zero_division, irregular),
+                        position + max(int(token[1:]) - 1, 0),
+                        None,
+                    ])
+                    stack = []
+                    zero_division = np.zeros(shape, dtype=bool)
+                    irregular = np.zeros(shape, dtype=bool)
+                elif is_number(token):
+                    stack.append(np.float64(token))
+                elif token in arrays:
+                    stack.append(arrays[token])
+                else:
+                    raise ValueError(f"Неизвестный токен: {token}")
+            elif symbol.kind == CONSTANT:
+                stack.append(np.float64(symbol.value))
+            elif symbol.kind == FUNCTION:
+                if len(stack) < symbol.arity:
+                    raise ValueError("Недостаточно операндов для функции")
+                operands = stack[len(stack) - symbol.arity:]
+                del stack[len(stack) - symbol.arity:]
+                ufunc = _UFUNCS.get(symbol.implementation)
+                if ufunc is None:
+                    ufunc = np.vectorize(symbol.implementation, otypes=[float])
+                result = ufunc(*operands)
+                irregular |= ~np.isfinite(result)
+                stack.append(result)
+            else:
+                if len(stack) < 2:
+                    raise ValueError("Недостаточно операндов для операции")
+                b = stack.pop()
+                a = stack.pop()
+
+                if token == "+":
+                    result = a + b
+                elif token == "-":
+                    result = a - b
+                elif token == "*":
+                    result = a * b
+                elif token == "/":
+                    zero = b == 0
+                    zero_division |= zero
+                    result = np.where(zero, np.nan, a / np.where(zero, 1.0, b))
+                elif token == "^":
+                    result = np.power(a, b)
+                    irregular |= ~np.isfinite(result)
+                else:
+                    result = _COMPARISONS[token](a, b).astype(float)
+
+                stack.append(result)
+
+            # Завершение ветвей, последний токен которых прочитан
+            while conditionals and conditionals[-1][3] <= position:
+                conditional = conditionals[-1]
+                branch = VectorResult(_single(stack, shape), zero_division, irregular)
+                stack = []
+                zero_division = np.zeros(shape, dtype=bool)
+                irregular = np.zeros(shape, dtype=bool)
+                if conditional[4] is None:
+                    conditional[4] = branch
+                    jump = next(tokens, "")
+                    position += 1
+                    if jump[:1] != JUMP or not is_jump(jump):
+                        raise ValueError(f"Некорректный переход: {conditional[0]}")
+                    conditional[3] = position + int(jump[1:])
+                else:
+                    conditionals.pop()
+                    _, condition, (stack, zero_division, irregular), _, then = conditional
+                    stack.append(np.where(condition, then.values, branch.values))
+                    zero_division |= np.where(condition, then.zero_division, branch.zero_division)
+                    irregular |= np.where(condition, then.irregular, branch.irregular)
+
+    if conditionals:
+        raise ValueError(f"Некорректный переход: {conditionals[-1][0]}")
+    return VectorResult(_single(stack, shape), zero_division, irregular)
+
+
+def _single(stack: list[np.ndarray], shape: tuple[int, ...]) -> np.ndarray:
+    """Единственный элемент стека, растянутый на длину столбцов."""
+    if len(stack) != 1:
+        raise ValueError("Некорректное выражение: в стеке остается не один элемент")
+    return np.array(np.broadcast_to(stack[0], shape), dtype=float)
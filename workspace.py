@@ -0,0 +1,342 @@
+import heapq
+from collections.abc import Iterable, Mapping
+from typing import NamedTuple, Optional
+
+from calc import evaluate_tokens
+from compiler import find_variables
+from registry import CONDITIONAL, SYMBOLS
+from stream import EXPRESSION_ERRORS
+from validation import strict_shunting_yard
+
+
+class CycleError(ValueError):
+    """
+    Формулы зависят друг от друга по кругу.
+
+    Attributes:
+        cycle: Имена формул цикла; первое имя повторяется в конце
+    """
+
+    def __init__(self, cycle: tuple[str, ...]) -> None:
+        super().__init__(f"Циклическая зависимость: {' -> '.join(cycle)}")
+        self.cycle = cycle
+
+    def __reduce__(self):
+        return CycleError, (self.cycle,)
+
+
+class _Formula(NamedTuple):
+    """Разобранная формула: исходное выражение, ПОЛИЗ и имена зависимостей."""
+
+    expression: str
+    rpn: list[str]
+    dependencies: tuple[str, ...]
+
+
+class Workspace:
+    """
+    Набор именованных формул и входных значений с пересчетом по изменениям.
+
+    Формула — выражение в инфиксной записи, переменные которого — входные
+    значения или другие формулы. Зависимости формул образуют граф без
+    циклов. При изменении входного значения или формулы пересчитываются
+    только формулы, зависящие от изменения, в топологическом порядке; если
+    значение формулы не изменилось, зависящие от нее формулы не
+    пересчитываются. Количество пересчитанных формул доступно в атрибуте
+    recomputed.
+
+    Ошибка вычисления формулы (деление на ноль, отсутствующее входное
+    значение) не прерывает пересчет: она запоминается и возвращается при
+    обращении к формуле, а зависящие формулы тоже считаются ошибочными.
+
+    Attributes:
+        recomputed: Количество формул, пересчитанных последней операцией
+    """
+
+    def __init__(self) -> None:
+        self._inputs: dict[str, float] = {}
+        self._formulas: dict[str, _Formula] = {}
+        # Значения входов и успешно вычисленных формул
+        self._values: dict[str, float] = {}
+        self._errors: dict[str, str] = {}
+        # Имя -> формулы, в которых оно используется
+        self._dependents: dict[str, set[str]] = {}
+        # Номера формул в топологическом порядке; None — нужно пересчитать
+        self._ranks: Optional[dict[str, int]] = {}
+        self.recomputed = 0
+
+    def define(self, name: str, expression: str) -> int:
+        """
+        Задает или заменяет формулу.
+
+        Args:
+            name: Имя формулы (только буквы)
+            expression: Выражение в инфиксной записи
+
+        Returns:
+            Количество пересчитанных формул, включая эту
+
+        Raises:
+            ValueError: При некорректном имени, имени входного значения или
+                       ошибке разбора выражения
+            CycleError: Если формула зависит от себя через другие формулы
+        """
+        _check_name(name)
+        if name in self._inputs:
+            raise ValueError(f"Имя занято входным значением: {name}")
+        dependencies = find_variables(expression)
+        rpn = strict_shunting_yard(expression, dependencies)
+        cycle = self._find_cycle(name, dependencies)
+        if cycle is not None:
+            raise CycleError(cycle)
+
+        old = self._formulas.get(name)
+        if old is not None:
+            self._unlink(name, old.dependencies)
+        self._formulas[name] = _Formula(expression, rpn, dependencies)
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).add(name)
+        self._ranks = None
+        # Формула могла быть переменной уже заданных формул
+        changed = [name] if self._evaluate(name) else []
+        return self._propagate(changed, 1)
+
+    def set_input(self, name: str, value: float) -> int:
+        """
+        Задает входное значение и пересчитывает зависящие от него формулы.
+
+        Args:
+            name: Имя входного значения (только буквы)
+            value: Значение
+
+        Returns:
+            Количество пересчитанных формул
+
+        Raises:
+            ValueError: При некорректном имени или имени формулы
+        """
+        return self.update({name: value})
+
+    def update(self, values: Mapping[str, float]) -> int:
+        """
+        Задает несколько входных значений и пересчитывает зависящие формулы.
+
+        Формула, зависящая от нескольких измененных значений, пересчитывается
+        один раз.
+
+        Args:
+            values: Имя входного значения -> значение
+
+        Returns:
+            Количество пересчитанных формул
+
+        Raises:
+            ValueError: При некорректном имени или имени формулы
+        """
+        for name in values:
+            _check_name(name)
+            if name in self._formulas:
+                raise ValueError(f"Имя занято формулой: {name}")
+        changed = []
+        for name, value in values.items():
+            value = float(value)
+            if self._inputs.get(name) != value or name not in self._inputs:
+                self._inputs[name] = value
+                self._values[name] = value
+                changed.append(name)
+        return self._propagate(changed)
+
+    def remove(self, name: str) -> int:
+        """
+        Удаляет формулу или входное значение.
+
+        Зависящие формулы становятся ошибочными, пока имя не будет задано
+        снова.
+
+        Args:
+            name: Имя формулы или входного значения
+
+        Returns:
+            Количество пересчитанных формул
+
+        Raises:
+            KeyError: Если имя не задано
+        """
+        formula = self._formulas.pop(name, None)
+        if formula is not None:
+            self._unlink(name, formula.dependencies)
+            self._errors.pop(name, None)
+            self._ranks = None
+        elif name in self._inputs:
+            del self._inputs[name]
+        else:
+            raise KeyError(name)
+        self._values.pop(name, None)
+        return self._propagate([name])
+
+    def __getitem__(self, name: str) -> float:
+        """
+        Возвращает значение входа или формулы.
+
+        Raises:
+            KeyError: Если имя не задано
+            ValueError: Если формулу не удалось вычислить
+        """
+        if name in self._values:
+            return self._values[name]
+        if name in self._errors:
+            raise ValueError(self._errors[name])
+        raise KeyError(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._inputs or name in self._formulas
+
+    def error(self, name: str) -> Optional[str]:
+        """Возвращает ошибку вычисления формулы или None."""
+        return self._errors.get(name)
+
+    def expression(self, name: str) -> str:
+        """Возвращает выражение формулы."""
+        return self._formulas[name].expression
+
+    def dependencies(self, name: str) -> tuple[str, ...]:
+        """Возвращает имена, от которых формула зависит непосредственно."""
+        return self._formulas[name].dependencies
+
+    def dependents(self, name: str) -> frozenset[str]:
+        """Возвращает формулы, непосредственно зависящие от имени."""
+        return frozenset(self._dependents.get(name, ()))
+
+    def _evaluate(self, name: str) -> bool:
+        """Вычисляет формулу и возвращает True, если значение изменилось."""
+        formula = self._formulas[name]
+        value: Optional[float] = None
+        error: Optional[str] = None
+        try:
+            value = evaluate_tokens(formula.rpn, self._values)
+        except EXPRESSION_ERRORS as e:
+            error = str(e)
+            # Отсутствующая зависимость важнее ошибки вычисления
+            for dependency in formula.dependencies:
+                if dependency not in self._values:
+                    if dependency in self._formulas:
+                        error = f"Не вычислена формула: {dependency}"
+                    else:
+                        error = f"Не задано значение переменной: {dependency}"
+                    break
+
+        old_value = self._values.get(name)
+        old_error = self._errors.get(name)
+        if error is None:
+            self._values[name] = value
+            self._errors.pop(name, None)
+        else:
+            self._values.pop(name, None)
+            self._errors[name] = error
+        return value != old_value or error != old_error
+
+    def _propagate(self, changed: Iterable[str], recomputed: int = 0) -> int:
+        """
+        Пересчитывает формулы, зависящие от измененных имен.
+
+        Формулы извлекаются из кучи по топологическому номеру, поэтому
+        каждая пересчитывается после всех своих измененных зависимостей и
+        не более одного раза.
+        """
+        dependents = self._dependents
+        queue: list[tuple[int, str]] = []
+        queued: set[str] = set()
+        ranks: Optional[dict[str, int]] = None
+
+        def schedule(name: str) -> None:
+            nonlocal ranks
+            for dependent in dependents.get(name, ()):
+                if dependent not in queued:
+                    if ranks is None:
+                        ranks = self._topological_ranks()
+                    queued.add(dependent)
+                    heapq.heappush(queue, (ranks[dependent], dependent))
+
+        for name in changed:
+            schedule(name)
+        while queue:
+            _, name = heapq.heappop(queue)
+            recomputed += 1
+            if self._evaluate(name):
+                schedule(name)
+
+        self.recomputed = recomputed
+        return recomputed
+
+    def _topological_ranks(self) -> dict[str, int]:
+        """Номера формул в топологическом порядке (алгоритм Кана)."""
+        if self._ranks is not None:
+            return self._ranks
+        formulas = self._formulas
+        pending = {
+            name: sum(dependency in formulas for dependency in formula.dependencies)
+            for name, formula in formulas.items()
+        }
+        ready = [name for name, count in pending.items() if count == 0]
+        ranks: dict[str, int] = {}
+        while ready:
+            name = ready.pop()
+            ranks[name] = len(ranks)
+            for dependent in self._dependents.get(name, ()):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+        self._ranks = ranks
+        return ranks
+
+    def _find_cycle(
+        self, name: str, dependencies: Iterable[str]
+    ) -> Optional[tuple[str, ...]]:
+        """
+        Ищет цикл, который образует формула name с зависимостями dependencies.
+
+        Цикл есть, если одна из зависимостей сама зависит от name. Поиск
+        идет от name по зависящим формулам, поэтому для новой формулы, от
+        которой еще ничего не зависит, он завершается сразу.
+        """
+        targets = set(dependencies)
+        if name in targets:
+            return (name, name)
+        parents: dict[str, str] = {}
+        stack = [name]
+        while stack:
+            node = stack.pop()
+            for dependent in self._dependents.get(node, ()):
+                if dependent in parents:
+                    continue
+                parents[dependent] = node
+                if dependent in targets:
+                    # Каждая формула пути зависит от следующей
+                    path = [name, dependent]
+                    while path[-1] != name:
+                        path.append(parents[path[-1]])
+                    return tuple(path)
+                stack.append(dependent)
+        return None
+
+    def _unlink(self, name: str, dependencies: Iterable[str]) -> None:
+        """Удаляет формулу из списков зависящих формул."""
+        for dependency in dependencies:
+            dependents = self._dependents.get(dependency)
+            if dependents is not None:
+                dependents.discard(name)
+                if not dependents:
+                    del self._dependents[dependency]
+
+
+def _check_name(name: str) -> None:
+    """
+    Проверяет имя формулы или входного значения.
+
+    Raises:
+        ValueError: Если имя не из букв или совпадает с функцией или константой
+    """
+    if not name.isalpha():
+        raise ValueError(f"Некорректное имя: {name}")
+    if name in SYMBOLS or name == CONDITIONAL:
+        raise ValueError(f"Имя занято функцией или константой: {name}")